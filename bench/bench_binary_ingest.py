@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# rxcap stats ingest at 1 ms resolution: CSV rows (CsvTailReader, string
+# split + int/float per field) against binary stats records over the unix
+# datagram socket (RecordSocket + StatsWindow), and the per-packet record
+# path into the arrival histograms against live-line parsing.
+# Usage: bench_binary_ingest.py [--records 100000] [--batch 10]
+import argparse
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+from arrival_hist import ArrivalAnalyzer  # noqa: E402
+from stats_ingest import DGRAM_HEADER, KIND_PACKETS, KIND_STATS, RecordSocket, StatsWindow, feed_packets, pack_datagrams  # noqa: E402
+from tail_reader import CsvTailReader  # noqa: E402
+from traffic_sim import RX_HEADER  # noqa: E402
+
+
+def stats_records(n, interval_s=0.001, pps_per_tc=10_000):
+    step = int(pps_per_tc * interval_s)
+    out = []
+    for i in range(n):
+        pcp = [i * step * (tc + 1) for tc in range(8)]
+        total = sum(pcp)
+        out.append((i * interval_s, total, 36_000.0 * 8, 147.5, 0, *pcp, total, 0, total, total))
+    return out
+
+
+def csv_rows(path, records):
+    with open(path, "w") as f:
+        f.write(RX_HEADER + "\n")
+        f.writelines(
+            f"{r[0]:.3f},{r[1]},{r[2]:.1f},{r[3]:.3f},{r[4]}," + ",".join(str(v) for v in r[5:]) + "\n"
+            for r in records
+        )
+
+
+def bench_csv(path, records):
+    # What the server pays per CSV row before RxSampleProcessor: read, split,
+    # dict, and the int()/float() of the fields process() touches.
+    csv_rows(path, records)
+    t0 = time.perf_counter()
+    reader = CsvTailReader(path, max_bytes=1 << 30)
+    rows = reader.poll_dicts()
+    for r in rows:
+        float(r["time_s"])
+        int(r["total_pkts"])
+        [int(r[f"pcp{tc}_pkts"]) for tc in range(8)]
+    dt = time.perf_counter() - t0
+    reader.close()
+    return len(rows), dt
+
+
+def bench_socket(sock_path, records, batch):
+    # Sender and receiver in one thread: bursts of 8 datagrams, below the
+    # kernel's unix datagram queue limit (net.unix.max_dgram_qlen, 10).
+    sock = RecordSocket(sock_path)
+    tx = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    dgrams = [d for i in range(0, len(records), batch) for d in pack_datagrams(KIND_STATS, records[i:i + batch])]
+    window = StatsWindow(0.1)
+    rows = 0
+    recv_s = 0.0
+    for i in range(0, len(dgrams), 8):
+        for d in dgrams[i:i + 8]:
+            tx.sendto(d, sock_path)
+        t0 = time.perf_counter()
+        data, _ = sock.poll()
+        rows += len(window.feed(data))
+        recv_s += time.perf_counter() - t0
+    tx.close()
+    sock.close()
+    return window.records, rows, recv_s
+
+
+def bench_packets(n):
+    records = [(i * 1e-5, 512, i % 8) for i in range(n)]
+    lines = [f"{t:.9f},512,02:00:00:00:00:0{tc},ff:ff:ff:ff:ff:ff,100,{tc},10.0.100.1,10.0.100.2,5000,5001"
+             for t, _, tc in records]
+    data = b"".join(d[DGRAM_HEADER.size:] for d in pack_datagrams(KIND_PACKETS, records))
+    a = ArrivalAnalyzer([None] * 8, 512)
+    t0 = time.perf_counter()
+    a.feed_lines(lines)
+    lines_s = time.perf_counter() - t0
+    b = ArrivalAnalyzer([None] * 8, 512)
+    t0 = time.perf_counter()
+    feed_packets(b, data)
+    records_s = time.perf_counter() - t0
+    assert a.fields()["iat_p50_us"] == b.fields()["iat_p50_us"]
+    return lines_s, records_s
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=100_000, help="1 ms stats records")
+    ap.add_argument("--batch", type=int, default=10, help="records per datagram")
+    ap.add_argument("--packets", type=int, default=200_000)
+    args = ap.parse_args()
+    records = stats_records(args.records)
+    with tempfile.TemporaryDirectory() as tmp:
+        n, csv_s = bench_csv(Path(tmp) / "cbs_rx.csv", records)
+        got, rows, sock_s = bench_socket(str(Path(tmp) / "rx_stats.sock"), records, args.batch)
+    print(f"{args.records} stats records (1 ms, {args.records / 1000:.0f} s of capture)")
+    print(f"  csv     {n / csv_s:>12,.0f} rows/s   {csv_s / n * 1e6:6.2f} us/row")
+    print(f"  binary  {got / sock_s:>12,.0f} rows/s   {sock_s / got * 1e6:6.2f} us/row"
+          f"  ({rows} published rows at 100 ms)")
+    print(f"  speedup {csv_s / n / (sock_s / got):.1f}x")
+    lines_s, records_s = bench_packets(args.packets)
+    print(f"{args.packets} packets into the arrival histograms")
+    print(f"  live lines      {args.packets / lines_s:>12,.0f} pkts/s")
+    print(f"  packet records  {args.packets / records_s:>12,.0f} pkts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Interface counter sampling cost per rxcap row (two interfaces): the old
+# per-read open + read_text of each sysfs file, one /proc/net/dev read, and
+# IfaceSampler (open sysfs fds + pread, with and without the ethtool ioctl).
+# Usage: bench_iface_sampler.py [--ifaces eth0,lo] [--n 20000]
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+from iface_stats import IFACE_COUNTERS, IfaceSampler  # noqa: E402
+
+
+def read_text(iface):
+    base = Path(f"/sys/class/net/{iface}/statistics")
+    out = {}
+    for name in IFACE_COUNTERS:
+        try:
+            out[name] = int((base / name).read_text().strip())
+        except Exception:
+            out[name] = 0
+    return out
+
+
+def proc_net_dev(fd, ifaces):
+    out = {}
+    for line in os.pread(fd, 1 << 16, 0).decode().splitlines()[2:]:
+        name, _, rest = line.partition(":")
+        if name.strip() in ifaces:
+            out[name.strip()] = [int(x) for x in rest.split()]
+    return out
+
+
+def timed(n, fn):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ifaces", default="eth0,lo")
+    ap.add_argument("--n", type=int, default=20000)
+    args = ap.parse_args()
+    ifaces = args.ifaces.split(",")
+    fd = os.open("/proc/net/dev", os.O_RDONLY)
+    fast = IfaceSampler(ifaces)
+    sysfs = IfaceSampler(ifaces, driver=False)
+    rows = [
+        ("read_text per counter", lambda: [read_text(i) for i in ifaces]),
+        ("/proc/net/dev", lambda: proc_net_dev(fd, ifaces)),
+        ("sysfs pread", sysfs.sample),
+        ("sysfs pread + ethtool", fast.sample),
+    ]
+    print(f"ifaces={ifaces} driver stats: {sorted(fast.ethtool) or 'none'}")
+    for label, fn in rows:
+        print(f"{label:22} {timed(args.n, fn):8.1f} us/sample")
+    fast.close()
+    sysfs.close()
+    os.close(fd)
+
+
+if __name__ == "__main__":
+    main()
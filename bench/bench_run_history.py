@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# Run history store: record a simulated run of N samples (default one hour
+# at 10 Hz), then time /runs/<id>/series style queries on it.
+# Usage: bench_run_history.py [--samples 36000]
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+from run_history import RunHistory  # noqa: E402
+
+
+def payload(i):
+    per_tc = [1.0 + tc + (i % 7) * 0.01 for tc in range(8)]
+    return {
+        "time_s": 2.0 + i * 0.1, "total_mbps": 36.0, "total_mbps_calc": 36.1, "total_mbps_pcp": 36.0,
+        "unknown_mbps": 0.1, "total_pps": 3214.0, "drops": 0, "total_pkts": 321 * i,
+        "pcp_pkts": [40 * i] * 8, "per_tc_mbps": per_tc, "per_tc_mbps_payload": per_tc,
+        "per_tc_pps": [401.0] * 8, "per_tc_mbps_scaled": per_tc, "pred_mbps": per_tc,
+        "tx_tc_mbps": [10.0] * 8, "exp_mbps": per_tc, "exp_pps": [401.0] * 8, "pass": [True] * 8,
+        "rx_ratio": 1.0, "pcp_ratio": 1.0, "pcp_ratio_count": 1.0, "total_pred": 36.0, "total_tx": 80.0,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--samples", type=int, default=36_000)
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        hist = RunHistory(Path(tmp) / "runs.sqlite")
+        rec = hist.start_run({"duration": args.samples / 10})
+        t0 = time.perf_counter()
+        for i in range(args.samples):
+            rec.add(payload(i))
+        rec.close()
+        el = time.perf_counter() - t0
+        size = (Path(tmp) / "runs.sqlite").stat().st_size
+        print(f"record: {args.samples} samples in {el:.2f} s ({el / args.samples * 1e6:.1f} us/sample), db {size / 1e6:.1f} MB")
+        queries = [
+            ("overview 2000 pts", dict(fields=["total_mbps", "per_tc_mbps"])),
+            ("overview 500 pts, 4 fields", dict(fields=["total_mbps", "per_tc_mbps", "tx_tc_mbps", "pass_count"], max_points=500)),
+            ("60 s window raw", dict(fields=["per_tc_mbps"], t_from=600, t_to=660)),
+            ("full run step=10s", dict(fields=["per_tc_mbps", "exp_mbps"], step=10.0)),
+        ]
+        for label, kw in queries:
+            t0 = time.perf_counter()
+            out = hist.series(rec.run_id, **kw)
+            el = time.perf_counter() - t0
+            print(f"query {label:28} {len(out['t']):5} points {el * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
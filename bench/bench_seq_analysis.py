@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# Sequence analysis throughput: synthetic 8-TC traffic at a given packet rate
+# is turned into --seq-dump run records (one open run per TC, flushed on a
+# break or every flush interval, like rxcap) and fed to SeqAnalyzer in
+# 100 ms chunks. Reports packets/s and records/s analyzed per scenario and
+# checks the loss/reorder/duplicate counts against the injected faults.
+# Usage: bench_seq_analysis.py [--pps 1000000] [--seconds 10] [--flush-ms 100]
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+from seq_analysis import SEQ_RECORD, SeqAnalyzer  # noqa: E402
+
+SCENARIOS = {
+    # name: (loss prob, reorder prob, dup prob) per packet
+    "in-order": (0.0, 0.0, 0.0),
+    "loss 1e-4": (1e-4, 0.0, 0.0),
+    "loss 1e-3 + reorder 1e-3 + dup 1e-4": (1e-3, 1e-3, 1e-4),
+    # Worst case for the dump format: nearly every packet starts a new run.
+    "loss 0.5": (0.5, 0.0, 0.0),
+}
+
+
+def make_chunks(pps, seconds, flush_s, loss, reorder, dup, seed=1):
+    # Returns ([bytes per 100 ms], injected {lost, reordered, dup}). Faults are
+    # placed at random positions; a delayed packet is delivered 1..32 packets
+    # late (counted as reordered only if a later one overtook it), a
+    # duplicate right after the original.
+    rng = random.Random(seed)
+    per_tc = int(pps * 0.1 / 8)
+    chunks = []
+    injected = {"lost": 0, "reordered": 0, "dup": 0}
+    seq = [0] * 8
+    top = [-1] * 8
+    uniq = [0] * 8
+    base = [None] * 8
+    delayed = [[] for _ in range(8)]
+    flushes_per_chunk = max(1, round(0.1 / flush_s))
+    for _ in range(int(seconds * 10)):
+        recs = []
+        for _ in range(flushes_per_chunk):
+            for tc in range(8):
+                n = per_tc // flushes_per_chunk
+                first = seq[tc]
+                out = []
+                faults = rng.random() < n * (loss + reorder + dup)
+                if not faults and not delayed[tc]:
+                    if base[tc] is None:
+                        base[tc] = first
+                    recs.append((tc, first, n))
+                    seq[tc] += n
+                    top[tc] = first + n - 1
+                    uniq[tc] += n
+                    continue
+                for s in range(first, first + n):
+                    r = rng.random()
+                    if r < loss:
+                        pass
+                    elif r < loss + reorder:
+                        delayed[tc].append([s, rng.randint(1, 32)])
+                    else:
+                        out.append(s)
+                        top[tc] = s
+                        if base[tc] is None:
+                            base[tc] = s
+                        uniq[tc] += 1
+                        if r < loss + reorder + dup:
+                            out.append(s)
+                            injected["dup"] += 1
+                    for d in delayed[tc]:
+                        d[1] -= 1
+                    while delayed[tc] and delayed[tc][0][1] <= 0:
+                        late = delayed[tc].pop(0)[0]
+                        if late < top[tc]:
+                            injected["reordered"] += 1
+                        top[tc] = max(top[tc], late)
+                        uniq[tc] += 1
+                        out.append(late)
+                seq[tc] += n
+                run = None
+                for s in out:
+                    if run and run[1] + run[2] == s:
+                        run[2] += 1
+                    else:
+                        if run:
+                            recs.append(tuple(run))
+                        run = [tc, s, 1]
+                if run:
+                    recs.append(tuple(run))
+        chunks.append(b"".join(SEQ_RECORD.pack(*r) for r in recs))
+    # Loss as a receiver can see it: holes between the first and the highest
+    # delivered seq.
+    injected["lost"] = sum(hi + 1 - b - u for hi, b, u in zip(top, base, uniq) if b is not None)
+    return chunks, injected
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pps", type=int, default=1_000_000)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--flush-ms", type=float, default=100.0)
+    args = ap.parse_args()
+    for name, (loss, reorder, dup) in SCENARIOS.items():
+        chunks, injected = make_chunks(args.pps, args.seconds, args.flush_ms / 1000.0, loss, reorder, dup)
+        an = SeqAnalyzer()
+        t0 = time.perf_counter()
+        for c in chunks:
+            an.feed(memoryview(c))
+            an.fields()
+        dt = time.perf_counter() - t0
+        f = an.fields()
+        pkts = sum(f["seq_rx"]) + sum(f["seq_dup"])
+        got = {"lost": sum(f["seq_lost"]), "reordered": sum(f["seq_reordered"]), "dup": sum(f["seq_dup"])}
+        ok = got == injected
+        print(f"{name:38} {pkts / dt / 1e6:7.2f} Mpps  {an.records / dt / 1e3:8.1f} k rec/s  "
+              f"cpu {dt / args.seconds * 100:5.1f}% of realtime  "
+              f"lost {got['lost']}/{injected['lost']} reord {got['reordered']}/{injected['reordered']} "
+              f"dup {got['dup']}/{injected['dup']} max depth {max(f['seq_reorder_max'])} "
+              f"{'ok' if ok else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# Concurrent run sessions: starts N backend=sim sessions the way POST /runs
+# does (own files, watcher and event stream each) and reports the aggregate
+# /events samples and rxcap rows per second against a single session.
+# Usage: bench_sessions.py [--sessions 1,2,4] [--duration 5]
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+import cbs_rt_server as core  # noqa: E402
+from run_history import RunHistory  # noqa: E402
+
+
+def run_sessions(n, duration):
+    subs = []
+    for _ in range(n):
+        cfg, sess = core.open_session({"backend": "sim", "duration": duration, "rate_per_tc_mbps": 20})
+        subs.append((sess, core.run_hub(sess).subscribe(max_lag=256)))
+        core.start_test(cfg, sess)
+        core.register_session(sess)
+    rows0 = core.metrics.counters.get("csv_rows_total", 0)
+    frames = 0
+    t0 = time.monotonic()
+    c0 = time.process_time()
+    deadline = t0 + duration + 5
+    while any(sess["running"] for sess, _ in subs) and time.monotonic() < deadline:
+        for _, sub in subs:
+            frames += len(sub.wait(timeout=0.05))
+    wall = time.monotonic() - t0
+    cpu = time.process_time() - c0
+    for sess, sub in subs:
+        core.stop_test(sess)
+        sub.close()
+    return frames, core.metrics.counters.get("csv_rows_total", 0) - rows0, wall, cpu
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", default="1,2,4")
+    ap.add_argument("--duration", type=int, default=5)
+    args = ap.parse_args()
+    print(f"cpus usable: {len(os.sched_getaffinity(0))}")
+    with tempfile.TemporaryDirectory() as tmp:
+        core.SESSIONS_DIR = Path(tmp) / "sessions"
+        core.history = RunHistory(Path(tmp) / "runs.sqlite")
+        base = None
+        for n in (int(x) for x in args.sessions.split(",")):
+            frames, rows, wall, cpu = run_sessions(n, args.duration)
+            rate = frames / wall
+            base = base or rate / n
+            print(f"{n:2d} sessions: {frames:6d} /events samples {rate:8.1f}/s "
+                  f"({rate / base / n:.2f}x per session) rows={rows} server cpu={cpu:.2f} s / wall {wall:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
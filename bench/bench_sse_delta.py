@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# /events wire cost: full snapshots vs. mode=delta, with and without 2 Hz
+# coalescing. A simulated run (traffic_sim) is replayed through the real
+# sample processor; every published payload is fetched by one subscriber per
+# mode. Reports bytes/s on the wire and JSON decode time (proxy for the
+# browser's parse cost), and checks that the delta stream reconstructs the
+# full payloads exactly.
+# Usage: bench_sse_delta.py [--seconds 120] [--publish-hz 10] [--max-hz 2]
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+import cbs_rt_server as core  # noqa: E402
+from broadcaster import Broadcaster  # noqa: E402
+from traffic_sim import CbsShaperSim, SimWriter  # noqa: E402
+
+IDLE = [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000]
+
+
+class Client:
+    def __init__(self, hub, label, mode, max_hz, every):
+        self.label = label
+        self.sub = hub.subscribe(max_lag=256, mode=mode, max_hz=max_hz)
+        self.every = every
+        self.frames = []
+
+    def poll(self, n):
+        if n % self.every == 0:
+            self.frames.extend(self.sub.wait(timeout=0))
+
+
+class BenchHub(Broadcaster):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.clients = []
+        self.n = 0
+        self.payloads = []
+
+    def publish(self, payload):
+        frame = super().publish(payload)
+        self.n += 1
+        self.payloads.append(json.loads(frame[6:]))
+        for c in self.clients:
+            c.poll(self.n)
+        return frame
+
+
+def reconstruct(frames):
+    state = None
+    out = []
+    for f in frames:
+        msg = json.loads(f[6:])
+        if msg["t"] == "key":
+            state = msg["f"]
+        else:
+            state = dict(state)
+            state.update(msg["set"])
+            added = msg.get("append", {}).get("cap_lines")
+            if added:
+                state["cap_lines"] = (state.get("cap_lines", []) + added)[-core.CAP_LINES_MAX:]
+        out.append(state)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=120)
+    ap.add_argument("--publish-hz", type=float, default=10)
+    ap.add_argument("--max-hz", type=float, default=2)
+    args = ap.parse_args()
+    interval = 1.0 / args.publish_hz
+    every = max(1, round(args.publish_hz / args.max_hz))
+    with tempfile.TemporaryDirectory() as tmp:
+        sim = CbsShaperSim(20, IDLE, 512)
+        out = SimWriter(sim, Path(tmp) / "cbs_rx.csv", Path(tmp) / "live_packets.csv", Path(tmp) / "tx_stats",
+                        csv_interval=interval, live_interval=interval)
+        out.run_until(args.seconds, 0.001)
+        out.close()
+        hub = BenchHub(capacity=512, max_lag=256, append_max=core.CAP_LINES_MAX)
+        core.broadcaster = hub
+        hub.clients = [
+            Client(hub, "full", "full", 0, 1),
+            Client(hub, f"full@{args.max_hz:g}Hz", "full", args.max_hz, every),
+            Client(hub, "delta", "delta", 0, 1),
+            Client(hub, f"delta@{args.max_hz:g}Hz", "delta", args.max_hz, every),
+        ]
+        cfg = core.build_cfg({"idle_slope_kbps": IDLE, "rate_per_tc_mbps": 20})
+        core.replay_run(tmp, cfg, speed=0)
+    seconds = hub.n * interval
+    base = None
+    for c in hub.clients:
+        size = sum(len(f) for f in c.frames)
+        t0 = time.perf_counter()
+        for f in c.frames:
+            json.loads(f[6:])
+        decode = time.perf_counter() - t0
+        rate = size / seconds
+        base = base or rate
+        print(f"{c.label:12} frames={len(c.frames):5} {rate / 1024:8.2f} KiB/s "
+              f"({rate / base * 100:5.1f}% of full) decode={decode / seconds * 1e6:7.1f} us/s")
+    delta = next(c for c in hub.clients if c.label == "delta")
+    # Empty deltas (repeated last_valid payloads) are never sent; compare the
+    # reconstructed state after every delivered frame with the payload it
+    # stands for.
+    states = reconstruct(delta.frames)
+    by_seq = {json.loads(f[6:])["seq"]: s for f, s in zip(delta.frames, states)}
+    bad = sum(1 for seq, s in by_seq.items() if s != hub.payloads[seq])
+    print(f"delta reconstruction: {len(by_seq)} frames checked, {bad} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# SSE load test for the asyncio server core: N concurrent /events clients
+# receiving synthetic samples at a fixed rate. The server runs in a child
+# process so its CPU time and thread count can be measured on their own.
+# Usage: bench_sse_load.py [--clients 200] [--hz 10] [--seconds 10]
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+
+def synthetic_payload(i):
+    per_tc = [1.0 + tc for tc in range(8)]
+    iface = {k: 1000 + i for k in (
+        "rx_packets", "rx_bytes", "rx_dropped", "rx_errors",
+        "tx_packets", "tx_bytes", "tx_dropped", "tx_errors")}
+    return {
+        "running": True, "time_s": i * 0.1, "total_mbps": 36.0, "total_mbps_calc": 36.0,
+        "total_mbps_pcp": 36.0, "unknown_mbps": 0.0, "pkt_size_eff": 1400, "pps_floor": 1000.0,
+        "total_pps": 3214.0, "drops": 0, "total_pkts": 321 * i, "pcp_pkts": [40 * i] * 8,
+        "vlan_pkts": 321 * i, "non_vlan_pkts": 0, "seq_pkts": 321 * i, "embedded_pcp_pkts": 321 * i,
+        "per_tc_mbps": per_tc, "per_tc_mbps_payload": per_tc, "per_tc_pps": [401.0] * 8,
+        "per_tc_mbps_scaled": per_tc, "pred_mbps": per_tc, "tx_tc_mbps": [10.0] * 8,
+        "exp_mbps": per_tc, "exp_pps": [401.0] * 8, "pass": [True] * 8, "cap_mode": "rxcap",
+        "cap_lines": [f"{i * 0.1:.4f},1400,00:e0:4c:68:12:d1,c8:4d:44:26:3b:a6,100,{n % 8},"
+                      f"10.0.100.1,10.0.100.2,5000,5001" for n in range(40)],
+        "iface_delta": iface, "ingress_delta": iface, "rx_ratio": 1.0, "pcp_ratio": 1.0,
+        "pcp_ratio_count": 1.0, "total_pred": 36.0, "total_tx": 80.0,
+    }
+
+
+def run_server(port, hz, ready):
+    import cbs_rt_server as core
+
+    async def main():
+        await core.start_async_server("127.0.0.1", port)
+        ready.set()
+        i = 0
+        period = 1.0 / hz
+        next_t = time.monotonic()
+        while True:
+            payload = synthetic_payload(i)
+            payload["sent_at"] = time.time()
+            core.broadcaster.publish(payload)
+            i += 1
+            next_t += period
+            await asyncio.sleep(max(0.0, next_t - time.monotonic()))
+
+    asyncio.run(main())
+
+
+def proc_cpu_s(pid):
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def proc_threads(pid):
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("Threads:"):
+            return int(line.split()[1])
+    return 0
+
+
+async def client(port, deadline, latencies, counts, idx):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: bench\r\n\r\n")
+    await writer.drain()
+    n = 0
+    try:
+        while time.time() < deadline:
+            try:
+                line = await asyncio.wait_for(reader.readline(), deadline - time.time())
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            if line.startswith(b"data: "):
+                data = json.loads(line[6:])
+                latencies.append(time.time() - data["sent_at"])
+                n += 1
+    finally:
+        counts[idx] = n
+        writer.close()
+
+
+async def run_clients(port, clients, seconds):
+    latencies = []
+    counts = [0] * clients
+    deadline = time.time() + seconds
+    await asyncio.gather(*(client(port, deadline, latencies, counts, i) for i in range(clients)))
+    return latencies, counts
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=200)
+    ap.add_argument("--hz", type=float, default=10.0)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    args = ap.parse_args()
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=run_server, args=(port, args.hz, ready), daemon=True)
+    server.start()
+    ready.wait(10)
+    cpu0 = proc_cpu_s(server.pid)
+    t0 = time.time()
+    latencies, counts = asyncio.run(run_clients(port, args.clients, args.seconds))
+    wall = time.time() - t0
+    cpu = proc_cpu_s(server.pid) - cpu0
+    threads = proc_threads(server.pid)
+    server.terminate()
+
+    latencies.sort()
+    expected = args.hz * args.seconds
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else float("nan")
+
+    print(f"clients={args.clients} rate={args.hz:g} Hz duration={args.seconds:g} s")
+    print(f"server threads={threads} cpu={cpu:.2f} s ({100 * cpu / wall:.1f}% of one core)")
+    print(f"messages/client min={min(counts)} max={max(counts)} expected~{expected:.0f}")
+    print(f"delivery latency ms p50={pct(0.5):.2f} p99={pct(0.99):.2f} max={pct(1.0):.2f}")
+
+
+if __name__ == "__main__":
+    main()
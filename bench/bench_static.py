@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# Static asset serving: bytes on the wire for a cold dashboard load (no
+# cache, gzip accepted) and a repeat load (If-None-Match -> 304), plus
+# requests/s for app.js, against the threaded and the asyncio server.
+# Usage: bench_static.py [--n 500]
+import argparse
+import asyncio
+import http.client
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+import cbs_rt_server as core  # noqa: E402
+
+# What index.html pulls in on load.
+PAGE = ["/", "/styles.css", "/charts.js", "/render.js", "/app.js", "/chart_worker.js"]
+
+
+def fetch(port, path, headers):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("GET", path, headers=headers)
+    r = conn.getresponse()
+    body = r.read()
+    conn.close()
+    return r.status, len(body), r.getheader("ETag")
+
+
+def page_load(port, etags=None):
+    wire = 0
+    statuses = []
+    new_etags = {}
+    for path in PAGE:
+        headers = {"Accept-Encoding": "gzip"}
+        if etags:
+            headers["If-None-Match"] = etags[path]
+        status, size, etag = fetch(port, path, headers)
+        wire += size
+        statuses.append(status)
+        new_etags[path] = etag
+    return wire, statuses, new_etags
+
+
+def measure(label, port, n):
+    raw = sum((core.STATIC / ("index.html" if p == "/" else p.lstrip("/"))).stat().st_size for p in PAGE)
+    cold, statuses, etags = page_load(port)
+    warm, warm_statuses, _ = page_load(port, etags)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fetch(port, "/app.js", {"Accept-Encoding": "gzip"})
+    rps = n / (time.perf_counter() - t0)
+    print(f"{label:9} files {raw / 1024:.1f} KiB -> cold load {cold / 1024:.1f} KiB {statuses}, "
+          f"repeat {warm} B {warm_statuses}, app.js {rps:.0f} req/s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=500)
+    args = ap.parse_args()
+    core.assets.load()
+    server = core.ThreadingHTTPServer(("127.0.0.1", 0), core.Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    measure("threaded", server.server_address[1], args.n)
+    server.shutdown()
+
+    loop = asyncio.new_event_loop()
+    srv = loop.run_until_complete(core.start_async_server("127.0.0.1", 0))
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    measure("asyncio", srv.sockets[0].getsockname()[1], args.n)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# Server pipeline benchmark suite, no hardware needed: synthetic rxcap/txgen
+# CSVs (fixed seed) go through the same code the dashboard runs. Measures
+#   csv_ingest        CsvTailReader rows/s on a 200k-row rxcap CSV
+#   sample_compute    RxSampleProcessor.process cost per rxcap row
+#   json_encode       payload -> SSE frame cost and size
+#   sse_fanout_N      Broadcaster delivery to 1/10/100 clients
+#   memory_1h         Python object and RSS growth over a simulated 1-hour run
+#                     (10 Hz rows, 40 live lines each, history recording)
+# Timings are the best of --repeat runs. Results are written as JSON
+# (default bench/results/<commit>.json); --compare OLD.json prints the
+# change per metric and exits 1 when one regressed by more than --threshold.
+# Usage: bench_suite.py [--repeat 3] [--quick] [--out FILE] [--compare OLD.json] [--threshold 0.15]
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH.parents[0] / "cbs_dashboard_rt"))
+
+import cbs_rt_server as core  # noqa: E402
+from broadcaster import Broadcaster  # noqa: E402
+from run_history import RunHistory  # noqa: E402
+from tail_reader import CsvTailReader  # noqa: E402
+from traffic_sim import RX_HEADER, TX_HEADER  # noqa: E402
+
+PACKET_SIZE = 512
+RATE_MBPS = [1.0 + tc for tc in range(8)]
+IDLE = [int(r * 1000) for r in RATE_MBPS]
+HZ = 10
+LIVE_PER_ROW = 40
+PAYLOAD_SAMPLE = 2000
+
+
+def write_run(root, seconds, seed=1):
+    # rxcap CSV at HZ rows/s, one txgen stats file per TC at 1 row/s and a
+    # live file with LIVE_PER_ROW lines per row. Rates jitter by +-2%.
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    tx_dir = root / "tx_stats"
+    tx_dir.mkdir(exist_ok=True)
+    pps = [r * 1e6 / 8 / PACKET_SIZE for r in RATE_MBPS]
+    counts = [0] * 8
+    rows = int(seconds * HZ)
+    with open(root / "cbs_rx.csv", "w") as rx, open(root / "live_packets.csv", "w") as live:
+        rx.write(RX_HEADER + "\n")
+        for i in range(1, rows + 1):
+            t = i / HZ
+            for tc in range(8):
+                counts[tc] += int(pps[tc] / HZ * rng.uniform(0.98, 1.02))
+            total = sum(counts)
+            total_pps = sum(pps)
+            pcp = ",".join(map(str, counts))
+            rx.write(f"{t:.3f},{total},{total_pps:.1f},{total_pps * PACKET_SIZE * 8 / 1e6:.3f},0,{pcp},"
+                     f"{total},0,{total},{total}\n")
+            live.write("".join(
+                f"{t + k / HZ / LIVE_PER_ROW:.6f},{PACKET_SIZE},02:00:00:00:00:0{k % 8},c8:4d:44:26:3b:a6,100,{k % 8},"
+                f"10.0.100.1,10.0.100.2,{5000 + k % 8},5001\n"
+                for k in range(LIVE_PER_ROW)
+            ))
+    for tc in range(8):
+        with open(tx_dir / f"tx_stats_tc{tc}.csv", "w") as f:
+            f.write(TX_HEADER + "\n")
+            n = 0
+            for s in range(1, int(seconds) + 1):
+                step = int(pps[tc] * 1.25)
+                n += step
+                f.write(f"{s},{n},{n * PACKET_SIZE},{step},{RATE_MBPS[tc] * 1.25:.3f},0\n")
+    return root
+
+
+def bench_cfg():
+    return core.build_cfg({
+        "backend": "sim", "packet_size": PACKET_SIZE, "idle_slope_kbps": IDLE,
+        "rate_per_tc_mbps": 5, "smooth_window": 5,
+    })
+
+
+def best_of(repeat, fn):
+    # fn() -> (elapsed_s, extra); returns the fastest run.
+    runs = [fn() for _ in range(repeat)]
+    return min(runs, key=lambda r: r[0])
+
+
+def read_all(path):
+    reader = CsvTailReader(path)
+    rows = reader.poll_dicts()
+    out = []
+    while rows:
+        out.extend(rows)
+        rows = reader.poll_dicts()
+    reader.close()
+    return out
+
+
+def bench_csv_ingest(root, repeat):
+    path = root / "cbs_rx.csv"
+    size = path.stat().st_size
+
+    def run():
+        t0 = time.perf_counter()
+        n = len(read_all(path))
+        return time.perf_counter() - t0, n
+
+    el, n = best_of(repeat, run)
+    return {
+        "rows_per_s": metric(n / el, "rows/s", "higher"),
+        "mb_per_s": metric(size / el / 1e6, "MB/s", "higher"),
+    }
+
+
+def new_processor(root, cfg):
+    tx = core.TxStatsAggregator(root / "tx_stats")
+    tx.poll()
+    proc = core.RxSampleProcessor(cfg, tx, read_ifaces=False)
+    # Stats are complete up front, as in replay.
+    proc.tx_watched = True
+    proc.tx_stale = False
+    return proc
+
+
+def bench_sample_compute(root, rows, repeat):
+    cfg = bench_cfg()
+    payloads = []
+
+    def run():
+        # Only a bounded sample of payloads is kept for the encode/fan-out
+        # cases; holding all of them would bill GC time to process().
+        proc = new_processor(root, cfg)
+        out = []
+        keep = PAYLOAD_SAMPLE
+        t0 = time.perf_counter()
+        for curr in rows:
+            payload = proc.process(curr)
+            if keep and payload:
+                out.append(payload)
+                keep -= 1
+        el = time.perf_counter() - t0
+        proc.close()
+        payloads[:] = out
+        return el, len(rows)
+
+    el, n = best_of(repeat, run)
+    return {"us_per_sample": metric(el / n * 1e6, "us", "lower")}, payloads
+
+
+def bench_json_encode(payloads, repeat):
+    def run():
+        t0 = time.perf_counter()
+        size = 0
+        for p in payloads:
+            size += len(Broadcaster.encode(p))
+        return time.perf_counter() - t0, size
+
+    el, size = best_of(repeat, run)
+    n = len(payloads)
+    return {
+        "us_per_payload": metric(el / n * 1e6, "us", "lower"),
+        "bytes_per_payload": metric(size / n, "B", "lower"),
+    }
+
+
+def bench_sse_fanout(payloads, clients, repeat, deliveries):
+    # Enough publishes for the same number of deliveries at every N.
+    publishes = max(100, deliveries // clients)
+    frames = [Broadcaster.encode(payloads[i % len(payloads)]) for i in range(publishes)]
+
+    def run():
+        hub = Broadcaster()
+        subs = [hub.subscribe(name=f"c{i}") for i in range(clients)]
+        delivered = 0
+        sent = 0
+        t0 = time.perf_counter()
+        for frame in frames:
+            hub.publish_raw(frame)
+            for sub in subs:
+                msgs = sub.wait(timeout=0)
+                if msgs:
+                    data = b"".join(msgs)
+                    sub.record_sent(msgs)
+                    delivered += len(msgs)
+                    sent += len(data)
+        el = time.perf_counter() - t0
+        for sub in subs:
+            sub.close()
+        return el, (delivered, sent)
+
+    el, (delivered, sent) = best_of(repeat, run)
+    return {
+        "msgs_per_s": metric(delivered / el, "msgs/s", "higher"),
+        "mb_per_s": metric(sent / el / 1e6, "MB/s", "higher"),
+        "us_per_publish": metric(el / publishes * 1e6, "us", "lower"),
+    }
+
+
+def rss_kib():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * 4
+    except OSError:
+        return 0
+
+
+def bench_memory(root, tmp):
+    # One simulated hour, read in small polls as csv_watcher sees a live
+    # file. Growth is measured after a 5-minute warm-up, so caches and
+    # rolling windows that fill once are not counted. Allocated blocks
+    # (sys.getallocatedblocks) stand in for tracemalloc, which would slow
+    # the run several times over.
+    cfg = bench_cfg()
+    cfg["arrival_hist"] = True
+    hub = Broadcaster()
+    sub = hub.subscribe(name="mem")
+    history = RunHistory(Path(tmp) / "runs.sqlite")
+    recorder = history.start_run(cfg)
+    core.state["live_ring"].clear()
+    core.state["arrivals"] = core.arrival_analyzer(cfg)
+    proc = new_processor(root, cfg)
+    rx = CsvTailReader(root / "cbs_rx.csv", max_bytes=4096)
+    live = open(root / "live_packets.csv")
+    warm_rows = 5 * 60 * HZ
+    rows = 0
+    base = base_rss = None
+    t0 = time.perf_counter()
+    while True:
+        batch = rx.poll_dicts()
+        if not batch:
+            break
+        for curr in batch:
+            core.take_live_lines([live.readline().strip() for _ in range(LIVE_PER_ROW)])
+            payload = proc.process(curr)
+            if payload:
+                hub.publish(payload)
+                recorder.add(payload)
+                sub.record_sent(sub.wait(timeout=0))
+            rows += 1
+            if rows == warm_rows:
+                gc.collect()
+                base = sys.getallocatedblocks()
+                base_rss = rss_kib()
+    el = time.perf_counter() - t0
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    recorder.close("done")
+    proc.close()
+    rx.close()
+    live.close()
+    sub.close()
+    core.state["arrivals"] = None
+    return {
+        "heap_growth_blocks": metric(blocks - base, "blocks", "lower", slack=2000),
+        "rss_growth_kib": metric(rss_kib() - base_rss, "KiB", "lower", slack=1024),
+        "rows": metric(rows, "rows", None),
+        "wall_s": metric(el, "s", None),
+    }
+
+
+def metric(value, unit, better, slack=0):
+    # slack: absolute change never counted as a regression (for values that
+    # hover around zero, like memory growth).
+    return {"value": round(value, 4), "unit": unit, "better": better, "slack": slack}
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH, capture_output=True, text=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BENCH,
+                               capture_output=True, text=True).stdout.strip()
+        return out.stdout.strip() + ("-dirty" if dirty else "") if out.returncode == 0 else "unknown"
+    except OSError:
+        return "unknown"
+
+
+def compare(old, new, threshold):
+    # Prints old -> new per metric; returns the regressions beyond threshold.
+    regressions = []
+    print(f"\n{'metric':42} {'old':>12} {'new':>12} {'change':>8}")
+    for case, metrics in new["results"].items():
+        for name, m in metrics.items():
+            prev = old["results"].get(case, {}).get(name)
+            if not prev:
+                continue
+            if not prev["value"]:
+                print(f"{case + '.' + name:42} {prev['value']:12.4g} {m['value']:12.4g}")
+                continue
+            change = (m["value"] - prev["value"]) / abs(prev["value"])
+            worse = {"higher": -change, "lower": change}.get(m["better"], 0.0)
+            flag = ""
+            if worse > threshold and abs(m["value"] - prev["value"]) > m.get("slack", 0):
+                flag = "REGRESSION"
+                regressions.append(f"{case}.{name}")
+            print(f"{case + '.' + name:42} {prev['value']:12.4g} {m['value']:12.4g} {change * 100:+7.1f}% {flag}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--quick", action="store_true", help="smaller inputs, for a smoke run")
+    ap.add_argument("--out", help="result JSON (default bench/results/<commit>.json)")
+    ap.add_argument("--compare", metavar="OLD_JSON", help="compare against an earlier result file")
+    ap.add_argument("--threshold", type=float, default=0.15, help="relative change counted as a regression")
+    args = ap.parse_args()
+
+    ingest_rows = 20_000 if args.quick else 200_000
+    compute_rows = 3_000 if args.quick else 36_000
+    memory_s = 600 if args.quick else 3600
+    deliveries = 50_000 if args.quick else 400_000
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ingest = write_run(tmp / "ingest", ingest_rows / HZ)
+        results["csv_ingest"] = bench_csv_ingest(ingest, args.repeat)
+        rows = read_all(ingest / "cbs_rx.csv")[:compute_rows]
+        results["sample_compute"], payloads = bench_sample_compute(ingest, rows, args.repeat)
+        results["json_encode"] = bench_json_encode(payloads, args.repeat)
+        for clients in (1, 10, 100):
+            results[f"sse_fanout_{clients}"] = bench_sse_fanout(payloads, clients, args.repeat, deliveries)
+        hour = write_run(tmp / "hour", memory_s, seed=2)
+        results["memory_1h"] = bench_memory(hour, tmp)
+
+    report = {
+        "commit": git_commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "repeat": args.repeat, "quick": args.quick, "ingest_rows": ingest_rows,
+            "compute_rows": compute_rows, "memory_s": memory_s, "deliveries": deliveries,
+        },
+        "results": results,
+    }
+    for case, metrics in results.items():
+        print(f"{case:16} " + "  ".join(f"{k} {m['value']:.4g} {m['unit']}" for k, m in metrics.items()))
+    out = Path(args.out) if args.out else BENCH / "results" / f"{report['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=1) + "\n")
+    print(f"wrote {out}")
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text())
+        if old.get("params") != report["params"]:
+            print("warning: params differ from the compared run")
+        regressions = compare(old, report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold * 100:.0f}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Parameter sweep against the simulator backend through run_sweep(): wall
+# time per point with steady-state early stop vs. the configured duration,
+# plus the per-point verdicts from the summary table.
+# Usage: bench_sweep.py [--duration 20] [--window-s 3] [--asyncio]
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+import cbs_rt_server as core  # noqa: E402
+from run_history import RunHistory  # noqa: E402
+
+GRID = {
+    "idle_slope_kbps": [[1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000], 5000],
+    "packet_size": [256, 1024],
+    "rate_per_tc_mbps": [20, 60],
+}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--duration", type=int, default=20)
+    ap.add_argument("--window-s", type=float, default=3.0)
+    ap.add_argument("--asyncio", action="store_true")
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        core.CSV_PATH = Path(tmp) / "cbs_rx.csv"
+        core.LIVE_PATH = Path(tmp) / "live_packets.csv"
+        core.TX_STATS_DIR = Path(tmp) / "tx_stats"
+        core.history = RunHistory(Path(tmp) / "runs.sqlite")
+        body = {
+            "base": {"backend": "sim", "duration": args.duration, "smooth_window": 5},
+            "grid": GRID,
+            "window_s": args.window_s,
+        }
+        status, info, sweep = core.sweep_request(body)
+        assert sweep, info
+        t0 = time.monotonic()
+        if args.asyncio:
+            core.broadcaster = core.AsyncBroadcaster(append_max=core.CAP_LINES_MAX)
+            asyncio.run(core.run_sweep_async(sweep))
+        else:
+            core.run_sweep(sweep)
+        wall = time.monotonic() - t0
+        summary = sweep.summary()
+        table = (Path(tmp) / f"sweep_{sweep.id}.csv").read_text().splitlines()
+    full = len(sweep.points) * (args.duration + 2)
+    print(f"{summary['done']}/{summary['points']} points, state={summary['state']}, wall={wall:.1f} s "
+          f"(full-duration runs would take >= {full} s)")
+    for r in summary["rows"]:
+        p = r["params"]
+        slope = p["idle_slope_kbps"]
+        slope = slope[0] if len(set(slope)) == 1 else "1..8k"
+        err = max(abs(e) for e in r["mean_err"]) * 100
+        print(f"  #{r['i']:2} idle={slope!s:6} size={p['packet_size']:5} rate={p['rate_per_tc_mbps']:3} "
+              f"{r['verdict']:4} {r['reason']:7} run={r['run_s']:5.1f}s wall={r['wall_s']:5.1f}s max|err|={err:5.2f}%")
+    print(f"summary csv: {len(table) - 1} rows, {len(table[0].split(','))} columns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# Per-poll cost of CsvTailReader against rxcap CSVs of increasing length.
+# Usage: bench_tail_reader.py [rows,rows,...] [--dir DIR]
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+from tail_reader import CsvTailReader  # noqa: E402
+
+HEADER = (
+    "time_s,total_pkts,total_pps,total_mbps,drops,"
+    + ",".join(f"pcp{i}_pkts" for i in range(8))
+    + ",vlan_pkts,non_vlan_pkts,seq_pkts,embedded_pcp_pkts\n"
+)
+
+
+def make_row(i):
+    t = i * 0.1
+    pkts = i * 800
+    pcp = ",".join(str(i * 100) for _ in range(8))
+    return f"{t:.3f},{pkts},8000.0,57.344,0,{pcp},{pkts},0,{pkts},{pkts}\n"
+
+
+def write_rows(path, n):
+    block = "".join(make_row(i) for i in range(10_000)).encode()
+    per_block = 10_000
+    with open(path, "wb") as f:
+        f.write(HEADER.encode())
+        done = 0
+        while done + per_block <= n:
+            f.write(block)
+            done += per_block
+        for i in range(done, n):
+            f.write(make_row(i).encode())
+
+
+def bench(path, n, polls=2000):
+    write_rows(path, n)
+    reader = CsvTailReader(path)
+    t0 = time.perf_counter()
+    caught = 0
+    while True:
+        rows = reader.poll()
+        if not rows:
+            break
+        caught += len(rows)
+    catchup_s = time.perf_counter() - t0
+
+    # Steady state: one appended row per poll, as rxcap does every live-rate-ms.
+    samples = []
+    with open(path, "ab", buffering=0) as f:
+        for i in range(polls):
+            f.write(make_row(n + i).encode())
+            t = time.perf_counter()
+            rows = reader.poll()
+            samples.append(time.perf_counter() - t)
+            assert len(rows) == 1
+    reader.close()
+    samples.sort()
+    return {
+        "rows": n,
+        "file_mb": os.path.getsize(path) / 1e6,
+        "catchup_s": catchup_s,
+        "catchup_rows": caught,
+        "poll_p50_us": samples[len(samples) // 2] * 1e6,
+        "poll_p99_us": samples[int(len(samples) * 0.99)] * 1e6,
+    }
+
+
+def row_counts(text):
+    return [int(x) for x in text.split(",")]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("rows", nargs="?", default="10000,1000000,10000000",
+                    type=row_counts, help="comma-separated CSV lengths")
+    ap.add_argument("--dir", help="directory for the temporary CSV (default: system temp)")
+    args = ap.parse_args()
+    sizes = args.rows
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = Path(tmp) / "cbs_rx.csv"
+        print(f"{'rows':>10} {'file MB':>9} {'catch-up s':>11} {'poll p50 us':>12} {'poll p99 us':>12}")
+        for n in sizes:
+            r = bench(path, n)
+            print(f"{r['rows']:>10} {r['file_mb']:>9.1f} {r['catchup_s']:>11.2f} "
+                  f"{r['poll_p50_us']:>12.1f} {r['poll_p99_us']:>12.1f}")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# TcMetricsEngine vs. the original per-sample deque loop from csv_watcher:
+# checks the two produce the same payload fields on synthetic rxcap data and
+# reports per-sample cost for both.
+# Usage: bench_tc_metrics.py [--rows 200000] [--window 20]
+import argparse
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+from tc_metrics import TcMetricsEngine  # noqa: E402
+
+FIELDS = ("per_tc_mbps", "per_tc_mbps_payload", "per_tc_pps", "pred_mbps", "exp_mbps", "exp_pps")
+
+
+class LegacyLoop:
+    # The per-TC block of csv_watcher before the engine, kept verbatim.
+    def __init__(self, idle, pkt_size, tolerance, smooth):
+        self.idle = idle
+        self.pkt_size = pkt_size
+        self.tolerance = tolerance
+        self.tc_windows = [deque(maxlen=max(1, smooth)) for _ in range(8)]
+        self.pps_windows = [deque(maxlen=max(1, smooth)) for _ in range(8)]
+
+    def push(self, dt, deltas, tx_tc_mbps):
+        idle, pkt_size, tolerance = self.idle, self.pkt_size, self.tolerance
+        tc_windows, pps_windows = self.tc_windows, self.pps_windows
+        pkt_size_eff = pkt_size
+        per_tc_mbps, per_tc_mbps_payload, per_tc_pps = [], [], []
+        pred_mbps, exp_mbps, exp_pps, pass_list = [], [], [], []
+        total_mbps_pcp = 0.0
+        sum_pcp_delta = 0
+        for tc in range(8):
+            dp = deltas[tc]
+            sum_pcp_delta += max(0, dp)
+            if dt > 0:
+                mbps = (dp * pkt_size_eff * 8) / (dt * 1_000_000)
+                mbps_payload = (dp * pkt_size * 8) / (dt * 1_000_000)
+                pps = dp / dt
+            else:
+                mbps = 0.0
+                mbps_payload = 0.0
+                pps = 0.0
+            tc_windows[tc].append(mbps)
+            pps_windows[tc].append(pps)
+            avg = sum(tc_windows[tc]) / len(tc_windows[tc])
+            avg_pps = sum(pps_windows[tc]) / len(pps_windows[tc])
+            per_tc_mbps.append(avg)
+            per_tc_mbps_payload.append(mbps_payload)
+            per_tc_pps.append(avg_pps)
+            total_mbps_pcp += avg
+            pred = idle[tc] / 1000.0
+            pred_mbps.append(pred)
+            expected = min(pred, tx_tc_mbps[tc]) if tx_tc_mbps[tc] > 0 else pred
+            exp_mbps.append(expected)
+            exp_pps.append((expected * 1_000_000 / 8) / pkt_size_eff if pkt_size_eff > 0 else 0.0)
+            diff = abs(avg - expected) / expected if expected > 0 else 0
+            pass_list.append(diff <= tolerance)
+        return {
+            "per_tc_mbps": per_tc_mbps, "per_tc_mbps_payload": per_tc_mbps_payload,
+            "per_tc_pps": per_tc_pps, "pred_mbps": pred_mbps, "exp_mbps": exp_mbps,
+            "exp_pps": exp_pps, "pass": pass_list, "total_mbps_pcp": total_mbps_pcp,
+            "sum_pcp_delta": sum_pcp_delta,
+        }
+
+
+def synthetic(rows, seed=1):
+    rnd = random.Random(seed)
+    samples = []
+    for _ in range(rows):
+        dt = rnd.choice([0.1, 0.1, 0.1, 0.099, 0.101, 1.0])
+        deltas = [max(-2, int(rnd.gauss(90 * (tc + 1) * dt * 10, 20))) for tc in range(8)]
+        tx = [rnd.choice([0.0, 10.0, rnd.uniform(5, 60)]) for _ in range(8)]
+        samples.append((dt, deltas, tx))
+    return samples
+
+
+def close(a, b, rel=1e-9):
+    return abs(a - b) <= rel * max(1.0, abs(a), abs(b))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--window", type=int, default=20)
+    args = ap.parse_args()
+
+    idle = [1000 * (tc + 1) for tc in range(8)]
+    samples = synthetic(args.rows)
+    legacy = LegacyLoop(idle, 1400, 0.1, args.window)
+    engine = TcMetricsEngine(idle, 1400, 0.1, window=args.window)
+
+    mismatches = 0
+    pass_flips = 0
+    for dt, deltas, tx in samples:
+        a = legacy.push(dt, deltas, tx)
+        b = engine.push(dt, deltas, tx)
+        for f in FIELDS:
+            if not all(close(x, y) for x, y in zip(a[f], b[f])):
+                mismatches += 1
+        if not close(a["total_mbps_pcp"], b["total_mbps_pcp"]) or a["sum_pcp_delta"] != b["sum_pcp_delta"]:
+            mismatches += 1
+        # pass/fail may only differ when the error sits on the tolerance edge
+        pass_flips += sum(1 for x, y in zip(a["pass"], b["pass"]) if x != y)
+    print(f"equivalence: {args.rows} samples, {mismatches} field mismatches, {pass_flips} pass flips")
+    if mismatches or pass_flips:
+        sys.exit(1)
+
+    for label, impl in (("legacy", LegacyLoop(idle, 1400, 0.1, args.window)),
+                        ("engine", TcMetricsEngine(idle, 1400, 0.1, window=args.window))):
+        t0 = time.perf_counter()
+        for dt, deltas, tx in samples:
+            impl.push(dt, deltas, tx)
+        el = time.perf_counter() - t0
+        print(f"{label}: {el / args.rows * 1e6:6.2f} us/sample  ({args.rows / el:,.0f} samples/s)")
+
+
+if __name__ == "__main__":
+    main()
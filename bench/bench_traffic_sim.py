@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# Traffic simulator: (1) packets accounted per second of CPU by the CBS model
+# plus rxcap/txgen file output, run as fast as possible; (2) an end-to-end
+# run through start_test() with backend=sim, counting /events payloads and
+# comparing the measured per-TC rate with the idle slopes and the CBS model.
+# Usage: bench_traffic_sim.py [--sim-seconds 60] [--duration 5]
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+import cbs_rt_server as core  # noqa: E402
+from run_history import RunHistory  # noqa: E402
+from traffic_sim import CbsShaperSim, SimWriter  # noqa: E402
+
+IDLE = [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000]
+
+
+def accounting(tmp, sim_seconds, packet_size, rate, idle):
+    sim = CbsShaperSim(rate, idle, packet_size)
+    out = SimWriter(sim, Path(tmp) / "rx.csv", Path(tmp) / "live.csv", Path(tmp) / "tx")
+    c0 = time.process_time()
+    out.run_until(sim_seconds, 0.001)
+    cpu = time.process_time() - c0
+    out.close()
+    pkts = sum(sim.tx_pkts)
+    return pkts, sum(sim.rx_pkts), cpu
+
+
+def end_to_end(tmp, duration):
+    core.CSV_PATH = Path(tmp) / "cbs_rx.csv"
+    core.LIVE_PATH = Path(tmp) / "live_packets.csv"
+    core.TX_STATS_DIR = Path(tmp) / "tx_stats"
+    core.history = RunHistory(Path(tmp) / "runs.sqlite")
+    cfg = core.build_cfg({
+        "backend": "sim", "duration": duration, "rate_per_tc_mbps": 20,
+        "idle_slope_kbps": IDLE, "smooth_window": 5,
+    })
+    sub = core.broadcaster.subscribe(max_lag=256)
+    c0 = time.process_time()
+    core.start_test(cfg)
+    last = None
+    frames = 0
+    deadline = time.monotonic() + duration + 5
+    while core.state["running"] and time.monotonic() < deadline:
+        msgs = sub.wait(timeout=0.5)
+        frames += len(msgs)
+        if msgs:
+            last = msgs[-1]
+    cpu = time.process_time() - c0
+    core.stop_test()
+    sub.close()
+    return frames, last, cpu
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sim-seconds", type=float, default=60)
+    ap.add_argument("--duration", type=int, default=5)
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, size, rate, idle in (
+            ("64B unshaped", 64, 200, [1_000_000] * 8),
+            ("512B cbs", 512, 60, IDLE),
+        ):
+            tx, rx, cpu = accounting(tmp, args.sim_seconds, size, rate, idle)
+            print(f"{label:13} {args.sim_seconds:.0f} s simulated: tx={tx} rx={rx} "
+                  f"cpu={cpu:.3f} s -> {tx / cpu / 1e6:.1f} M pkts/s accounted")
+        frames, last, cpu = end_to_end(tmp, args.duration)
+    print(f"end-to-end {args.duration} s run: {frames} /events frames, server cpu={cpu:.3f} s")
+    if last:
+        import json
+        payload = json.loads(last[len(b"data: "):])
+        for tc in range(8):
+            print(f"  tc{tc}: idle={IDLE[tc] / 1000:.1f} Mbps model={payload['exp_mbps'][tc]:.2f} "
+                  f"measured={payload['per_tc_mbps'][tc]:.2f} "
+                  f"tx={payload['tx_tc_mbps'][tc]:.2f} pass={payload['pass'][tc]}")
+
+
+if __name__ == "__main__":
+    main()
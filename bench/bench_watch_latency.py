@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# End-to-end latency from an rxcap CSV append to the /events frame being
+# published, through the real csv_watcher thread. Runs once with inotify and
+# once with the adaptive polling fallback.
+# Usage: bench_watch_latency.py [--rows 100] [--interval-ms 100]
+import argparse
+import functools
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
+
+import cbs_rt_server as core  # noqa: E402
+from file_watch import FileWatcher  # noqa: E402
+
+HEADER = (
+    "time_s,total_pkts,total_pps,total_mbps,drops,"
+    + ",".join(f"pcp{i}_pkts" for i in range(8)) + "\n"
+)
+
+
+def row(i):
+    t = 2.0 + i * 0.1
+    pkts = 8000 * i
+    return f"{t:.3f},{pkts},8000.0,89.6,0," + ",".join(str(1000 * i) for _ in range(8)) + "\n"
+
+
+def run(tmp, rows, interval, use_inotify):
+    core.CSV_PATH = Path(tmp) / "cbs_rx.csv"
+    core.TX_STATS_DIR = Path(tmp) / "tx_stats"
+    core.TX_STATS_DIR.mkdir(exist_ok=True)
+    core.FileWatcher = functools.partial(FileWatcher, use_inotify=use_inotify)
+    core.CSV_PATH.write_text(HEADER + row(0))
+    core.state["cfg"] = core.build_cfg({"egress_iface": "bench0", "ingress_iface": "bench1"})
+    core.state["running"] = True
+    core.state["stop_event"].clear()
+    sub = core.broadcaster.subscribe()
+    t = threading.Thread(target=core.csv_watcher, daemon=True)
+    t.start()
+    time.sleep(0.3)
+    lat = []
+    with open(core.CSV_PATH, "a", buffering=1) as f:
+        for i in range(1, rows + 1):
+            t0 = time.perf_counter()
+            f.write(row(i))
+            f.flush()
+            msgs = sub.wait(timeout=2)
+            if msgs:
+                lat.append(time.perf_counter() - t0)
+            time.sleep(interval)
+    core.state["stop_event"].set()
+    t.join()
+    sub.close()
+    core.CSV_PATH.unlink()
+    lat.sort()
+    return lat
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100)
+    ap.add_argument("--interval-ms", type=float, default=100)
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, native in (("inotify", True), ("polling", False)):
+            lat = run(tmp, args.rows, args.interval_ms / 1000, native)
+            ms = [x * 1000 for x in lat]
+            print(f"{label:8} samples={len(ms):4} p50={ms[len(ms) // 2]:7.2f} ms "
+                  f"p99={ms[int(len(ms) * 0.99)]:7.2f} ms max={ms[-1]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import math
+from itertools import compress
+
+# Coarse chart bins for /events: octaves from 1 us to ~1 s, plus overflow.
+CHART_EDGES_US = [1 << k for k in range(21)]
+CHART_EDGES_NS = [e * 1000 for e in CHART_EDGES_US]
+IAT_QUANTILES = (0.5, 0.99, 0.999)
+
+
+class LogLinearHistogram:
+    # HDR-style histogram of non-negative integers (ns) in fixed memory:
+    # values below 2**sub_bits get their own bucket, above that every octave
+    # is split into 2**(sub_bits-1) equal buckets, so the relative error is
+    # at most 2**-(sub_bits-1). Values from 2**max_bits up are clamped.
+    def __init__(self, sub_bits=5, max_bits=40):
+        self.sub_bits = sub_bits
+        self.max_bits = max_bits
+        self.size = 1 << sub_bits
+        self.half = self.size >> 1
+        self.counts = [0] * (self.size + (max_bits - sub_bits) * self.half)
+        self.total = 0
+        self.max = 0
+
+    def index(self, v):
+        if v < self.size:
+            return v
+        shift = v.bit_length() - self.sub_bits
+        return self.size + (shift - 1) * self.half + (v >> shift) - self.half
+
+    def bounds(self, i):
+        # [lo, hi) of bucket i.
+        if i < self.size:
+            return i, i + 1
+        shift = (i - self.size) // self.half + 1
+        m = (i - self.size) % self.half + self.half
+        return m << shift, (m + 1) << shift
+
+    def record(self, v, n=1):
+        v = min(max(int(v), 0), (1 << self.max_bits) - 1)
+        self.counts[self.index(v)] += n
+        self.total += n
+        if v > self.max:
+            self.max = v
+
+    def summarize(self, qs, edges):
+        # One pass over the buckets: the q-quantiles (midpoint of the bucket
+        # holding each, qs ascending) and the counts per [edges[k],
+        # edges[k+1]) plus a final overflow bin, by bucket lower bound;
+        # values below edges[0] go to the first bin.
+        pct = [0.0] * len(qs)
+        out = [0] * len(edges)
+        if not self.total:
+            return pct, out
+        ranks = [max(1, math.ceil(q * self.total)) for q in qs]
+        j = 0
+        k = 0
+        seen = 0
+        counts = self.counts
+        # compress() skips the empty buckets in C; most of them are.
+        for i in compress(range(len(counts)), counts):
+            c = counts[i]
+            lo, hi = self.bounds(i)
+            seen += c
+            while j < len(ranks) and seen >= ranks[j]:
+                pct[j] = min((lo + hi - 1) / 2, self.max)
+                j += 1
+            while k + 1 < len(edges) and lo >= edges[k + 1]:
+                k += 1
+            out[k] += c
+        for j in range(j, len(ranks)):
+            pct[j] = float(self.max)
+        return pct, out
+
+
+class ArrivalAnalyzer:
+    # Streaming per-TC inter-arrival histograms and back-to-back burst
+    # lengths from packet arrival timestamps (rxcap live lines). Two packets
+    # are in the same burst when their gap is at most burst_gap_factor wire
+    # times of one frame at the link rate. bounds: per-TC burst limit in
+    # frames (CbsModel.burst_frames), None where there is none.
+    def __init__(self, bounds, packet_size, link_mbps=1000.0, tcs=8, burst_gap_factor=1.5,
+                 wire_overhead_bytes=24):
+        self.tcs = tcs
+        self.gaps = [LogLinearHistogram() for _ in range(tcs)]
+        self.last_t = [None] * tcs
+        self.burst = [0] * tcs
+        self.burst_max = [0] * tcs
+        wire_ns = (packet_size + wire_overhead_bytes) * 8 * 1e3 / link_mbps
+        self.burst_gap_ns = wire_ns * burst_gap_factor
+        self.bounds = list(bounds)
+        self.packets = 0
+        self.bad_lines = 0
+        # Per-TC (total, percentiles, chart bins), rebuilt only when the
+        # histogram got new samples since the last fields() call.
+        self._summary = [None] * tcs
+
+    def add(self, tc, t):
+        last = self.last_t[tc]
+        self.last_t[tc] = t
+        self.packets += 1
+        if last is None:
+            self.burst[tc] = 1
+            return
+        gap = (t - last) * 1e9
+        if gap < 0:
+            return
+        self.gaps[tc].record(gap)
+        if gap <= self.burst_gap_ns:
+            self.burst[tc] += 1
+            if self.burst[tc] > self.burst_max[tc]:
+                self.burst_max[tc] = self.burst[tc]
+        else:
+            self.burst[tc] = 1
+            if not self.burst_max[tc]:
+                self.burst_max[tc] = 1
+
+    def feed_lines(self, lines):
+        # Live lines: t,len,src,dst,vlan,pcp,...
+        tcs = self.tcs
+        for line in lines:
+            parts = line.split(",", 6)
+            try:
+                t = float(parts[0])
+                tc = int(parts[5])
+            except (IndexError, ValueError):
+                self.bad_lines += 1
+                continue
+            if 0 <= tc < tcs:
+                self.add(tc, t)
+
+    def summary(self, tc):
+        h = self.gaps[tc]
+        cached = self._summary[tc]
+        if cached is None or cached[0] != h.total:
+            pct, bins = h.summarize(IAT_QUANTILES, CHART_EDGES_NS)
+            cached = (h.total, [round(v / 1e3, 2) for v in pct], bins)
+            self._summary[tc] = cached
+        return cached
+
+    def fields(self):
+        summaries = [self.summary(tc) for tc in range(self.tcs)]
+        return {
+            "iat_p50_us": [s[1][0] for s in summaries],
+            "iat_p99_us": [s[1][1] for s in summaries],
+            "iat_p999_us": [s[1][2] for s in summaries],
+            "burst_max": list(self.burst_max),
+            "burst_bound": list(self.bounds),
+            "burst_ok": [None if b is None or not m else m <= b for m, b in zip(self.burst_max, self.bounds)],
+            "iat_hist_edges_us": CHART_EDGES_US,
+            "iat_hist": [s[2] for s in summaries],
+        }
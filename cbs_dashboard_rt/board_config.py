@@ -0,0 +1,124 @@
+from pathlib import Path
+
+IF_PATH = "/ietf-interfaces:interfaces/interface[name='{port}']"
+BRIDGE_PORT = IF_PATH + "/ieee802-dot1q-bridge:bridge-port"
+SHAPERS = IF_PATH + "/mchp-velocitysp-port:eth-qos/config/traffic-class-shapers"
+
+
+def _pcp_decoding(port):
+    rows = "".join(
+        f"  - priority-code-point: {p}\n    priority: {p}\n    drop-eligible: false\n" for p in range(8)
+    )
+    path = BRIDGE_PORT.format(port=port) + "/pcp-decoding-table/pcp-decoding-map"
+    return f'- ? "{path}"\n  : pcp: 8P0D\n- "{path}[pcp=\'8P0D\']/priority-map":\n{rows}'
+
+
+def _pcp_encoding(port):
+    rows = "".join(
+        f"  - priority: {p}\n    dei: false\n    priority-code-point: {p}\n" for p in range(8)
+    )
+    path = BRIDGE_PORT.format(port=port) + "/pcp-encoding-table/pcp-encoding-map"
+    return f'- ? "{path}"\n  : pcp: 8P0D\n- "{path}[pcp=\'8P0D\']/priority-map":\n{rows}'
+
+
+def board_entries(cfg):
+    # Desired board state as independent patch entries: key -> YAML item
+    # text, except CBS shapers which are ("cbs", port, tc) -> idle slope and
+    # are rendered together per port.
+    vlan = cfg["vlan_id"]
+    egress = cfg["egress_port"]
+    ingress = cfg["ingress_port"]
+    entries = {}
+    for attr, value in (
+        ("port-type", "ieee802-dot1q-bridge:c-vlan-bridge-port"),
+        ("acceptable-frame", "admit-only-VLAN-tagged-frames"),
+        ("enable-ingress-filtering", "true"),
+    ):
+        for port in (egress, ingress):
+            path = BRIDGE_PORT.format(port=port) + "/" + attr
+            entries[(attr, port)] = f'- ? "{path}"\n  : {value}\n'
+    ports = "".join(
+        f"      - port-ref: {port}\n        static-vlan-registration-entries:\n          vlan-transmitted: tagged\n"
+        for port in (egress, ingress)
+    )
+    entries[("vlan-registration", vlan)] = (
+        "- ? \"/ieee802-dot1q-bridge:bridges/bridge[name='b0']/component[name='c0']"
+        "/filtering-database/vlan-registration-entry\"\n"
+        f"  : database-id: 0\n    vids: '{vlan}'\n    entry-type: static\n    port-map:\n{ports}"
+    )
+    entries[("pcp-decoding", ingress)] = _pcp_decoding(ingress)
+    entries[("pcp-encoding", egress)] = _pcp_encoding(egress)
+    for tc, slope in enumerate(cfg["idle_slope_kbps"]):
+        entries[("cbs", egress, tc)] = int(slope)
+    return entries
+
+
+def render_patch(changes):
+    # One keti-tsn patch document for a set of entries.
+    items = []
+    shapers = {}
+    for key, value in changes.items():
+        if key[0] == "cbs":
+            shapers.setdefault(key[1], []).append((key[2], value))
+        else:
+            items.append(value)
+    for port, slopes in shapers.items():
+        rows = "".join(
+            f"  - traffic-class: {tc}\n    credit-based:\n      idle-slope: {slope}\n" for tc, slope in slopes
+        )
+        items.append(f'- "{SHAPERS.format(port=port)}":\n{rows}')
+    return "\n" + "\n".join(items)
+
+
+class BoardConfigManager:
+    # Remembers what was last applied to the board and turns a new cfg into
+    # the minimal set of changed entries, written as one combined patch.
+    # The cache is per server process; after a failed apply (or a board
+    # reset, via force) everything is sent again.
+    def __init__(self, patch_dir):
+        self.patch_dir = Path(patch_dir)
+        self.applied = {}
+        self.applies = 0
+        self.skipped = 0
+        self.entries_sent = 0
+
+    @property
+    def patch_path(self):
+        return self.patch_dir / "cbs_board_patch.yaml"
+
+    def diff(self, cfg, force=False):
+        want = board_entries(cfg)
+        changes = {k: v for k, v in want.items() if force or self.applied.get(k) != v}
+        # A port's traffic-class-shapers go out as one list, and the device
+        # may replace the list rather than merge it by traffic-class: when
+        # any TC of a port changes, every TC of that port is re-sent.
+        ports = {k[1] for k in changes if k[0] == "cbs"}
+        changes.update((k, v) for k, v in want.items() if k[0] == "cbs" and k[1] in ports)
+        return changes
+
+    def plan(self, cfg, force=False):
+        # Returns (changes, patch_file), or None when the board already
+        # matches cfg.
+        changes = self.diff(cfg, force)
+        if not changes:
+            self.skipped += 1
+            return None
+        self.patch_dir.mkdir(parents=True, exist_ok=True)
+        self.patch_path.write_text(render_patch(changes))
+        return changes, str(self.patch_path)
+
+    def commit(self, changes):
+        self.applied.update(changes)
+        self.applies += 1
+        self.entries_sent += len(changes)
+
+    def invalidate(self):
+        self.applied = {}
+
+    def stats(self):
+        return {
+            "applies": self.applies,
+            "skipped": self.skipped,
+            "entries_sent": self.entries_sent,
+            "entries_cached": len(self.applied),
+        }
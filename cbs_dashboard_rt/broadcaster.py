@@ -0,0 +1,315 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+
+
+def appended_lines(prev, curr):
+    # Lines at the end of curr that are not in prev, for a sliding window of
+    # log lines. None when the windows do not overlap (send curr whole).
+    if not prev:
+        return list(curr) if curr else []
+    if not curr:
+        return None
+    if len(prev) <= len(curr) and curr[:len(prev)] == prev:
+        return list(curr[len(prev):])
+    last = prev[-1]
+    for i in range(len(curr) - 1, -1, -1):
+        if curr[i] == last and curr[:i + 1] == prev[len(prev) - i - 1:]:
+            return list(curr[i + 1:])
+    return None
+
+
+class DeltaEncoder:
+    # Field-level diff between successive payloads for /events?mode=delta.
+    # append_field is a sliding window of lines (cap_lines): only the lines
+    # appended since the previous payload are sent, unless the window jumped.
+    def __init__(self, append_field="cap_lines", append_max=40):
+        self.append_field = append_field
+        self.append_max = append_max
+        self.last = None
+
+    def diff(self, payload):
+        # Returns (changed_fields, appended_lines) against the last payload.
+        prev, self.last = self.last, payload
+        if prev is None:
+            return dict(payload), []
+        changed = {}
+        for k, v in payload.items():
+            if k != self.append_field and prev.get(k, changed) != v:
+                changed[k] = v
+        for k in prev.keys() - payload.keys():
+            changed[k] = None
+        added = []
+        field = self.append_field
+        if field in payload:
+            added = appended_lines(prev.get(field), payload[field])
+            if added is None:
+                changed[field] = payload[field]
+                added = []
+        return changed, added
+
+    def merge(self, deltas):
+        # Collapse consecutive (changed, appended) pairs into one.
+        field = self.append_field
+        changed = {}
+        added = []
+        for c, a in deltas:
+            changed.update(c)
+            if field in c:
+                added = []
+            added.extend(a)
+        if field in changed:
+            changed[field] = (list(changed[field]) + added)[-self.append_max:]
+            added = []
+        return changed, added[-self.append_max:]
+
+    def encode(self, seq, changed, added):
+        msg = {"t": "delta", "seq": seq, "set": changed}
+        if added:
+            msg["append"] = {self.append_field: added}
+        return Broadcaster.encode(msg)
+
+
+class Subscription:
+    # One SSE client: a cursor into the broadcaster ring. A client that falls
+    # more than max_lag messages behind skips the oldest ones (counted in
+    # dropped) instead of buffering them. mode="delta" clients get a keyframe
+    # and then field deltas; min_interval > 0 coalesces everything published
+    # within that interval into one message.
+    def __init__(self, hub, sid, cursor, max_lag, name, mode="full", min_interval=0.0):
+        self.hub = hub
+        self.id = sid
+        self.name = name
+        self.cursor = cursor
+        self.max_lag = max_lag
+        self.mode = mode
+        self.min_interval = min_interval
+        self.need_key = mode == "delta"
+        self.next_due = 0.0
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.bytes_sent = 0
+        self.connected_at = time.time()
+
+    @property
+    def lag(self):
+        return self.hub.seq - self.cursor
+
+    def wait(self, timeout=None):
+        return self.hub.fetch(self, timeout)
+
+    def record_sent(self, msgs):
+        n = sum(len(m) for m in msgs)
+        self.sent += len(msgs)
+        self.bytes_sent += n
+        self.hub.record_sent(len(msgs), n)
+        if self.min_interval > 0:
+            self.next_due = time.monotonic() + self.min_interval
+
+    def pace(self):
+        # Seconds the caller should wait before the next fetch (rate limit).
+        if self.min_interval <= 0:
+            return 0.0
+        return max(0.0, self.next_due - time.monotonic())
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+    def stats(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "mode": self.mode,
+            "lag": self.lag,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "bytes_sent": self.bytes_sent,
+            "age_s": round(time.time() - self.connected_at, 1),
+        }
+
+
+class Broadcaster:
+    # Fan-out of pre-encoded SSE frames. publish() serializes once and stores
+    # the frame in a shared fixed-size ring; subscribers read from their own
+    # cursor, so publishing costs the same for 1 or 100 clients. While delta
+    # clients are connected the field delta is also computed and encoded once
+    # per publish, in a parallel ring.
+    def __init__(self, capacity=256, max_lag=64, append_max=40):
+        self.capacity = capacity
+        self.max_lag = min(max_lag, capacity)
+        self.seq = 0
+        self.published = 0
+        # Totals over all clients, including disconnected ones (/metrics).
+        self.sent = 0
+        self.bytes_sent = 0
+        self.dropped = 0
+        self._ring = [None] * capacity
+        self._deltas = [None] * capacity
+        self._delta = DeltaEncoder(append_max=append_max)
+        self._delta_subs = 0
+        self._key = (None, None)
+        self._last = None
+        self._cond = threading.Condition()
+        self._subs = {}
+        self._ids = itertools.count(1)
+
+    @staticmethod
+    def encode(payload):
+        return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
+
+    def publish(self, payload):
+        frame = self.encode(payload)
+        if self._delta_subs:
+            changed, added = self._delta.diff(payload)
+            # Unchanged repeats (e.g. the last valid sample) cost delta clients nothing.
+            delta = (changed, added, self._delta.encode(self.seq, changed, added) if changed or added else None)
+        else:
+            self._delta.last = payload
+            delta = None
+        self._push(frame, delta, payload)
+        return frame
+
+    def publish_raw(self, frame):
+        # Pre-encoded frames bypass the delta stream.
+        self._push(frame, None)
+        return frame
+
+    def publish_event(self, name, payload):
+        # Named SSE event (EventSource addEventListener(name)); delivered
+        # as-is in every mode and never coalesced away.
+        frame = f"event: {name}\ndata: {json.dumps(payload)}\n\n".encode("utf-8")
+        self._push(frame, (None, None, frame))
+        return frame
+
+    def _push(self, frame, delta, payload=None):
+        with self._cond:
+            i = self.seq % self.capacity
+            self._ring[i] = frame
+            self._deltas[i] = delta
+            if payload is not None:
+                self._last = payload
+            self.seq += 1
+            self.published += 1
+            self._cond.notify_all()
+
+    def subscribe(self, max_lag=None, name="", mode="full", max_hz=0):
+        lag = self.max_lag if max_lag is None else max(1, min(int(max_lag), self.capacity))
+        mode = "delta" if mode == "delta" else "full"
+        min_interval = 1.0 / max_hz if max_hz and max_hz > 0 else 0.0
+        with self._cond:
+            sub = Subscription(self, next(self._ids), self.seq, lag, name, mode, min_interval)
+            self._subs[sub.id] = sub
+            if mode == "delta":
+                self._delta_subs += 1
+                # Deliver the current state as the first keyframe.
+                if self._last is not None and self.seq:
+                    sub.cursor = self.seq - 1
+        return sub
+
+    def record_sent(self, msgs, nbytes):
+        with self._cond:
+            self.sent += msgs
+            self.bytes_sent += nbytes
+
+    def unsubscribe(self, sub):
+        with self._cond:
+            if self._subs.pop(sub.id, None) is not None and sub.mode == "delta":
+                self._delta_subs -= 1
+
+    def fetch(self, sub, timeout=None):
+        with self._cond:
+            if sub.cursor == self.seq and timeout != 0:
+                self._cond.wait(timeout)
+            behind = self.seq - sub.cursor
+            if behind <= 0:
+                return []
+            if behind > sub.max_lag:
+                sub.dropped += behind - sub.max_lag
+                self.dropped += behind - sub.max_lag
+                sub.cursor = self.seq - sub.max_lag
+                sub.need_key = True
+            if sub.mode == "delta":
+                deltas = [self._deltas[i % self.capacity] for i in range(sub.cursor, self.seq)]
+                seq = self.seq - 1
+                last = self._last
+            elif sub.min_interval > 0:
+                msgs = []
+                latest = None
+                for i in range(sub.cursor, self.seq):
+                    d = self._deltas[i % self.capacity]
+                    if d is not None and d[0] is None:
+                        msgs.append(d[2])
+                    else:
+                        latest = self._ring[i % self.capacity]
+                if latest is not None:
+                    msgs.append(latest)
+                sub.coalesced += self.seq - sub.cursor - len(msgs)
+            else:
+                msgs = [self._ring[i % self.capacity] for i in range(sub.cursor, self.seq)]
+            sub.cursor = self.seq
+        if sub.mode == "delta":
+            return self._delta_frames(sub, deltas, seq, last)
+        return msgs
+
+    def _delta_frames(self, sub, deltas, seq, last):
+        # Encoding a keyframe or a merged delta happens outside the lock and
+        # only for clients that need one.
+        events = [d[2] for d in deltas if d is not None and d[0] is None]
+        if sub.need_key or None in deltas:
+            if last is None:
+                return events
+            sub.need_key = False
+            key_seq, frame = self._key
+            if key_seq != seq:
+                frame = self.encode({"t": "key", "seq": seq, "f": last})
+                self._key = (seq, frame)
+            return events + [frame]
+        frames = [d[2] for d in deltas if d[2] is not None]
+        if len(frames) - len(events) <= 1:
+            return frames
+        if sub.min_interval > 0:
+            data = [(d[0], d[1]) for d in deltas if d[0] is not None and d[2] is not None]
+            sub.coalesced += len(data) - 1
+            changed, added = self._delta.merge(data)
+            return events + [self._delta.encode(seq, changed, added)]
+        return frames
+
+    def stats(self):
+        with self._cond:
+            subs = list(self._subs.values())
+        return {
+            "published": self.published,
+            "sent": self.sent,
+            "bytes_sent": self.bytes_sent,
+            "dropped": self.dropped,
+            "clients": [s.stats() for s in subs],
+        }
+
+
+class AsyncBroadcaster(Broadcaster):
+    # Same ring for the asyncio server: waiting clients share one future that
+    # is resolved on publish, so no thread is parked per client. publish()
+    # must be called from the event loop thread.
+    def __init__(self, capacity=256, max_lag=64, append_max=40):
+        super().__init__(capacity, max_lag, append_max)
+        self._waker = None
+
+    def _push(self, frame, delta, payload=None):
+        super()._push(frame, delta, payload)
+        waker, self._waker = self._waker, None
+        if waker is not None and not waker.done():
+            waker.set_result(None)
+
+    async def next(self, sub, timeout=None):
+        if sub.cursor == self.seq:
+            if self._waker is None:
+                self._waker = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(asyncio.shield(self._waker), timeout)
+            except asyncio.TimeoutError:
+                return []
+        return self.fetch(sub, 0)
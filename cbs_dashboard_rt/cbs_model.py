@@ -0,0 +1,138 @@
+from functools import lru_cache
+
+# Bytes a frame occupies on the wire beyond packet_size (the L2 frame as
+# txgen sends it, VLAN tag included, FCS excluded): FCS 4 + preamble/SFD 8
+# + inter-frame gap 12.
+WIRE_OVERHEAD_BYTES = 24
+
+
+class CbsModel:
+    # Analytical model of the egress port: eight TCs under strict priority
+    # (TC7 highest), each behind a credit-based shaper unless its idle slope
+    # reaches the link rate (unshaped). An idle slope of 0 never earns
+    # credit: the TC is disabled and expected to deliver 0. All rates here are in measured units (L2 Mbps of
+    # packet_size frames, as rxcap counts them) unless named *_bits/*_bps.
+    #
+    # The shaper charges cbs_overhead_bytes per frame on top of packet_size
+    # and the link carries wire_overhead_bytes, so a shaped TC delivers
+    # idleSlope * frame / (frame + cbs_overhead) and the port at most
+    # link * frame / (frame + wire_overhead). Credit parameters follow
+    # IEEE 802.1Q Annex L, generalized to any number of higher shaped TCs:
+    #   sendSlope = idleSlope - portRate
+    #   loCredit  = maxFrame * sendSlope / portRate
+    #   hiCredit  = idleSlope * (maxFrame / (portRate - sum(higher idleSlope))
+    #                            + sum(higher maxFrame) / portRate)
+    # A TC with an unshaped TC above it, or where the idle slopes from TC7
+    # down reach the port rate, has no bound (None).
+    def __init__(self, idle_slope_kbps, packet_size, link_mbps=1000.0, offered_mbps=None,
+                 cbs_overhead_bytes=WIRE_OVERHEAD_BYTES, wire_overhead_bytes=WIRE_OVERHEAD_BYTES):
+        tcs = len(idle_slope_kbps)
+        self.tcs = tcs
+        self.packet_size = packet_size
+        self.link_bps = link_mbps * 1e6
+        self.frame_bits = packet_size * 8
+        self.credit_bits = (packet_size + cbs_overhead_bytes) * 8
+        self.wire_bits = (packet_size + wire_overhead_bytes) * 8
+        self.idle_bps = [max(0.0, float(v) * 1000.0) for v in idle_slope_kbps]
+        self.shaped = [v < self.link_bps for v in self.idle_bps]
+        if offered_mbps is None:
+            offered_mbps = [0.0] * tcs
+        self.offered_mbps = [float(v) for v in offered_mbps]
+        # Measured-rate ceilings: per TC from its shaper, and for the port.
+        self.cap_mbps = [
+            self.idle_bps[tc] * self.frame_bits / self.credit_bits / 1e6 if self.shaped[tc] else None
+            for tc in range(tcs)
+        ]
+        self.link_cap_mbps = self.link_bps * self.frame_bits / self.wire_bits / 1e6
+        self._credits()
+        self.expected_default = self.expected(self.offered_mbps)
+        self._summary = None
+
+    def _credits(self):
+        rate = self.link_bps
+        frame = self.credit_bits
+        wire_s = self.wire_bits / rate
+        self.send_slope_bps = [None] * self.tcs
+        self.lo_credit_bits = [None] * self.tcs
+        self.hi_credit_bits = [None] * self.tcs
+        self.burst_frames = [None] * self.tcs
+        self.latency_us = [None] * self.tcs
+        higher_idle = 0.0
+        higher_frames = 0
+        blocked = False
+        for tc in range(self.tcs - 1, -1, -1):
+            idle = self.idle_bps[tc]
+            if not idle:
+                # Disabled TC: sends nothing, so has no bound and takes
+                # nothing from the TCs below.
+                continue
+            if blocked or not self.shaped[tc] or higher_idle + idle >= rate:
+                # Unshaped traffic above, or idle slopes that overcommit the
+                # port, leave everything from here down unbounded.
+                blocked = True
+                continue
+            send = idle - rate
+            lo = frame * send / rate
+            hi = idle * (frame / (rate - higher_idle) + higher_frames * frame / rate)
+            self.send_slope_bps[tc] = send
+            self.lo_credit_bits[tc] = lo
+            self.hi_credit_bits[tc] = hi
+            # Frames that can start back to back while credit stays >= 0.
+            self.burst_frames[tc] = 1 + int(hi // (-lo))
+            # Worst case for a frame at the head of the queue: wait for
+            # credit to climb from loCredit to 0 (idle slope) while being
+            # blocked long enough to build hiCredit, then transmit.
+            self.latency_us[tc] = ((hi - lo) / idle + wire_s) * 1e6
+            higher_idle += idle
+            higher_frames += 1
+
+    def expected(self, offered_mbps):
+        # Measured Mbps per TC for the given offered L2 Mbps: each TC gets
+        # min(offered, shaper cap) of what the TCs above it leave of the link.
+        left = self.link_cap_mbps
+        out = [0.0] * self.tcs
+        for tc in range(self.tcs - 1, -1, -1):
+            want = offered_mbps[tc] if offered_mbps[tc] > 0 else self.offered_mbps[tc]
+            cap = self.cap_mbps[tc]
+            if cap is not None and cap < want:
+                want = cap
+            if want > left:
+                want = left
+            out[tc] = want
+            left -= want
+        return out
+
+    def summary(self):
+        # Static per model; built once and shared by every payload.
+        if self._summary is None:
+            self._summary = self._build_summary()
+        return self._summary
+
+    def _build_summary(self):
+        kbps = 1e3
+        return {
+            "cap_mbps": self.cap_mbps,
+            "link_cap_mbps": self.link_cap_mbps,
+            "send_slope_kbps": [None if v is None else v / kbps for v in self.send_slope_bps],
+            "hi_credit_bits": [None if v is None else round(v) for v in self.hi_credit_bits],
+            "lo_credit_bits": [None if v is None else round(v) for v in self.lo_credit_bits],
+            "burst_frames": self.burst_frames,
+            "latency_us": [None if v is None else round(v, 1) for v in self.latency_us],
+        }
+
+
+@lru_cache(maxsize=64)
+def _cached_model(idle, packet_size, link_mbps, offered, cbs_overhead, wire_overhead):
+    return CbsModel(list(idle), packet_size, link_mbps, list(offered), cbs_overhead, wire_overhead)
+
+
+def cbs_model(cfg):
+    # Memoized per config: runs and sweep points that repeat a config reuse
+    # the same model.
+    idle = tuple(float(v) for v in cfg["idle_slope_kbps"])
+    offered = (float(cfg.get("rate_per_tc_mbps", 0)),) * len(idle)
+    return _cached_model(
+        idle, int(cfg["packet_size"]), float(cfg.get("link_mbps", 1000.0)), offered,
+        int(cfg.get("cbs_overhead_bytes", WIRE_OVERHEAD_BYTES)),
+        int(cfg.get("wire_overhead_bytes", WIRE_OVERHEAD_BYTES)),
+    )
@@ -1,16 +1,40 @@
 #!/usr/bin/env python3
+import argparse
+import asyncio
+import itertools
 import json
 import os
+import re
 import signal
 import subprocess
+import sys
 import threading
 import time
 import shutil
 from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
 from pathlib import Path
-from queue import Queue, Empty
-from collections import deque
+
+from arrival_hist import ArrivalAnalyzer
+from board_config import BoardConfigManager
+from cbs_model import WIRE_OVERHEAD_BYTES, cbs_model
+from broadcaster import AsyncBroadcaster, Broadcaster
+from file_watch import FileWatcher
+from iface_stats import IFACE_COUNTERS, IfaceSampler
+from instrument import Metrics, StackSampler
+from run_history import RunHistory
+from seq_analysis import SEQ_RECORD, SeqAnalyzer
+from static_cache import StaticCache
+from stats_ingest import STATS_RECORD, RecordSocket, StatsWindow, feed_packets
+from steady_state import SteadyStateDetector
+from sweep import Sweep
+from live_ring import LiveRing
+from run_session import AdmissionControl, AdmissionError, SessionPaths
+from tail_reader import CsvTailReader, RecordTailReader
+from tc_metrics import TcMetricsEngine
+from tx_orchestrator import ProcCpuMonitor, parse_cpu_list, pinned_session, plan_tx_groups, privileged
+from tx_stats import TxStatsAggregator
 
 ROOT = Path(__file__).resolve().parent
 STATIC = ROOT / "static"
@@ -18,23 +42,128 @@ CSV_PATH = Path("/home/kim/tsn_results/cbs_rx.csv")
 PATCH_DIR = Path("/home/kim/cbs_dashboard_rt/tmp")
 TX_STATS_DIR = Path("/home/kim/tsn_results/tx_stats")
 LIVE_PATH = Path("/home/kim/tsn_results/live_packets.csv")
+SEQ_DUMP_PATH = Path("/home/kim/tsn_results/seq_dump.bin")
+HISTORY_PATH = Path("/home/kim/tsn_results/cbs_runs.sqlite")
+PROFILE_PATH = Path("/home/kim/tsn_results/cbs_profile.folded")
+# Per-session output files of POST /runs sessions: SESSIONS_DIR/<sid>/...
+SESSIONS_DIR = Path("/home/kim/tsn_results/sessions")
 KETI_CLI = Path("/home/kim/keti-tsn-cli/keti-tsn")
+RXCAP = "/home/kim/traffic-generator/rxcap"
+TXGEN = "/home/kim/traffic-generator/txgen"
+TRAFFIC_SIM = ROOT / "traffic_sim.py"
 DEVICE = "/dev/ttyACM0"
 CAP_LINES_MAX = 40
-
-state = {
-    "running": False,
-    "cfg": None,
-    "rx_proc": None,
-    "tx_proc": None,
-    "tx_procs": [],
-    "cap_proc": None,
-    "cap_lines": deque(maxlen=CAP_LINES_MAX),
-    "cap_mode": "none",
-    "stop_event": threading.Event(),
+# Live packet lines kept for /live?since=<id> clients; older ones are dropped.
+LIVE_RING_MAX = 4096
+# Upper bound on how long a file reader sleeps without a change notification;
+# also bounds how quickly it notices stop_event.
+WATCH_TIMEOUT_S = 0.5
+# A sweep point that neither settles nor ends is cut off this long after
+# its duration.
+SWEEP_GRACE_S = 5.0
+# Finished POST /runs sessions kept for their status/events before pruning.
+SESSIONS_KEPT = 16
+# A binary-ingest run with no stats record this long after start is read
+# from the CSV instead (rxcap writes both).
+BINARY_FALLBACK_S = 3.0
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".js": "application/javascript",
+    ".css": "text/css",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".ico": "image/x-icon",
 }
 
-broadcast_queue = Queue()
+
+def new_session(sid, paths=None, hub=None):
+    # Bookkeeping of one run: processes, stop event, live ring, file paths
+    # and event stream. The module-level state below is the "default"
+    # session behind /start and /events; it has no paths/broadcaster of its
+    # own and follows the module-level ones (run_paths/run_hub).
+    return {
+        "sid": sid,
+        "running": False,
+        "cfg": None,
+        "rx_proc": None,
+        "tx_proc": None,
+        "tx_procs": [],
+        "cap_proc": None,
+        "live_ring": LiveRing(LIVE_RING_MAX),
+        "cap_mode": "none",
+        "arrivals": None,
+        "stop_event": threading.Event(),
+        "tx_groups": [],
+        "proc_cpu": ProcCpuMonitor(),
+        "paths": paths,
+        "broadcaster": hub,
+    }
+
+
+state = new_session("default")
+# POST /runs sessions by sid ("s1", "s2", ...; never all digits, which are
+# run history ids under /runs/<id>/series).
+sessions = {"default": state}
+# Handler threads add, prune, look up and list sessions concurrently.
+sessions_lock = threading.Lock()
+session_ids = itertools.count(1)
+admission = AdmissionControl()
+board_lock = threading.Lock()
+# rxcap --help text per (path, mtime), for rxcap_supports().
+rxcap_help = {}
+# static/ served from memory with ETags and gzip; reloaded per file on change.
+assets = StaticCache(STATIC, CONTENT_TYPES)
+
+broadcaster = Broadcaster(append_max=CAP_LINES_MAX)
+history = RunHistory(HISTORY_PATH)
+board = BoardConfigManager(PATCH_DIR)
+metrics = Metrics()
+profiler = StackSampler()
+
+
+def register_collectors():
+    # Read at scrape time; broadcaster is looked up per call because the
+    # asyncio mode replaces it.
+    metrics.collector("events_published_total", "counter", "Payloads and events published.",
+                      lambda: broadcaster.published)
+    metrics.collector("sse_messages_sent_total", "counter", "SSE messages written to clients.",
+                      lambda: broadcaster.sent)
+    metrics.collector("sse_bytes_sent_total", "counter", "SSE bytes written to clients.",
+                      lambda: broadcaster.bytes_sent)
+    metrics.collector("sse_samples_dropped_total", "counter", "Messages skipped for clients that fell behind.",
+                      lambda: broadcaster.dropped)
+    metrics.collector("sse_clients", "gauge", "Connected SSE clients.",
+                      lambda: len(broadcaster.stats()["clients"]))
+    metrics.collector("sse_client_lag", "gauge", "Messages published but not yet sent, per client.",
+                      lambda: [({"client": c["id"], "peer": c["name"]}, c["lag"]) for c in broadcaster.stats()["clients"]])
+    metrics.collector("live_lines_total", "counter", "Live packet lines read.",
+                      lambda: state["live_ring"].next_id)
+    metrics.collector("live_ring_lines", "gauge", "Live packet lines held in the ring.",
+                      lambda: state["live_ring"].next_id - state["live_ring"].first_id())
+    metrics.collector("running", "gauge", "1 while a test or replay is running.",
+                      lambda: state["running"])
+    metrics.collector("sessions_running", "gauge", "Run sessions with a test in progress.",
+                      lambda: sum(1 for sess in session_list() if sess["running"]))
+    metrics.collector("profiler_samples", "gauge", "Stack samples taken by the running profiler.",
+                      lambda: profiler.samples)
+
+
+register_collectors()
+
+
+def run_paths(sess):
+    return sess.get("paths") or SessionPaths(CSV_PATH, LIVE_PATH, TX_STATS_DIR, SEQ_DUMP_PATH)
+
+
+def run_hub(sess):
+    return sess.get("broadcaster") or broadcaster
+
+
+def run_active(sess, stop):
+    # Loop condition of a run's reader threads/tasks. The identity check ends
+    # readers of a run that finished on its own once the next run started.
+    return not stop.is_set() and sess["running"] and sess["stop_event"] is stop
 
 
 def run_cmd(cmd, check=True):
@@ -43,130 +172,39 @@ def run_cmd(cmd, check=True):
         raise RuntimeError(f"Command failed: {cmd}")
 
 
-def write_patch(path, content):
-    Path(path).write_text(content)
+def keti_patch_cmd(patch_file):
+    return f"sudo {KETI_CLI} patch {patch_file} -d {DEVICE}"
 
 
-def apply_board_config(cfg):
-    vlan = cfg["vlan_id"]
-    egress_port = cfg["egress_port"]
-    ingress_port = cfg["ingress_port"]
-
-    vlan_patch = f"""
-- ? \"/ietf-interfaces:interfaces/interface[name='{egress_port}']/ieee802-dot1q-bridge:bridge-port/port-type\"
-  : ieee802-dot1q-bridge:c-vlan-bridge-port
-- ? \"/ietf-interfaces:interfaces/interface[name='{ingress_port}']/ieee802-dot1q-bridge:bridge-port/port-type\"
-  : ieee802-dot1q-bridge:c-vlan-bridge-port
-- ? \"/ietf-interfaces:interfaces/interface[name='{egress_port}']/ieee802-dot1q-bridge:bridge-port/acceptable-frame\"
-  : admit-only-VLAN-tagged-frames
-- ? \"/ietf-interfaces:interfaces/interface[name='{ingress_port}']/ieee802-dot1q-bridge:bridge-port/acceptable-frame\"
-  : admit-only-VLAN-tagged-frames
-- ? \"/ietf-interfaces:interfaces/interface[name='{egress_port}']/ieee802-dot1q-bridge:bridge-port/enable-ingress-filtering\"
-  : true
-- ? \"/ietf-interfaces:interfaces/interface[name='{ingress_port}']/ieee802-dot1q-bridge:bridge-port/enable-ingress-filtering\"
-  : true
-- ? \"/ieee802-dot1q-bridge:bridges/bridge[name='b0']/component[name='c0']/filtering-database/vlan-registration-entry\"
-  : database-id: 0
-    vids: '{vlan}'
-    entry-type: static
-    port-map:
-      - port-ref: {egress_port}
-        static-vlan-registration-entries:
-          vlan-transmitted: tagged
-      - port-ref: {ingress_port}
-        static-vlan-registration-entries:
-          vlan-transmitted: tagged
-"""
-
-    # PCP decoding/encoding identity map (8P0D)
-    pcp_patch = f"""
-- ? "/ietf-interfaces:interfaces/interface[name='{ingress_port}']/ieee802-dot1q-bridge:bridge-port/pcp-decoding-table/pcp-decoding-map"
-  : pcp: 8P0D
-- "/ietf-interfaces:interfaces/interface[name='{ingress_port}']/ieee802-dot1q-bridge:bridge-port/pcp-decoding-table/pcp-decoding-map[pcp='8P0D']/priority-map":
-  - priority-code-point: 0
-    priority: 0
-    drop-eligible: false
-  - priority-code-point: 1
-    priority: 1
-    drop-eligible: false
-  - priority-code-point: 2
-    priority: 2
-    drop-eligible: false
-  - priority-code-point: 3
-    priority: 3
-    drop-eligible: false
-  - priority-code-point: 4
-    priority: 4
-    drop-eligible: false
-  - priority-code-point: 5
-    priority: 5
-    drop-eligible: false
-  - priority-code-point: 6
-    priority: 6
-    drop-eligible: false
-  - priority-code-point: 7
-    priority: 7
-    drop-eligible: false
-
-- ? "/ietf-interfaces:interfaces/interface[name='{egress_port}']/ieee802-dot1q-bridge:bridge-port/pcp-encoding-table/pcp-encoding-map"
-  : pcp: 8P0D
-- "/ietf-interfaces:interfaces/interface[name='{egress_port}']/ieee802-dot1q-bridge:bridge-port/pcp-encoding-table/pcp-encoding-map[pcp='8P0D']/priority-map":
-  - priority: 0
-    dei: false
-    priority-code-point: 0
-  - priority: 1
-    dei: false
-    priority-code-point: 1
-  - priority: 2
-    dei: false
-    priority-code-point: 2
-  - priority: 3
-    dei: false
-    priority-code-point: 3
-  - priority: 4
-    dei: false
-    priority-code-point: 4
-  - priority: 5
-    dei: false
-    priority-code-point: 5
-  - priority: 6
-    dei: false
-    priority-code-point: 6
-  - priority: 7
-    dei: false
-    priority-code-point: 7
-"""
-
-    cbs_entries = []
-    for tc, slope in enumerate(cfg["idle_slope_kbps"]):
-        cbs_entries.append(f"  - traffic-class: {tc}\n    credit-based:\n      idle-slope: {int(slope)}")
-    cbs_patch = f"""
-- "/ietf-interfaces:interfaces/interface[name='{egress_port}']/mchp-velocitysp-port:eth-qos/config/traffic-class-shapers":
-{os.linesep.join(cbs_entries)}
-"""
-
-    PATCH_DIR.mkdir(parents=True, exist_ok=True)
-    vlan_patch_file = str(PATCH_DIR / "cbs_vlan_patch.yaml")
-    pcp_patch_file = str(PATCH_DIR / "cbs_pcp_patch.yaml")
-    cbs_patch_file = str(PATCH_DIR / "cbs_idle_patch.yaml")
-    write_patch(vlan_patch_file, vlan_patch)
-    write_patch(pcp_patch_file, pcp_patch)
-    write_patch(cbs_patch_file, cbs_patch)
-
-    run_cmd(f"sudo {KETI_CLI} patch {vlan_patch_file} -d {DEVICE}")
-    run_cmd(f"sudo {KETI_CLI} patch {pcp_patch_file} -d {DEVICE}")
-    run_cmd(f"sudo {KETI_CLI} patch {cbs_patch_file} -d {DEVICE}")
+def apply_board_config(cfg, force=False):
+    # Sends only what differs from the last applied state, as one patch;
+    # nothing at all when the board already matches. Returns entries sent.
+    plan = board.plan(cfg, force)
+    if plan is None:
+        return 0
+    changes, patch_file = plan
+    try:
+        with metrics.timer("board_apply"):
+            run_cmd(keti_patch_cmd(patch_file))
+    except Exception:
+        board.invalidate()
+        raise
+    board.commit(changes)
+    return len(changes)
+
+
+OPTIMIZE_CMDS = [
+    "bash -c \"for c in /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor; do echo performance > $c 2>/dev/null || true; done\"",
+    "bash -c \"echo -1 > /sys/module/usbcore/parameters/autosuspend 2>/dev/null || true\"",
+]
+
 
 def optimize_system():
-    cmds = [
-        "bash -c \"for c in /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor; do echo performance > $c 2>/dev/null || true; done\"",
-        "bash -c \"echo -1 > /sys/module/usbcore/parameters/autosuspend 2>/dev/null || true\"",
-    ]
-    for cmd in cmds:
+    for cmd in OPTIMIZE_CMDS:
         run_cmd(f"sudo {cmd}", check=False)
 
 
-def setup_pc_vlan(cfg):
+def pc_vlan_cmd(cfg):
     vlan = cfg["vlan_id"]
     ingress_if = cfg["ingress_iface"]
     egress_if = cfg["egress_iface"]
@@ -180,109 +218,286 @@ def setup_pc_vlan(cfg):
         f"ip link set vlan{vlan} up; ip link set vlan{vlan}b up; "
         f"ip link set dev vlan{vlan} type vlan egress-qos-map 0:0 1:1 2:2 3:3 4:4 5:5 6:6 7:7"
     )
-    run_cmd(f"sudo bash -c \"{cmd}\"")
+    return f"sudo bash -c \"{cmd}\""
 
 
-def start_test(cfg):
-    def alive(p):
-        return p is not None and p.poll() is None
-    if state["running"]:
-        tx_alive = any(alive(p) for p in state.get("tx_procs", []))
-        rx_alive = alive(state.get("rx_proc"))
-        if not (tx_alive or rx_alive):
-            state["running"] = False
-        else:
-            return False
-    state["running"] = True
-    state["cfg"] = cfg
-    state["stop_event"].clear()
-    # Apply config only if requested or not applied yet
-    use_board = cfg.get("use_board", True)
-    if not use_board:
+def pc_vlan_key(cfg):
+    return (cfg["vlan_id"], cfg["ingress_iface"], cfg["egress_iface"])
+
+
+def setup_pc_vlan(cfg, force=False):
+    # The PC-side VLAN interfaces only change with the VLAN id / ifaces;
+    # each concurrent session has its own VLAN id (admission control).
+    vlans = state.setdefault("pc_vlans", {})
+    if not force and vlans.get(cfg["vlan_id"]) == pc_vlan_key(cfg):
+        return
+    vlans.pop(cfg["vlan_id"], None)
+    run_cmd(pc_vlan_cmd(cfg))
+    vlans[cfg["vlan_id"]] = pc_vlan_key(cfg)
+
+
+def rx_argv(cfg, paths=None):
+    # CPU placement is applied by pinned_session() at launch.
+    paths = paths or run_paths(state)
+    argv = [
+        RXCAP, cfg["egress_iface"], "--seq", "--pcp-stats",
+    ]
+    if cfg.get("rx_seq_only", True):
+        argv.append("--seq-only")
+    argv += [
+        "--dst-mac", cfg["dst_mac"], "--duration", str(cfg["duration"] + 2), "--batch", str(cfg["rx_batch"]),
+        "--live-file", str(paths.live), "--live-rate-ms", str(cfg.get("live_rate_ms", 100)),
+        "--csv", str(paths.csv),
+    ]
+    if cfg.get("seq_dump"):
+        argv += ["--seq-dump", str(paths.seq_dump)]
+    argv += ingest_argv(cfg, paths)
+    return privileged(argv)
+
+
+def ingest_argv(cfg, paths):
+    # rxcap/simulator flags of cfg ingest "binary"; packet records replace
+    # the live lines as the arrival histogram source.
+    if cfg.get("ingest") != "binary":
+        return []
+    argv = ["--stats-sock", str(paths.stats_sock), "--stats-interval-ms", str(cfg["ingest_interval_ms"])]
+    if cfg.get("arrival_hist"):
+        argv.append("--stats-packets")
+    return argv
+
+
+def tx_argv(cfg, tcs, paths=None):
+    # One txgen process for the given TCs. A single-TC process writes
+    # tx_stats_tc{tc}.csv; a multi-TC process gets one -Q per TC and writes
+    # tx_stats.csv.tc{tc} per TC.
+    paths = paths or run_paths(state)
+    argv = [TXGEN, cfg["ingress_iface"], "-B", cfg["dst_ip"], "-b", cfg["dst_mac"]]
+    for tc in tcs:
+        argv += ["-Q", f"{tc}:{cfg['vlan_id']}"]
+    stats = f"tx_stats_tc{tcs[0]}.csv" if len(tcs) == 1 else "tx_stats.csv"
+    argv += [
+        "--seq", "-r", str(cfg["rate_per_tc_mbps"]), "--duration", str(cfg["duration"]),
+        "-l", str(cfg["packet_size"]), "--batch", str(cfg["tx_batch"]),
+        "--stats-file", f"{paths.tx_stats}/{stats}",
+    ]
+    return privileged(argv)
+
+
+def tx_groups(cfg):
+    return plan_tx_groups(range(8), cfg.get("tx_cpus") or [cfg["tx_cpu"]], cfg.get("tx_group_size", 1))
+
+
+def sim_argv(cfg, paths=None):
+    # Simulator backend: one unprivileged process writes the rxcap CSV, live
+    # lines and per-TC txgen stats in place of rxcap + 8 x txgen + the board.
+    paths = paths or run_paths(state)
+    argv = [
+        sys.executable, str(TRAFFIC_SIM),
+        "--rate", str(cfg["rate_per_tc_mbps"]),
+        "--idle-slope", ",".join(str(v) for v in cfg["idle_slope_kbps"]),
+        "-l", str(cfg["packet_size"]), "--duration", str(cfg["duration"] + 2),
+        "--link-mbps", str(cfg["link_mbps"]), "--cbs-overhead", str(cfg["cbs_overhead_bytes"]),
+        "--wire-overhead", str(cfg["wire_overhead_bytes"]),
+        "--vlan", str(cfg["vlan_id"]), "--dst-ip", cfg["dst_ip"], "--dst-mac", cfg["dst_mac"],
+        "--live-file", str(paths.live), "--live-rate-ms", str(cfg.get("live_rate_ms", 100)),
+        "--csv", str(paths.csv), "--stats-dir", str(paths.tx_stats),
+    ]
+    if cfg.get("seq_dump"):
+        argv += ["--seq-dump", str(paths.seq_dump)]
+    argv += ingest_argv(cfg, paths)
+    if cfg.get("arrival_hist") and cfg.get("ingest") != "binary":
+        argv.append("--live-all")
+    return argv
+
+
+def is_sim(cfg):
+    return cfg.get("backend") == "sim"
+
+
+def prepare_run(cfg, sess=None):
+    # Resolve board usage / direct-mode MAC and clear the previous run's files.
+    # Returns True when the board config should be (re)applied.
+    if sess is None:
+        sess = state
+    paths = run_paths(sess)
+    use_board = cfg.get("use_board", True) and not is_sim(cfg)
+    if not use_board and not is_sim(cfg):
         mac = read_iface_mac(cfg["egress_iface"])
         if mac:
             cfg["dst_mac"] = mac
     if use_board and not Path(DEVICE).exists():
         use_board = False
-    if use_board and (cfg.get("apply_first", False) or not state.get("applied")):
-        try:
-            apply_board_config(cfg)
-            setup_pc_vlan(cfg)
-            state["applied"] = True
-        except Exception:
-            state["applied"] = False
 
-    optimize_system()
-
-    # Start rxcap
-    CSV_PATH.parent.mkdir(parents=True, exist_ok=True)
-    if CSV_PATH.exists():
-        CSV_PATH.unlink()
-    if LIVE_PATH.exists():
-        LIVE_PATH.unlink()
-
-    # Prepare tx stats files
-    TX_STATS_DIR.mkdir(parents=True, exist_ok=True)
-    for tc in range(8):
-        p = TX_STATS_DIR / f"tx_tc{tc}.csv"
-        if p.exists():
-            p.unlink()
-
-    seq_only_flag = "--seq-only " if cfg.get("rx_seq_only", True) else ""
-    rx_cmd = (
-        f"sudo taskset -c {cfg['rx_cpu']} /home/kim/traffic-generator/rxcap {cfg['egress_iface']} "
-        f"--seq --pcp-stats {seq_only_flag}--dst-mac {cfg['dst_mac']} --duration {cfg['duration'] + 2} --batch {cfg['rx_batch']} "
-        f"--live-file {LIVE_PATH} --live-rate-ms 100 "
-        f"--csv {CSV_PATH}"
-    )
-    state["rx_proc"] = subprocess.Popen(rx_cmd, shell=True, preexec_fn=os.setsid)
+    paths.clear()
+
+    sess["verdict"] = None
+    sess["arrivals"] = arrival_analyzer(cfg)
+    open_ingest(cfg, sess)
 
-    start_capture(cfg)
+    # Remove the previous run's txgen stats (tx_stats_tc{tc}.csv)
+    sess["tx_stats"] = TxStatsAggregator(paths.tx_stats)
+    sess["tx_stats"].reset_files()
 
-    # Start txgen per TC (constant per-TC rate, stable stats)
-    rate_per_tc = cfg["rate_per_tc_mbps"]
-    if rate_per_tc <= 0:
-        rate_per_tc = 10
+    # Constant per-TC rate, stable stats
+    if cfg["rate_per_tc_mbps"] <= 0:
+        cfg["rate_per_tc_mbps"] = 10
     if cfg["tx_batch"] < 1:
         cfg["tx_batch"] = 1
-    state["tx_procs"] = []
-    for tc in range(8):
-        tx_cmd = (
-            f"sudo taskset -c {cfg['tx_cpu']} /home/kim/traffic-generator/txgen {cfg['ingress_iface']} "
-            f"-B {cfg['dst_ip']} -b {cfg['dst_mac']} -Q {tc}:{cfg['vlan_id']} "
-            f"--seq -r {rate_per_tc} --duration {cfg['duration']} "
-            f"-l {cfg['packet_size']} --batch {cfg['tx_batch']} "
-            f"--stats-file {TX_STATS_DIR}/tx_stats_tc{tc}.csv"
-        )
-        state["tx_procs"].append(subprocess.Popen(tx_cmd, shell=True, preexec_fn=os.setsid))
+    # Admission keeps other sessions on other board ports: their config is
+    # always planned (a no-op patch when the board already matches).
+    applied = state.get("applied") and sess is state
+    return use_board and (cfg.get("apply_first", False) or not applied)
+
+
+def rxcap_supports(option):
+    # Whether this rxcap build lists `option` in its --help: an unknown
+    # option makes rxcap exit at startup. The help text is cached per binary
+    # (path, mtime); a binary that cannot be run supports nothing.
+    try:
+        key = (RXCAP, os.stat(RXCAP).st_mtime_ns)
+    except OSError:
+        return False
+    if key not in rxcap_help:
+        try:
+            out = subprocess.run([RXCAP, "--help"], capture_output=True, text=True, timeout=5)
+            rxcap_help[key] = out.stdout + out.stderr
+        except (OSError, subprocess.SubprocessError):
+            rxcap_help[key] = ""
+    return re.search(re.escape(option) + r"(?![\w-])", rxcap_help[key]) is not None
+
+
+def open_ingest(cfg, sess):
+    # Binds the stats record socket before rxcap starts; an rxcap without
+    # --stats-sock or a socket that cannot be bound leaves the run on the CSV.
+    sess["ingest"] = None
+    sess["packet_ingest"] = False
+    if cfg.get("ingest") != "binary":
+        return
+    if not is_sim(cfg) and not rxcap_supports("--stats-sock"):
+        ingest_to_csv(cfg, sess, f"{RXCAP} has no --stats-sock")
+        return
+    try:
+        sess["ingest"] = RecordSocket(run_paths(sess).stats_sock)
+    except OSError as e:
+        ingest_to_csv(cfg, sess, e)
+        return
+    sess["packet_ingest"] = bool(cfg.get("arrival_hist"))
+
+
+def ingest_to_csv(cfg, sess, reason):
+    # Before launch: the run is started with the CSV flags only. rxcap's live
+    # lines are sampled, so on hardware no per-packet arrival source is left.
+    print(f"binary ingest disabled: {reason}")
+    metrics.inc("ingest_fallback_total")
+    cfg["ingest"] = "csv"
+    if not is_sim(cfg):
+        sess["arrivals"] = None
 
-    threading.Thread(target=csv_watcher, daemon=True).start()
-    threading.Thread(target=wait_for_completion, daemon=True).start()
+
+def start_test(cfg, sess=None):
+    # Raises AdmissionError when another session holds a CPU, NIC or VLAN
+    # this run needs.
+    if sess is None:
+        sess = state
+    def alive(p):
+        return p is not None and p.poll() is None
+    if sess["running"]:
+        tx_alive = any(alive(p) for p in sess.get("tx_procs", []))
+        rx_alive = alive(sess.get("rx_proc"))
+        if not (tx_alive or rx_alive):
+            sess["running"] = False
+        else:
+            return False
+    admission.admit(sess["sid"], cfg)
+    try:
+        launch_test(cfg, sess)
+    except Exception:
+        sess["running"] = False
+        admission.release(sess["sid"])
+        raise
     return True
 
 
-def wait_for_completion():
-    tx = state.get("tx_proc")
-    rx = state.get("rx_proc")
+def launch_test(cfg, sess):
+    sess["running"] = True
+    sess["cfg"] = cfg
+    # A fresh event per run: threads of the previous run keep (and see) theirs.
+    sess["stop_event"] = threading.Event()
+    paths = run_paths(sess)
+    # Apply config only if requested or not applied yet
+    if prepare_run(cfg, sess):
+        try:
+            with board_lock:
+                apply_board_config(cfg)
+                setup_pc_vlan(cfg)
+            state["applied"] = True
+        except Exception:
+            state["applied"] = False
+
+    sess["tx_procs"] = []
+    sess["tx_groups"] = []
+    monitor = sess["proc_cpu"]
+    monitor.clear()
+    if is_sim(cfg):
+        # The simulator stands in for rxcap and every txgen.
+        sess["rx_proc"] = subprocess.Popen(sim_argv(cfg, paths), preexec_fn=os.setsid)
+        monitor.track("sim", sess["rx_proc"].pid)
+        start_capture(cfg, sess)
+    else:
+        optimize_system()
+
+        # Start rxcap
+        sess["rx_proc"] = subprocess.Popen(rx_argv(cfg, paths), preexec_fn=pinned_session(cfg["rx_cpu"]))
+        monitor.track("rxcap", sess["rx_proc"].pid, cfg["rx_cpu"])
+
+        start_capture(cfg, sess)
+
+        # Start txgen: TCs grouped per process and spread over tx_cpus
+        for cpu, tcs in tx_groups(cfg):
+            proc = subprocess.Popen(tx_argv(cfg, tcs, paths), preexec_fn=pinned_session(cpu))
+            sess["tx_procs"].append(proc)
+            sess["tx_groups"].append({"cpu": cpu, "tcs": tcs, "pid": proc.pid})
+            monitor.track("txgen", proc.pid, cpu, tcs)
+
+    watch = binary_watcher if sess.get("ingest") else csv_watcher
+    threading.Thread(target=watch, args=(sess,), daemon=True).start()
+    threading.Thread(target=wait_for_completion, args=(sess,), daemon=True).start()
+
+
+def end_run(sess, stop):
+    # A run ended on its own; a newer run of the same session keeps going.
+    if sess["stop_event"] is stop:
+        sess["running"] = False
+        admission.release(sess["sid"])
+
+
+def wait_for_completion(sess=None):
+    if sess is None:
+        sess = state
+    stop = sess["stop_event"]
+    tx = sess.get("tx_proc")
+    rx = sess.get("rx_proc")
     if tx:
         tx.wait()
-    if state.get("tx_procs"):
-        for p in state["tx_procs"]:
+    if sess.get("tx_procs"):
+        for p in sess["tx_procs"]:
             p.wait()
     if rx:
         rx.wait()
-    state["running"] = False
+    end_run(sess, stop)
 
 
-def stop_test():
-    state["stop_event"].set()
+def stop_test(sess=None):
+    if sess is None:
+        sess = state
+    sess["stop_event"].set()
     procs = []
-    if state.get("rx_proc"):
-        procs.append(state["rx_proc"])
-    if state.get("tx_proc"):
-        procs.append(state["tx_proc"])
-    if state.get("tx_procs"):
-        procs.extend([p for p in state["tx_procs"] if p])
+    if sess.get("rx_proc"):
+        procs.append(sess["rx_proc"])
+    if sess.get("tx_proc"):
+        procs.append(sess["tx_proc"])
+    if sess.get("tx_procs"):
+        procs.extend([p for p in sess["tx_procs"] if p])
 
     for p in procs:
         if p.poll() is None:
@@ -304,83 +519,94 @@ def stop_test():
                 os.killpg(os.getpgid(p.pid), signal.SIGKILL)
             except Exception:
                 pass
-    cap = state.get("cap_proc")
+    cap = sess.get("cap_proc")
     if cap and cap.poll() is None:
         try:
             cap.send_signal(signal.SIGINT)
         except Exception:
             pass
-    state["running"] = False
-    state["rx_proc"] = None
-    state["tx_proc"] = None
-    state["tx_procs"] = []
-
-
-def start_capture(cfg):
-    state["cap_lines"].clear()
-    state["cap_mode"] = "rxcap"
-    threading.Thread(target=live_file_reader, daemon=True).start()
-
-
-def live_file_reader():
-    last = []
-    while not state["stop_event"].is_set() and state["running"]:
-        if LIVE_PATH.exists():
-            try:
-                lines = LIVE_PATH.read_text().strip().splitlines()
-                if lines:
-                    last = lines[-CAP_LINES_MAX:]
-                state["cap_lines"] = deque(last, maxlen=CAP_LINES_MAX)
-            except Exception:
-                pass
-        time.sleep(0.5)
-
-
-def capture_reader():
-    proc = state.get("cap_proc")
+    sess["running"] = False
+    sess["rx_proc"] = None
+    sess["tx_proc"] = None
+    sess["tx_procs"] = []
+    admission.release(sess["sid"])
+
+
+def start_capture(cfg, sess=None):
+    if sess is None:
+        sess = state
+    sess["live_ring"].clear()
+    sess["cap_mode"] = "rxcap"
+    threading.Thread(target=live_file_reader, args=(sess,), daemon=True).start()
+
+
+def capture_reader(sess=None):
+    if sess is None:
+        sess = state
+    stop = sess["stop_event"]
+    proc = sess.get("cap_proc")
     if not proc or not proc.stdout:
         return
     for line in proc.stdout:
         line = line.strip()
         if not line:
             continue
-        state["cap_lines"].append(line)
-        if state["stop_event"].is_set():
+        sess["live_ring"].append(line)
+        if stop.is_set():
             break
 
 
-def live_file_reader():
-    last = []
-    while not state["stop_event"].is_set() and state["running"]:
-        if LIVE_PATH.exists():
-            try:
-                lines = LIVE_PATH.read_text().strip().splitlines()
-                if lines:
-                    last = lines[-CAP_LINES_MAX:]
-                state["cap_lines"] = deque(last, maxlen=CAP_LINES_MAX)
-            except Exception:
-                pass
-        time.sleep(0.5)
+def live_file_reader(sess=None):
+    if sess is None:
+        sess = state
+    stop = sess["stop_event"]
+    live_path = run_paths(sess).live
+    # Tailed from the last offset into the live ring, so each pass costs only
+    # the bytes rxcap appended since the previous one; with arrival
+    # histograms every packet's line has to be seen once.
+    reader = CsvTailReader(live_path, header=False)
+    watcher = FileWatcher([live_path])
+    while run_active(sess, stop):
+        poll_live(reader, sess)
+        watcher.wait(WATCH_TIMEOUT_S)
+    watcher.close()
+    reader.close()
 
 
-def read_iface_stats(iface):
-    base = Path(f"/sys/class/net/{iface}/statistics")
-    def read_int(name):
-        p = base / name
-        try:
-            return int(p.read_text().strip())
-        except Exception:
-            return 0
-    return {
-        "rx_packets": read_int("rx_packets"),
-        "rx_bytes": read_int("rx_bytes"),
-        "rx_dropped": read_int("rx_dropped"),
-        "rx_errors": read_int("rx_errors"),
-        "tx_packets": read_int("tx_packets"),
-        "tx_bytes": read_int("tx_bytes"),
-        "tx_dropped": read_int("tx_dropped"),
-        "tx_errors": read_int("tx_errors"),
-    }
+def poll_live(reader, sess):
+    ingest_live(read_live(reader), sess)
+
+
+def read_live(reader):
+    # The file read half of poll_live; the asyncio reader runs it in a
+    # worker thread.
+    with metrics.timer("live_read"):
+        return reader.poll_lines()
+
+
+def ingest_live(lines, sess):
+    with metrics.timer("live_ingest"):
+        take_live_lines(lines, sess)
+
+
+def take_live_lines(lines, sess=None):
+    if not lines:
+        return
+    if sess is None:
+        sess = state
+    sess["live_ring"].extend(lines)
+    arrivals = sess.get("arrivals")
+    if arrivals and not sess.get("packet_ingest"):
+        arrivals.feed_lines(lines)
+
+
+def arrival_analyzer(cfg):
+    if not cfg["arrival_hist"]:
+        return None
+    return ArrivalAnalyzer(
+        cbs_model(cfg).burst_frames, cfg["packet_size"], cfg["link_mbps"],
+        wire_overhead_bytes=cfg["wire_overhead_bytes"],
+    )
 
 
 def read_iface_mac(iface):
@@ -390,269 +616,900 @@ def read_iface_mac(iface):
         return ""
 
 
-def csv_watcher():
-    last = None
-    last_valid = None
-    pkt_size = state["cfg"]["packet_size"]
-    tolerance = state["cfg"]["tolerance"]
-    idle = state["cfg"]["idle_slope_kbps"]
-    smooth = int(state["cfg"].get("smooth_window", 5))
-    tc_windows = [deque(maxlen=max(1, smooth)) for _ in range(8)]
-    pps_windows = [deque(maxlen=max(1, smooth)) for _ in range(8)]
-    tx_windows = [deque(maxlen=max(1, smooth)) for _ in range(8)]
-    iface_last = read_iface_stats(state["cfg"]["egress_iface"])
-    ingress_last = read_iface_stats(state["cfg"]["ingress_iface"])
-
-    pps_floor = 1000.0
-    min_time_s = 2.0
-    while not state["stop_event"].is_set() and state["running"]:
-        if CSV_PATH.exists():
-            lines = CSV_PATH.read_text().strip().splitlines()
-            if len(lines) >= 2:
-                header = lines[0].split(",")
-                row = lines[-1].split(",")
-                curr = dict(zip(header, row))
-
-                if last:
-                    dt = float(curr["time_s"]) - float(last["time_s"])
-                    if dt <= 0:
-                        dt = 1.0
-                    per_tc_mbps = []
-                    per_tc_mbps_payload = []
-                    per_tc_pps = []
-                    per_tc_mbps_scaled = []
-                    pred_mbps = []
-                    pass_list = []
-                    tx_tc_mbps = []
-                    exp_mbps = []
-                    exp_pps = []
-                    delta_total = int(curr["total_pkts"]) - int(last["total_pkts"])
-                    # If no new packets, keep last valid sample to avoid flicker.
-                    if delta_total <= 0 and last_valid:
-                        broadcast_queue.put(last_valid)
-                        last = curr
-                        time.sleep(0.2)
+class RxSampleProcessor:
+    # Per-row CBS math: turns consecutive rxcap rows into /events payloads.
+    # Shared by the threaded and asyncio server modes.
+    def __init__(self, cfg, tx_stats=None, read_ifaces=True, seq_path=None, sess=None):
+        self.cfg = cfg
+        # Session whose live ring / arrival histograms go into the payload.
+        self.sess = state if sess is None else sess
+        # Replay has no live interfaces to sample; deltas are then all zero.
+        self.read_ifaces = read_ifaces
+        self.model = cbs_model(cfg)
+        self.engine = TcMetricsEngine(
+            cfg["idle_slope_kbps"], cfg["packet_size"], cfg["tolerance"],
+            window=int(cfg.get("smooth_window", 5)), model=self.model,
+        )
+        self.ifaces = IfaceSampler([cfg["egress_iface"], cfg["ingress_iface"]]) if read_ifaces else None
+        self.last = None
+        self.last_valid = None
+        self.pps_floor = 1000.0
+        self.min_time_s = 2.0
+        self.tx = tx_stats if tx_stats is not None else TxStatsAggregator(TX_STATS_DIR)
+        # With a file watcher the caller sets tx_stale on txgen stats changes;
+        # otherwise the stats files are polled for every row.
+        self.tx_watched = False
+        self.tx_stale = True
+        # Per-packet sequence analysis from rxcap --seq-dump, when enabled.
+        self.seq = SeqAnalyzer() if seq_path else None
+        self.seq_reader = RecordTailReader(seq_path, SEQ_RECORD.size) if seq_path else None
+
+    def refresh_seq(self):
+        self.seq.feed(self.seq_reader.poll_records())
+
+    def close(self):
+        self.tx.close()
+        if self.ifaces:
+            self.ifaces.close()
+        if self.seq_reader:
+            self.seq_reader.close()
+
+    def iface_deltas(self, sample=True):
+        # (egress delta, ingress delta, driver/per-queue deltas, dt_s); zero
+        # without a sample, which the next sample then includes.
+        if not self.ifaces or not sample:
+            zero = dict.fromkeys(IFACE_COUNTERS, 0)
+            return zero, zero, {}, 0.0
+        with metrics.timer("iface_read"):
+            dt, stats, nic = self.ifaces.sample()
+        egress, ingress = self.cfg["egress_iface"], self.cfg["ingress_iface"]
+        nic_delta = {name: nic[iface] for name, iface in (("egress", egress), ("ingress", ingress)) if iface in nic}
+        return stats[egress], stats[ingress], nic_delta, dt
+
+    def refresh_tx(self):
+        if self.tx_watched and not self.tx_stale:
+            return
+        self.tx_stale = False
+        with metrics.timer("tx_stats"):
+            self.tx.poll()
+
+    def process(self, curr, sample_ifaces=True):
+        # Returns the payload to publish for this row (None until valid).
+        # The interface counters are wall-clock, not per row: a batch of rows
+        # samples them once, on its last row (sample_ifaces).
+        last = self.last
+        self.last = curr
+        if not last:
+            return None
+        last_valid = self.last_valid
+        pkt_size = self.cfg["packet_size"]
+        pps_floor = self.pps_floor
+
+        dt = float(curr["time_s"]) - float(last["time_s"])
+        if dt <= 0:
+            dt = 1.0
+        tx_tc_mbps = []
+        delta_total = int(curr["total_pkts"]) - int(last["total_pkts"])
+        # If no new packets, keep last valid sample to avoid flicker.
+        if delta_total <= 0 and last_valid:
+            return last_valid
+        bytes_per_pkt = pkt_size
+        total_mbps_rxcap = float(curr["total_mbps"])
+        total_mbps_calc = 0.0
+        vlan_pkts = int(curr.get("vlan_pkts", 0)) if "vlan_pkts" in curr else 0
+        non_vlan_pkts = int(curr.get("non_vlan_pkts", 0)) if "non_vlan_pkts" in curr else 0
+        seq_pkts = int(curr.get("seq_pkts", 0)) if "seq_pkts" in curr else 0
+        emb_pcp_pkts = int(curr.get("embedded_pcp_pkts", 0)) if "embedded_pcp_pkts" in curr else 0
+        last_emb_pcp = int(last.get("embedded_pcp_pkts", 0)) if "embedded_pcp_pkts" in last else 0
+        delta_emb_pcp = max(0, emb_pcp_pkts - last_emb_pcp)
+
+        # TX rate per TC averaged over exactly this rxcap interval
+        self.refresh_tx()
+        t_prev = float(last["time_s"])
+        t_curr = float(curr["time_s"])
+        for tc in range(8):
+            tx_tc_mbps.append(self.tx.mean_mbps(tc, t_prev, t_curr))
+        # Derive effective packet size from rxcap total if possible
+        # Use configured L2 frame size for CBS comparisons (headers included).
+        pkt_size_eff = bytes_per_pkt
+
+        pcp_delta = [int(curr[f"pcp{tc}_pkts"]) - int(last[f"pcp{tc}_pkts"]) for tc in range(8)]
+        m = self.engine.push(dt, pcp_delta, tx_tc_mbps)
+        per_tc_mbps = m["per_tc_mbps"]
+        pred_mbps = m["pred_mbps"]
+        total_mbps_pcp = m["total_mbps_pcp"]
+        sum_pcp_delta = m["sum_pcp_delta"]
+
+        iface_delta, ingress_delta, nic_delta, iface_dt = self.iface_deltas(sample_ifaces)
+
+        if dt > 0:
+            total_mbps_calc = (delta_total * pkt_size_eff * 8) / (dt * 1_000_000)
+        total_pred = sum(pred_mbps)
+        total_tx = sum(tx_tc_mbps)
+        rx_ratio = (total_mbps_calc / total_pred) if total_pred > 0 else 0.0
+        pcp_ratio = (total_mbps_pcp / total_mbps_calc) if total_mbps_calc > 0 else 0.0
+        # Use embedded PCP packet deltas when available to avoid 0/100% oscillation.
+        if delta_total > 0 and delta_emb_pcp > 0:
+            pcp_ratio_count = (delta_emb_pcp / delta_total)
+        elif delta_total > 0:
+            pcp_ratio_count = (sum_pcp_delta / delta_total)
+        else:
+            pcp_ratio_count = 0.0
+        # Freeze ratio when packet count is too low for a stable estimate.
+        min_pkts = max(int(pps_floor * dt), 100)
+        if delta_total < min_pkts and last_valid:
+            pcp_ratio_count = last_valid.get("pcp_ratio_count", pcp_ratio_count)
+        unknown_mbps = max(0.0, total_mbps_calc - total_mbps_pcp)
+        scale = (total_mbps_calc / total_mbps_pcp) if total_mbps_pcp > 0 else 0.0
+        per_tc_mbps_scaled = [v * scale for v in per_tc_mbps]
+
+        payload = {
+            "running": self.sess["running"],
+            "time_s": float(curr["time_s"]),
+            "total_mbps": total_mbps_rxcap,
+            "total_mbps_calc": total_mbps_calc,
+            "total_mbps_pcp": total_mbps_pcp,
+            "unknown_mbps": unknown_mbps,
+            "pkt_size_eff": pkt_size_eff,
+            "pps_floor": pps_floor,
+            "total_pps": float(curr["total_pps"]),
+            "drops": int(curr["drops"]),
+            "total_pkts": int(curr["total_pkts"]),
+            "pcp_pkts": [int(curr[f"pcp{i}_pkts"]) for i in range(8)],
+            "vlan_pkts": vlan_pkts,
+            "non_vlan_pkts": non_vlan_pkts,
+            "seq_pkts": seq_pkts,
+            "embedded_pcp_pkts": emb_pcp_pkts,
+            "per_tc_mbps": per_tc_mbps,
+            "per_tc_mbps_payload": m["per_tc_mbps_payload"],
+            "per_tc_pps": m["per_tc_pps"],
+            "per_tc_mbps_scaled": per_tc_mbps_scaled,
+            "pred_mbps": pred_mbps,
+            "tx_tc_mbps": tx_tc_mbps,
+            "exp_mbps": m["exp_mbps"],
+            "exp_pps": m["exp_pps"],
+            "pass": m["pass"],
+            "cap_mode": self.sess.get("cap_mode", "none"),
+            "cap_lines": self.sess["live_ring"].tail(CAP_LINES_MAX),
+            "cap_next_id": self.sess["live_ring"].next_id,
+            "iface_delta": iface_delta,
+            "ingress_delta": ingress_delta,
+            "nic_delta": nic_delta,
+            "iface_dt_s": iface_dt,
+            "rx_ratio": rx_ratio,
+            "pcp_ratio": pcp_ratio,
+            "pcp_ratio_count": pcp_ratio_count,
+            "total_pred": total_pred,
+            "total_tx": total_tx,
+            "cbs_model": self.model.summary(),
+        }
+        if self.seq:
+            with metrics.timer("seq_read"):
+                self.refresh_seq()
+            payload.update(self.seq.fields())
+        arrivals = self.sess.get("arrivals")
+        if arrivals:
+            payload.update(arrivals.fields())
+        # Short-term rates of a binary-ingest row (StatsWindow).
+        if "fine" in curr:
+            payload.update(curr["fine"])
+        if float(curr["time_s"]) >= self.min_time_s and float(curr["total_pps"]) >= pps_floor:
+            self.last_valid = payload
+            return payload
+        return last_valid
+
+
+
+def rx_processor(sess):
+    cfg = sess["cfg"]
+    return RxSampleProcessor(
+        cfg, sess.get("tx_stats"), read_ifaces=not is_sim(cfg),
+        seq_path=run_paths(sess).seq_dump if cfg["seq_dump"] else None, sess=sess,
+    )
+
+
+def open_recorder(cfg):
+    # Run history is best effort: a broken DB must not stop the dashboard.
+    try:
+        return history.start_run(cfg)
+    except Exception as e:
+        print(f"run history disabled: {e}")
+        return None
+
+
+def close_recorder(recorder, status="done"):
+    if not recorder:
+        return
+    try:
+        recorder.close(status)
+    except Exception as e:
+        print(f"run history close failed: {e}")
+
+
+def steady_detector(cfg, window_s=None, settle_s=None):
+    return SteadyStateDetector(
+        cfg["steady_window_s"] if window_s is None else window_s,
+        cfg["settle_s"] if settle_s is None else settle_s,
+        tolerance=cfg["tolerance"],
+        smooth=cfg["smooth_window"],
+    )
+
+
+def publish_verdict(detector, reason=None, sess=None):
+    if sess is None:
+        sess = state
+    verdict = detector.verdict(reason)
+    sess["verdict"] = verdict
+    run_hub(sess).publish_event("verdict", verdict)
+
+
+def run_end_status(detector, stop, sess=None):
+    # Run history status; an early-stop run also gets its final verdict
+    # when it ended without reaching steady state.
+    if detector and detector.steady:
+        return "steady"
+    if detector:
+        publish_verdict(detector, "stopped" if stop.is_set() else "ended", sess)
+    return "stopped" if stop.is_set() else "done"
+
+
+def process_rows(proc, rows, recorder, detector):
+    # The blocking half of publish_rows (txgen stats, interface counters,
+    # seq dump reads, SQLite): the payloads to publish, up to the row where
+    # the steady-state detector settles. The asyncio watchers run it in a
+    # worker thread.
+    payloads = []
+    last = len(rows) - 1
+    for i, curr in enumerate(rows):
+        with metrics.timer("process"):
+            payload = proc.process(curr, sample_ifaces=i == last)
+        metrics.inc("csv_rows_total")
+        if payload:
+            payloads.append(payload)
+            if recorder:
+                with metrics.timer("history"):
+                    recorder.add(payload)
+            if detector and detector.push(payload):
+                break
+    return payloads
+
+
+def publish_payloads(sess, payloads):
+    hub = run_hub(sess)
+    for payload in payloads:
+        with metrics.timer("publish"):
+            hub.publish(payload)
+
+
+def publish_rows(proc, rows, recorder, detector):
+    # Shared by the csv and binary watchers of the threaded server.
+    publish_payloads(proc.sess, process_rows(proc, rows, recorder, detector))
+
+
+def poll_csv_rows(reader, proc, recorder, detector):
+    with metrics.timer("csv_read"):
+        rows = reader.poll_dicts()
+    return process_rows(proc, rows, recorder, detector)
+
+
+def close_processor(proc, recorder, status):
+    proc.close()
+    close_recorder(recorder, status)
+
+
+def csv_watcher(sess=None):
+    if sess is None:
+        sess = state
+    stop = sess["stop_event"]
+    csv_path = run_paths(sess).csv
+    proc = rx_processor(sess)
+    # Tail the CSV from the last offset; every appended row is processed.
+    reader = CsvTailReader(csv_path)
+    tx_paths = {str(p) for p in proc.tx.paths()}
+    watcher = FileWatcher([csv_path, *tx_paths])
+    proc.tx_watched = True
+    recorder = open_recorder(sess["cfg"])
+    detector = steady_detector(sess["cfg"]) if sess["cfg"]["early_stop"] else None
+    while run_active(sess, stop):
+        with metrics.timer("csv_read"):
+            rows = reader.poll_dicts()
+        publish_rows(proc, rows, recorder, detector)
+        if detector and detector.steady:
+            publish_verdict(detector, sess=sess)
+            stop_test(sess)
+            break
+        changed = watcher.wait(WATCH_TIMEOUT_S)
+        if changed & tx_paths:
+            proc.tx_stale = True
+    watcher.close()
+    reader.close()
+    proc.close()
+    close_recorder(recorder, run_end_status(detector, stop, sess))
+
+
+def poll_ingest(sock, window, sess):
+    # One drain of the record socket: the rows that closed a publish window;
+    # packet records go straight to the arrival histograms.
+    with metrics.timer("ingest_read"):
+        data, packets = sock.poll()
+        rows = window.feed(data)
+    metrics.inc("ingest_records_total", len(data) // STATS_RECORD.size)
+    arrivals = sess.get("arrivals")
+    if packets and arrivals and sess.get("packet_ingest"):
+        with metrics.timer("live_ingest"):
+            feed_packets(arrivals, packets)
+    return rows
+
+
+def ingest_fallback(sess, sock):
+    print(f"no stats records on {sock.path} after {BINARY_FALLBACK_S:g} s, reading the CSV")
+    metrics.inc("ingest_fallback_total")
+    sock.close()
+    sess["packet_ingest"] = False
+    # The process was launched for packet records, so its live lines are
+    # sampled (no --live-all): they cannot stand in for them.
+    sess["arrivals"] = None
+
+
+def binary_watcher(sess):
+    # cfg ingest "binary": rows come from rxcap's stats records on
+    # paths.stats_sock, folded to one per publish_interval_ms; the CSV is
+    # not read. Without a record within BINARY_FALLBACK_S the run goes on
+    # with csv_watcher.
+    stop = sess["stop_event"]
+    sock = sess["ingest"]
+    window = StatsWindow(sess["cfg"]["publish_interval_ms"] / 1000.0)
+    deadline = time.monotonic() + BINARY_FALLBACK_S
+    rows = []
+    while run_active(sess, stop) and not rows:
+        rows = poll_ingest(sock, window, sess)
+        if not rows:
+            if time.monotonic() >= deadline:
+                ingest_fallback(sess, sock)
+                csv_watcher(sess)
+                return
+            sock.wait(WATCH_TIMEOUT_S)
+    if not rows:
+        sock.close()
+        return
+    proc = rx_processor(sess)
+    recorder = open_recorder(sess["cfg"])
+    detector = steady_detector(sess["cfg"]) if sess["cfg"]["early_stop"] else None
+    while run_active(sess, stop):
+        publish_rows(proc, rows, recorder, detector)
+        if detector and detector.steady:
+            publish_verdict(detector, sess=sess)
+            stop_test(sess)
+            break
+        sock.wait(WATCH_TIMEOUT_S)
+        rows = poll_ingest(sock, window, sess)
+    sock.close()
+    proc.close()
+    close_recorder(recorder, run_end_status(detector, stop, sess))
+
+
+def frame_payload(frame):
+    # Sample payload of a broadcaster frame; None for named events.
+    if not frame.startswith(b"data: "):
+        return None
+    return json.loads(frame[6:])
+
+
+def sweep_request(data):
+    # POST /sweep body: {"base": {/start fields}, "grid": {param: [values]},
+    # "window_s": 5, "settle_s": 2}. Returns (status, body, sweep).
+    current = state.get("sweep")
+    if state["running"] or (current and current.state in ("pending", "running")):
+        return HTTPStatus.CONFLICT, {"error": "already running"}, None
+    try:
+        sweep = Sweep(
+            int(time.time()), data.get("base") or {}, data.get("grid") or {},
+            window_s=float(data.get("window_s", 5.0)), settle_s=float(data.get("settle_s", 2.0)),
+        )
+        # Every point is checked up front (an empty grid fails on point 0).
+        for i in range(max(1, len(sweep.points))):
+            run_cfg(sweep.point_data(i))
+    except (ValueError, TypeError, IndexError) as e:
+        return HTTPStatus.BAD_REQUEST, {"error": str(e) or "empty grid"}, None
+    state["sweep"] = sweep
+    return HTTPStatus.OK, {"id": sweep.id, "points": len(sweep.points)}, sweep
+
+
+def sweep_status():
+    sweep = state.get("sweep")
+    if not sweep:
+        return HTTPStatus.NOT_FOUND, {"error": "no sweep"}
+    return HTTPStatus.OK, sweep.summary()
+
+
+def cancel_sweep():
+    sweep = state.get("sweep")
+    if sweep:
+        sweep.cancel.set()
+
+
+def sweep_check(sweep, deadline):
+    # Why the current point should end now, or None to keep going.
+    if sweep.cancel.is_set():
+        return "stopped"
+    if sweep.detector.steady:
+        return "steady"
+    if not state["running"]:
+        return "ended"
+    if time.monotonic() > deadline:
+        return "timeout"
+    return None
+
+
+def sweep_feed(detector, frames):
+    for frame in frames:
+        payload = frame_payload(frame)
+        if payload:
+            detector.push(payload)
+
+
+def sweep_point_done(sweep, cfg, reason):
+    row = sweep.finish_point(cfg, reason)
+    broadcaster.publish_event("sweep", {"type": "point", "id": sweep.id, "points": len(sweep.points), "row": row})
+
+
+def sweep_done(sweep, status, error=None):
+    sweep.finish(status, error)
+    try:
+        sweep.write_csv(CSV_PATH.parent / f"sweep_{sweep.id}.csv")
+    except OSError as e:
+        print(f"sweep summary not written: {e}")
+    broadcaster.publish_event("sweep", {"type": "done", **sweep.summary()})
+
+
+def run_sweep(sweep):
+    # Back-to-back start_test/stop_test per grid point; a point ends as soon
+    # as the detector reports steady state.
+    sweep.state = "running"
+    try:
+        for i in range(len(sweep.points)):
+            if sweep.cancel.is_set():
+                break
+            cfg = run_cfg(sweep.point_data(i))
+            sub = broadcaster.subscribe(max_lag=broadcaster.capacity, name="sweep")
+            try:
+                if not start_test(cfg):
+                    raise RuntimeError("a test is already running")
+                sweep.begin_point(i, steady_detector(cfg, sweep.window_s, sweep.settle_s))
+                deadline = time.monotonic() + cfg["duration"] + SWEEP_GRACE_S
+                while True:
+                    sweep_feed(sweep.detector, sub.wait(timeout=WATCH_TIMEOUT_S))
+                    reason = sweep_check(sweep, deadline)
+                    if reason:
+                        break
+            finally:
+                sub.close()
+            stop_test()
+            sweep_point_done(sweep, cfg, reason)
+    except Exception as e:
+        stop_test()
+        sweep_done(sweep, "error", str(e))
+        return
+    sweep_done(sweep, "stopped" if sweep.cancel.is_set() else "done")
+
+
+def replay_paths(src):
+    # Accepts a tsn_results-style directory (cbs_rx.csv, live_packets.csv,
+    # tx_stats/) or a flat directory with the tx_stats_tc*.csv files next to
+    # cbs_rx.csv.
+    src = Path(src)
+    tx_dir = src / TX_STATS_DIR.name
+    if not tx_dir.is_dir():
+        tx_dir = src
+    return src / CSV_PATH.name, tx_dir, src / LIVE_PATH.name
+
+
+def replay_run(src, cfg, speed=1.0):
+    # Drive the sample processor and /events from a recorded run. speed is a
+    # factor on rxcap time (0 = as fast as possible). Returns pipeline stats.
+    csv_path, tx_dir, live_path = replay_paths(src)
+    if not csv_path.exists():
+        raise FileNotFoundError(csv_path)
+    tx_stats = TxStatsAggregator(tx_dir)
+    tx_stats.poll()
+    state["running"] = True
+    state["cfg"] = cfg
+    # A fresh event per run: threads of the previous run keep (and see) theirs.
+    state["stop_event"] = threading.Event()
+    state["cap_mode"] = "rxcap"
+    state["live_ring"].clear()
+    state["arrivals"] = arrival_analyzer(cfg)
+    proc = RxSampleProcessor(cfg, tx_stats, read_ifaces=False)
+    # Recorded TX stats are complete up front; no need to re-poll per row.
+    proc.tx_watched = True
+    proc.tx_stale = False
+
+    live = open(live_path) if live_path.exists() else None
+    pending = None
+    rows = 0
+    published = 0
+    t_first = None
+    wall0 = time.perf_counter()
+    reader = CsvTailReader(csv_path)
+    try:
+        while not state["stop_event"].is_set():
+            batch = reader.poll_dicts()
+            if not batch:
+                break
+            for curr in batch:
+                t = float(curr["time_s"])
+                if t_first is None:
+                    t_first = t
+                if speed > 0:
+                    delay = wall0 + (t - t_first) / speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                # Live packet lines carry rxcap time in the first column.
+                lines = []
+                while live:
+                    line = pending if pending is not None else live.readline()
+                    pending = None
+                    if not line:
+                        live.close()
+                        live = None
+                        break
+                    line = line.strip()
+                    try:
+                        line_t = float(line.split(",", 1)[0])
+                    except ValueError:
                         continue
-                    bytes_per_pkt = pkt_size
-                    total_mbps_pcp = 0.0
-                    total_mbps_rxcap = float(curr["total_mbps"])
-                    total_mbps_calc = 0.0
-                    vlan_pkts = int(curr.get("vlan_pkts", 0)) if "vlan_pkts" in curr else 0
-                    non_vlan_pkts = int(curr.get("non_vlan_pkts", 0)) if "non_vlan_pkts" in curr else 0
-                    seq_pkts = int(curr.get("seq_pkts", 0)) if "seq_pkts" in curr else 0
-                    emb_pcp_pkts = int(curr.get("embedded_pcp_pkts", 0)) if "embedded_pcp_pkts" in curr else 0
-                    last_emb_pcp = int(last.get("embedded_pcp_pkts", 0)) if "embedded_pcp_pkts" in last else 0
-                    delta_emb_pcp = max(0, emb_pcp_pkts - last_emb_pcp)
-
-                    # Read tx stats (if available)
-                    for tc in range(8):
-                        tx_file = TX_STATS_DIR / f"tx_stats_tc{tc}.csv"
-                        alt_file = TX_STATS_DIR / f"tx_stats.csv.tc{tc}"
-                        if not tx_file.exists() and alt_file.exists():
-                            tx_file = alt_file
-                        tx_mbps = 0.0
-                        if tx_file.exists():
-                            try:
-                                lines = tx_file.read_text().strip().splitlines()
-                                if len(lines) >= 2:
-                                    last_tx = lines[-1].split(",")
-                                    # time,packets,bytes,pps,mbps,errors
-                                    tx_mbps = float(last_tx[4])
-                            except Exception:
-                                tx_mbps = 0.0
-                        tx_windows[tc].append(tx_mbps)
-                        tx_tc_mbps.append(sum(tx_windows[tc]) / len(tx_windows[tc]))
-                    # Derive effective packet size from rxcap total if possible
-                    # Use configured L2 frame size for CBS comparisons (headers included).
-                    pkt_size_eff = bytes_per_pkt
-
-                    sum_pcp_delta = 0
-                    for tc in range(8):
-                        key = f"pcp{tc}_pkts"
-                        dp = int(curr[key]) - int(last[key])
-                        sum_pcp_delta += max(0, dp)
-                        if dt > 0:
-                            mbps = (dp * pkt_size_eff * 8) / (dt * 1_000_000)
-                            mbps_payload = (dp * pkt_size * 8) / (dt * 1_000_000)
-                            pps = dp / dt
-                        else:
-                            mbps = 0.0
-                            mbps_payload = 0.0
-                            pps = 0.0
-                        tc_windows[tc].append(mbps)
-                        pps_windows[tc].append(pps)
-                        avg = sum(tc_windows[tc]) / len(tc_windows[tc])
-                        avg_pps = sum(pps_windows[tc]) / len(pps_windows[tc])
-                        per_tc_mbps.append(avg)
-                        per_tc_mbps_payload.append(mbps_payload)
-                        per_tc_pps.append(avg_pps)
-                        total_mbps_pcp += avg
-                        pred = idle[tc] / 1000.0
-                        pred_mbps.append(pred)
-                        expected = min(pred, tx_tc_mbps[tc]) if tx_tc_mbps[tc] > 0 else pred
-                        exp_mbps.append(expected)
-                        exp_pps.append((expected * 1_000_000 / 8) / pkt_size_eff if pkt_size_eff > 0 else 0.0)
-                        diff = abs(avg - expected) / expected if expected > 0 else 0
-                        pass_list.append(diff <= tolerance)
-
-                    iface_now = read_iface_stats(state["cfg"]["egress_iface"])
-                    ingress_now = read_iface_stats(state["cfg"]["ingress_iface"])
-                    def delta(now, prev):
-                        return max(0, now - prev)
-                    iface_delta = {k: delta(iface_now[k], iface_last[k]) for k in iface_now}
-                    ingress_delta = {k: delta(ingress_now[k], ingress_last[k]) for k in ingress_now}
-                    iface_last = iface_now
-                    ingress_last = ingress_now
-
-                    if dt > 0:
-                        total_mbps_calc = (delta_total * pkt_size_eff * 8) / (dt * 1_000_000)
-                    total_pred = sum(pred_mbps)
-                    total_tx = sum(tx_tc_mbps)
-                    rx_ratio = (total_mbps_calc / total_pred) if total_pred > 0 else 0.0
-                    pcp_ratio = (total_mbps_pcp / total_mbps_calc) if total_mbps_calc > 0 else 0.0
-                    # Use embedded PCP packet deltas when available to avoid 0/100% oscillation.
-                    if delta_total > 0 and delta_emb_pcp > 0:
-                        pcp_ratio_count = (delta_emb_pcp / delta_total)
-                    elif delta_total > 0:
-                        pcp_ratio_count = (sum_pcp_delta / delta_total)
-                    else:
-                        pcp_ratio_count = 0.0
-                    # Freeze ratio when packet count is too low for a stable estimate.
-                    min_pkts = max(int(pps_floor * dt), 100)
-                    if delta_total < min_pkts and last_valid:
-                        pcp_ratio_count = last_valid.get("pcp_ratio_count", pcp_ratio_count)
-                    unknown_mbps = max(0.0, total_mbps_calc - total_mbps_pcp)
-                    scale = (total_mbps_calc / total_mbps_pcp) if total_mbps_pcp > 0 else 0.0
-                    per_tc_mbps_scaled = [v * scale for v in per_tc_mbps]
-
-                    payload = {
-                        "running": state["running"],
-                        "time_s": float(curr["time_s"]),
-                        "total_mbps": total_mbps_rxcap,
-                        "total_mbps_calc": total_mbps_calc,
-                        "total_mbps_pcp": total_mbps_pcp,
-                        "unknown_mbps": unknown_mbps,
-                        "pkt_size_eff": pkt_size_eff,
-                        "pps_floor": pps_floor,
-                        "total_pps": float(curr["total_pps"]),
-                        "drops": int(curr["drops"]),
-                        "total_pkts": int(curr["total_pkts"]),
-                        "pcp_pkts": [int(curr[f"pcp{i}_pkts"]) for i in range(8)],
-                        "vlan_pkts": vlan_pkts,
-                        "non_vlan_pkts": non_vlan_pkts,
-                        "seq_pkts": seq_pkts,
-                        "embedded_pcp_pkts": emb_pcp_pkts,
-                        "per_tc_mbps": per_tc_mbps,
-                        "per_tc_mbps_payload": per_tc_mbps_payload,
-                        "per_tc_pps": per_tc_pps,
-                        "per_tc_mbps_scaled": per_tc_mbps_scaled,
-                        "pred_mbps": pred_mbps,
-                        "tx_tc_mbps": tx_tc_mbps,
-                        "exp_mbps": exp_mbps,
-                        "exp_pps": exp_pps,
-                        "pass": pass_list,
-                        "cap_mode": state.get("cap_mode", "none"),
-                        "cap_lines": list(state["cap_lines"]),
-                        "iface_delta": iface_delta,
-                        "ingress_delta": ingress_delta,
-                        "rx_ratio": rx_ratio,
-                        "pcp_ratio": pcp_ratio,
-                        "pcp_ratio_count": pcp_ratio_count,
-                        "total_pred": total_pred,
-                        "total_tx": total_tx,
-                    }
-                    if float(curr["time_s"]) >= min_time_s and float(curr["total_pps"]) >= pps_floor:
-                        last_valid = payload
-                        broadcast_queue.put(payload)
-                    elif last_valid:
-                        broadcast_queue.put(last_valid)
-
-                last = curr
-        time.sleep(0.5)
+                    if line_t > t:
+                        pending = line
+                        break
+                    lines.append(line)
+                take_live_lines(lines)
+                with metrics.timer("process"):
+                    payload = proc.process(curr)
+                rows += 1
+                if payload:
+                    with metrics.timer("publish"):
+                        broadcaster.publish(payload)
+                    published += 1
+                if state["stop_event"].is_set():
+                    break
+    finally:
+        reader.close()
+        tx_stats.close()
+        if live:
+            live.close()
+        state["running"] = False
+    elapsed = time.perf_counter() - wall0
+    return {
+        "rows": rows,
+        "published": published,
+        "elapsed_s": elapsed,
+        "rows_per_s": rows / elapsed if elapsed > 0 else 0.0,
+    }
 
 
-class Handler(SimpleHTTPRequestHandler):
-    def end_headers(self):
-        if self.path.endswith(".js") or self.path.endswith(".html") or self.path.endswith(".css") or self.path == "/":
-            self.send_header("Cache-Control", "no-store")
-        super().end_headers()
+def live_request(query, sess=None):
+    # GET /live?since=<id>&limit=<n>: live packet lines from the ring, oldest
+    # first. Poll again with the returned next_id to get only newer lines.
+    if sess is None:
+        sess = state
+    q = {k: v[-1] for k, v in parse_qs(query).items()}
+    try:
+        since = int(q.get("since", 0))
+        limit = int(q["limit"]) if q.get("limit") else None
+    except ValueError as e:
+        return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+    return HTTPStatus.OK, sess["live_ring"].since(since, limit)
+
+
+def open_session(data):
+    # POST /runs: a run with its own files and event stream next to the
+    # default one (/start). The session is listed once it started.
+    cfg = run_cfg(data)
+    with sessions_lock:
+        done = [sid for sid, sess in sessions.items() if sess is not state and not sess["running"]]
+        for sid in done[: max(0, len(done) - SESSIONS_KEPT + 1)]:
+            del sessions[sid]
+        sid = f"s{next(session_ids)}"
+    sess = new_session(sid, SessionPaths.under(SESSIONS_DIR / sid), type(broadcaster)(append_max=CAP_LINES_MAX))
+    cfg["session"] = sid
+    return cfg, sess
+
+
+def register_session(sess):
+    sid = sess["sid"]
+    with sessions_lock:
+        sessions[sid] = sess
+    return HTTPStatus.OK, {"sid": sid, "status": f"/runs/{sid}", "events": f"/runs/{sid}/events"}
+
+
+def session_route(path):
+    # /runs/<sid>[/events|/live|/stop] of a live session -> (sess, action).
+    # Numeric ids stay with the run history (/runs/<id>/series).
+    parts = path.strip("/").split("/")
+    if len(parts) in (2, 3) and parts[0] == "runs":
+        with sessions_lock:
+            sess = sessions.get(parts[1])
+        if sess is not None:
+            return sess, parts[2] if len(parts) == 3 else "status"
+    return None, None
+
+
+def session_list():
+    with sessions_lock:
+        return list(sessions.values())
+
+
+def session_body(sess):
+    cfg = sess.get("cfg") or {}
+    return {
+        "sid": sess["sid"],
+        "running": sess["running"],
+        "backend": cfg.get("backend"),
+        "ingest": cfg.get("ingest"),
+        "ingress_iface": cfg.get("ingress_iface"),
+        "egress_iface": cfg.get("egress_iface"),
+        "vlan_id": cfg.get("vlan_id"),
+        "tx_groups": sess.get("tx_groups", []),
+        "events": run_hub(sess).stats(),
+        "procs": sess["proc_cpu"].sample(),
+        "verdict": sess.get("verdict"),
+    }
+
+
+def profile_request(data):
+    # POST /profile {"enable": true, "interval_ms": 5} starts the stack
+    # sampler; {"enable": false} stops it and writes PROFILE_PATH.
+    if data.get("enable", True):
+        if not profiler.start(float(data.get("interval_ms", 5)) / 1000.0):
+            return HTTPStatus.CONFLICT, {"error": "already running", **profiler.status()}
+        return HTTPStatus.OK, profiler.status()
+    PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    body = profiler.stop(PROFILE_PATH)
+    if body is None:
+        return HTTPStatus.CONFLICT, {"error": "not running"}
+    return HTTPStatus.OK, {**body, "path": str(PROFILE_PATH)}
+
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def status_body():
+    return {
+        "running": state["running"],
+        "events": broadcaster.stats(),
+        "procs": state["proc_cpu"].sample(),
+        "board": board.stats(),
+        "verdict": state.get("verdict"),
+        "ingest": state["ingest"].stats() if state.get("ingest") else None,
+        "sessions": [session_body(s) for s in session_list() if s is not state],
+        "admission": admission.stats(),
+    }
+
+
+def events_options(query):
+    # /events?mode=delta&max_hz=2: delta wire mode and per-client rate limit.
+    q = parse_qs(query)
+    try:
+        max_hz = float(q.get("max_hz", ["0"])[0])
+    except ValueError:
+        max_hz = 0.0
+    return {"mode": q.get("mode", ["full"])[0], "max_hz": max(0.0, max_hz)}
+
+
+def runs_request(path, query):
+    # GET /runs and /runs/<id>/series?fields=a,b&from=&to=&step=
+    # Returns (status, json body).
+    parts = [p for p in path.split("/") if p]
+    if parts == ["runs"]:
+        return HTTPStatus.OK, history.list_runs()
+    if len(parts) == 3 and parts[2] == "series" and parts[1].isdigit():
+        q = {k: v[-1] for k, v in parse_qs(query).items()}
+        fields = [f for f in q.get("fields", "total_mbps,per_tc_mbps").split(",") if f]
 
+        def num(key):
+            return float(q[key]) if q.get(key) else None
+
+        try:
+            step = num("step")
+            max_points = int(q.get("max_points", 2000))
+            if step is not None and step < 0:
+                raise ValueError("step must be >= 0")
+            if max_points < 1:
+                raise ValueError("max_points must be >= 1")
+            return HTTPStatus.OK, history.series(
+                int(parts[1]), fields, num("from"), num("to"), step, max_points,
+            )
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+    return HTTPStatus.NOT_FOUND, {"error": "not found"}
+
+
+# A POST body that is not a JSON object, or fields build_cfg cannot convert:
+# answered with 400 before anything was started.
+BAD_REQUEST_ERRORS = (ValueError, KeyError, TypeError, AttributeError)
+
+
+def parse_post_body(body):
+    data = json.loads(body.decode("utf-8")) if body else {}
+    if not isinstance(data, dict):
+        raise ValueError("body must be a JSON object")
+    return data
+
+
+def read_post_body(rfile, content_length):
+    length = int(content_length or 0)
+    return parse_post_body(rfile.read(length) if length > 0 else b"")
+
+
+def run_cfg(data):
+    # build_cfg for a run (/start, /runs, sweep points). Arrival histograms
+    # need every packet's timestamp; rxcap's live lines are sampled at
+    # live_rate_ms, so on hardware they come from binary ingest packet
+    # records (the simulator writes one live line per packet).
+    cfg = build_cfg(data)
+    if cfg["arrival_hist"] and not is_sim(cfg) and cfg["ingest"] != "binary":
+        raise ValueError("arrival_hist needs per-packet arrivals: backend=sim or ingest=binary")
+    return cfg
+
+
+def build_cfg(data):
+    cfg = {
+        "ingress_iface": data.get("ingress_iface", "enx00e04c6812d1"),
+        "egress_iface": data.get("egress_iface", "enxc84d44263ba6"),
+        "dst_mac": data.get("dst_mac", "c8:4d:44:26:3b:a6"),
+        "vlan_id": int(data.get("vlan_id", 100)),
+        "duration": int(data.get("duration", 20)),
+        "packet_size": int(data.get("packet_size", 512)),
+        "payload_size": int(data.get("payload_size", 0)),
+        "pkt_size_mode": data.get("pkt_size_mode", "frame"),
+        "rate_per_tc_mbps": int(data.get("rate_per_tc_mbps", 60)),
+        "idle_slope_kbps": data.get("idle_slope_kbps", [5000]*8),
+        "tolerance": float(data.get("tolerance", 0.1)),
+        "smooth_window": int(data.get("smooth_window", 5)),
+        "rx_batch": int(data.get("rx_batch", 512)),
+        "tx_batch": int(data.get("tx_batch", 1024)),
+        "rx_cpu": int(data.get("rx_cpu", 2)),
+        "tx_cpus": parse_cpu_list(data.get("tx_cpus", data.get("tx_cpu", 3))) or [3],
+        "tx_group_size": max(1, min(8, int(data.get("tx_group_size", 1)))),
+        "egress_port": str(data.get("egress_port", "1")),
+        "ingress_port": str(data.get("ingress_port", "2")),
+        "dst_ip": data.get("dst_ip", "10.0.100.2"),
+        "apply_first": bool(data.get("apply_first", False)),
+        "use_board": bool(data.get("use_board", True)),
+        "capture_filter": data.get("capture_filter", "dst"),
+        "rx_seq_only": bool(data.get("rx_seq_only", True)),
+        "live_rate_ms": max(1, int(data.get("live_rate_ms", 100))),
+        "seq_dump": bool(data.get("seq_dump", False)),
+        "arrival_hist": bool(data.get("arrival_hist", False)),
+        "link_mbps": float(data.get("link_mbps", 1000)),
+        "cbs_overhead_bytes": int(data.get("cbs_overhead_bytes", WIRE_OVERHEAD_BYTES)),
+        "wire_overhead_bytes": int(data.get("wire_overhead_bytes", WIRE_OVERHEAD_BYTES)),
+        "backend": "sim" if data.get("backend") == "sim" else "hw",
+        # "binary": rxcap stats records over a unix socket (CSV as fallback).
+        "ingest": "binary" if data.get("ingest") == "binary" else "csv",
+        "ingest_interval_ms": max(0.1, float(data.get("ingest_interval_ms", 1.0))),
+        "publish_interval_ms": max(10, int(data.get("publish_interval_ms", 100))),
+        "early_stop": bool(data.get("early_stop", False)),
+        "steady_window_s": max(1.0, float(data.get("steady_window_s", 5.0))),
+        "settle_s": max(0.0, float(data.get("settle_s", 2.0))),
+    }
+    cfg["tx_cpu"] = cfg["tx_cpus"][0]
+    # If payload size mode, convert to L2 frame length (ETH+VLAN+IPv4+UDP).
+    if cfg.get("pkt_size_mode") == "payload" and cfg.get("payload_size", 0) > 0:
+        vlan_ovh = 4 if cfg.get("vlan_id", 0) > 0 else 0
+        l2 = 14 + vlan_ovh
+        ip = 20
+        udp = 8
+        cfg["packet_size"] = cfg["payload_size"] + l2 + ip + udp
+    return cfg
+
+
+class Handler(SimpleHTTPRequestHandler):
     def do_GET(self):
         if self.path == "/status":
             self.send_response(HTTPStatus.OK)
             self.send_header("Content-Type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps({"running": state["running"]}).encode("utf-8"))
+            body = status_body()
+            self.wfile.write(json.dumps(body).encode("utf-8"))
+            return
+        url = urlsplit(self.path)
+        sess, action = session_route(url.path)
+        if sess is not None and action in ("status", "live", "events"):
+            if action == "events":
+                self.serve_events(run_hub(sess), url.query)
+                return
+            if action == "live":
+                status, body = live_request(url.query, sess)
+            else:
+                status, body = HTTPStatus.OK, session_body(sess)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode("utf-8"))
             return
-        if self.path == "/events":
+        if url.path == "/metrics":
             self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "text/event-stream")
-            self.send_header("Cache-Control", "no-cache")
-            self.send_header("Connection", "keep-alive")
+            self.send_header("Content-Type", METRICS_CONTENT_TYPE)
             self.end_headers()
-            while True:
-                try:
-                    data = broadcast_queue.get(timeout=5)
-                    msg = f"data: {json.dumps(data)}\n\n"
-                    self.wfile.write(msg.encode("utf-8"))
-                    self.wfile.flush()
-                except Empty:
-                    try:
-                        self.wfile.write(b": keep-alive\n\n")
-                        self.wfile.flush()
-                    except Exception:
-                        break
-                except Exception:
-                    break
+            self.wfile.write(metrics.render().encode("utf-8"))
+            return
+        if url.path in ("/runs", "/sweep", "/live") or url.path.startswith("/runs/"):
+            if url.path == "/sweep":
+                status, body = sweep_status()
+            elif url.path == "/live":
+                status, body = live_request(url.query)
+            else:
+                status, body = runs_request(url.path, url.query)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode("utf-8"))
+            return
+        if url.path == "/events":
+            self.serve_events(broadcaster, url.query)
             return
 
-        if self.path == "/":
-            self.path = "/index.html"
-        return super().do_GET()
+        self.serve_static(url.path)
+
+    def do_HEAD(self):
+        self.serve_static(urlsplit(self.path).path, head=True)
+
+    def serve_static(self, path, head=False):
+        status, body, headers = assets.respond(
+            path, self.headers.get("If-None-Match"), self.headers.get("Accept-Encoding")
+        )
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def serve_events(self, hub, query):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+        sub = hub.subscribe(name=self.client_address[0], **events_options(query))
+        try:
+            while True:
+                delay = sub.pace()
+                if delay:
+                    time.sleep(delay)
+                msgs = sub.wait(timeout=5)
+                with metrics.timer("sse_write"):
+                    if msgs:
+                        self.wfile.write(b"".join(msgs))
+                        sub.record_sent(msgs)
+                    else:
+                        self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+        except Exception:
+            pass
+        finally:
+            sub.close()
 
     def do_POST(self):
-        length = int(self.headers.get("Content-Length", "0"))
-        body = self.rfile.read(length).decode("utf-8") if length > 0 else "{}"
-        data = json.loads(body)
+        try:
+            data = read_post_body(self.rfile, self.headers.get("Content-Length"))
+            self.handle_post(data)
+        except BAD_REQUEST_ERRORS as e:
+            self.send_response(HTTPStatus.BAD_REQUEST)
+            self.end_headers()
+            self.wfile.write(f"bad request: {e}".encode("utf-8"))
 
+    def handle_post(self, data):
         if self.path == "/start":
             if state["running"]:
                 self.send_response(HTTPStatus.CONFLICT)
                 self.end_headers()
                 self.wfile.write(b"already running")
                 return
-            cfg = {
-                "ingress_iface": data.get("ingress_iface", "enx00e04c6812d1"),
-                "egress_iface": data.get("egress_iface", "enxc84d44263ba6"),
-                "dst_mac": data.get("dst_mac", "c8:4d:44:26:3b:a6"),
-                "vlan_id": int(data.get("vlan_id", 100)),
-                "duration": int(data.get("duration", 20)),
-                "packet_size": int(data.get("packet_size", 512)),
-                "payload_size": int(data.get("payload_size", 0)),
-                "pkt_size_mode": data.get("pkt_size_mode", "frame"),
-                "rate_per_tc_mbps": int(data.get("rate_per_tc_mbps", 60)),
-                "idle_slope_kbps": data.get("idle_slope_kbps", [5000]*8),
-                "tolerance": float(data.get("tolerance", 0.1)),
-                "smooth_window": int(data.get("smooth_window", 5)),
-                "rx_batch": int(data.get("rx_batch", 512)),
-                "tx_batch": int(data.get("tx_batch", 1024)),
-                "rx_cpu": int(data.get("rx_cpu", 2)),
-                "tx_cpu": int(data.get("tx_cpu", 3)),
-                "egress_port": str(data.get("egress_port", "1")),
-                "ingress_port": str(data.get("ingress_port", "2")),
-                "dst_ip": data.get("dst_ip", "10.0.100.2"),
-                "apply_first": bool(data.get("apply_first", False)),
-                "use_board": bool(data.get("use_board", True)),
-                "capture_filter": data.get("capture_filter", "dst"),
-                "rx_seq_only": bool(data.get("rx_seq_only", True)),
-            }
-            # If payload size mode, convert to L2 frame length (ETH+VLAN+IPv4+UDP).
-            if cfg.get("pkt_size_mode") == "payload" and cfg.get("payload_size", 0) > 0:
-                vlan_ovh = 4 if cfg.get("vlan_id", 0) > 0 else 0
-                l2 = 14 + vlan_ovh
-                ip = 20
-                udp = 8
-                cfg["packet_size"] = cfg["payload_size"] + l2 + ip + udp
+            cfg = run_cfg(data)
             try:
                 ok = start_test(cfg)
                 if not ok:
@@ -663,47 +1520,48 @@ class Handler(SimpleHTTPRequestHandler):
                 self.send_response(HTTPStatus.OK)
                 self.end_headers()
                 self.wfile.write(b"ok")
+            except AdmissionError as e:
+                self.send_response(HTTPStatus.CONFLICT)
+                self.end_headers()
+                self.wfile.write(str(e).encode("utf-8"))
             except Exception as e:
                 self.send_response(HTTPStatus.INTERNAL_SERVER_ERROR)
                 self.end_headers()
                 self.wfile.write(str(e).encode("utf-8"))
             return
 
+        if self.path == "/runs":
+            cfg, sess = open_session(data)
+            try:
+                start_test(cfg, sess)
+                status, body = register_session(sess)
+            except AdmissionError as e:
+                status, body = HTTPStatus.CONFLICT, {"error": str(e)}
+            except Exception as e:
+                status, body = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode("utf-8"))
+            return
+
+        sess, action = session_route(self.path)
+        if sess is not None and action == "stop":
+            stop_test(sess)
+            self.send_response(HTTPStatus.OK)
+            self.end_headers()
+            self.wfile.write(b"ok")
+            return
+
         if self.path == "/apply":
-            cfg = {
-                "ingress_iface": data.get("ingress_iface", "enx00e04c6812d1"),
-                "egress_iface": data.get("egress_iface", "enxc84d44263ba6"),
-                "dst_mac": data.get("dst_mac", "c8:4d:44:26:3b:a6"),
-                "vlan_id": int(data.get("vlan_id", 100)),
-                "duration": int(data.get("duration", 20)),
-                "packet_size": int(data.get("packet_size", 512)),
-                "payload_size": int(data.get("payload_size", 0)),
-                "pkt_size_mode": data.get("pkt_size_mode", "frame"),
-                "rate_per_tc_mbps": int(data.get("rate_per_tc_mbps", 60)),
-                "idle_slope_kbps": data.get("idle_slope_kbps", [5000]*8),
-                "tolerance": float(data.get("tolerance", 0.1)),
-                "smooth_window": int(data.get("smooth_window", 5)),
-                "rx_batch": int(data.get("rx_batch", 512)),
-                "tx_batch": int(data.get("tx_batch", 1024)),
-                "rx_cpu": int(data.get("rx_cpu", 2)),
-                "tx_cpu": int(data.get("tx_cpu", 3)),
-                "egress_port": str(data.get("egress_port", "1")),
-                "ingress_port": str(data.get("ingress_port", "2")),
-                "dst_ip": data.get("dst_ip", "10.0.100.2"),
-                "capture_filter": data.get("capture_filter", "dst"),
-                "rx_seq_only": bool(data.get("rx_seq_only", True)),
-            }
-            if cfg.get("pkt_size_mode") == "payload" and cfg.get("payload_size", 0) > 0:
-                vlan_ovh = 4 if cfg.get("vlan_id", 0) > 0 else 0
-                l2 = 14 + vlan_ovh
-                ip = 20
-                udp = 8
-                cfg["packet_size"] = cfg["payload_size"] + l2 + ip + udp
+            cfg = build_cfg(data)
             try:
                 if not Path(DEVICE).exists():
                     raise RuntimeError(f"Device not found: {DEVICE}")
-                apply_board_config(cfg)
-                setup_pc_vlan(cfg)
+                force = bool(data.get("force", False))
+                with board_lock:
+                    apply_board_config(cfg, force)
+                    setup_pc_vlan(cfg, force)
                 state["applied"] = True
                 self.send_response(HTTPStatus.OK)
                 self.end_headers()
@@ -715,21 +1573,537 @@ class Handler(SimpleHTTPRequestHandler):
             return
 
         if self.path == "/stop":
+            cancel_sweep()
             stop_test()
             self.send_response(HTTPStatus.OK)
             self.end_headers()
             self.wfile.write(b"ok")
             return
 
+        if self.path == "/sweep":
+            status, body, sweep = sweep_request(data)
+            if sweep:
+                threading.Thread(target=run_sweep, args=(sweep,), daemon=True).start()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode("utf-8"))
+            return
+
+        if self.path == "/sweep/stop":
+            cancel_sweep()
+            self.send_response(HTTPStatus.OK)
+            self.end_headers()
+            self.wfile.write(b"ok")
+            return
+
+        if self.path == "/profile":
+            status, body = profile_request(data)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode("utf-8"))
+            return
+
         self.send_response(HTTPStatus.NOT_FOUND)
         self.end_headers()
 
 
-if __name__ == "__main__":
+# ---------------------------------------------------------------------------
+# asyncio server mode (--asyncio): one thread, subprocesses supervised with
+# asyncio.create_subprocess_exec and the file readers running as tasks.
+# Same endpoints and payloads as the threaded Handler above.
+
+async def run_cmd_async(cmd, check=True):
+    proc = await asyncio.create_subprocess_shell(cmd)
+    rc = await proc.wait()
+    if check and rc != 0:
+        raise RuntimeError(f"Command failed: {cmd}")
+
+
+async def apply_board_config_async(cfg, force=False):
+    plan = board.plan(cfg, force)
+    if plan is None:
+        return 0
+    changes, patch_file = plan
+    try:
+        with metrics.timer("board_apply"):
+            await run_cmd_async(keti_patch_cmd(patch_file))
+    except Exception:
+        board.invalidate()
+        raise
+    board.commit(changes)
+    return len(changes)
+
+
+async def setup_pc_vlan_async(cfg, force=False):
+    vlans = state.setdefault("pc_vlans", {})
+    if not force and vlans.get(cfg["vlan_id"]) == pc_vlan_key(cfg):
+        return
+    vlans.pop(cfg["vlan_id"], None)
+    await run_cmd_async(pc_vlan_cmd(cfg))
+    vlans[cfg["vlan_id"]] = pc_vlan_key(cfg)
+
+
+async def start_test_async(cfg, sess=None):
+    if sess is None:
+        sess = state
+    if sess["running"]:
+        procs = sess.get("tx_procs", []) + [sess.get("rx_proc")]
+        if any(p is not None and p.returncode is None for p in procs):
+            return False
+        sess["running"] = False
+    admission.admit(sess["sid"], cfg)
+    try:
+        await launch_test_async(cfg, sess)
+    except Exception:
+        sess["running"] = False
+        admission.release(sess["sid"])
+        raise
+    return True
+
+
+async def launch_test_async(cfg, sess):
+    sess["running"] = True
+    sess["cfg"] = cfg
+    # A fresh event per run: threads of the previous run keep (and see) theirs.
+    sess["stop_event"] = threading.Event()
+    paths = run_paths(sess)
+    if cfg.get("ingest") == "binary" and not is_sim(cfg):
+        # Runs rxcap --help once per binary; open_ingest() then hits the cache.
+        await asyncio.to_thread(rxcap_supports, "--stats-sock")
+    if prepare_run(cfg, sess):
+        try:
+            async with state["board_lock_async"]:
+                await apply_board_config_async(cfg)
+                await setup_pc_vlan_async(cfg)
+            state["applied"] = True
+        except Exception:
+            state["applied"] = False
+    sess["tx_procs"] = []
+    sess["tx_groups"] = []
+    monitor = sess["proc_cpu"]
+    monitor.clear()
+    if is_sim(cfg):
+        sess["rx_proc"] = await asyncio.create_subprocess_exec(*sim_argv(cfg, paths), start_new_session=True)
+        monitor.track("sim", sess["rx_proc"].pid)
+    else:
+        for cmd in OPTIMIZE_CMDS:
+            await run_cmd_async(f"sudo {cmd}", check=False)
+        sess["rx_proc"] = await asyncio.create_subprocess_exec(
+            *rx_argv(cfg, paths), preexec_fn=pinned_session(cfg["rx_cpu"])
+        )
+        monitor.track("rxcap", sess["rx_proc"].pid, cfg["rx_cpu"])
+        for cpu, tcs in tx_groups(cfg):
+            proc = await asyncio.create_subprocess_exec(*tx_argv(cfg, tcs, paths), preexec_fn=pinned_session(cpu))
+            sess["tx_procs"].append(proc)
+            sess["tx_groups"].append({"cpu": cpu, "tcs": tcs, "pid": proc.pid})
+            monitor.track("txgen", proc.pid, cpu, tcs)
+    sess["live_ring"].clear()
+    sess["cap_mode"] = "rxcap"
+
+    watch = binary_watcher_async if sess.get("ingest") else csv_watcher_async
+    sess["tasks"] = [
+        asyncio.create_task(watch(sess)),
+        asyncio.create_task(live_file_reader_async(sess)),
+        asyncio.create_task(wait_for_completion_async(sess)),
+    ]
+
+
+async def wait_for_completion_async(sess):
+    stop = sess["stop_event"]
+    for p in sess.get("tx_procs", []):
+        await p.wait()
+    rx = sess.get("rx_proc")
+    if rx:
+        await rx.wait()
+    end_run(sess, stop)
+
+
+async def stop_test_async(sess=None):
+    if sess is None:
+        sess = state
+    sess["stop_event"].set()
+    procs = [p for p in [sess.get("rx_proc")] + sess.get("tx_procs", []) if p]
+    for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGKILL):
+        alive = [p for p in procs if p.returncode is None]
+        if not alive:
+            break
+        for p in alive:
+            try:
+                os.killpg(os.getpgid(p.pid), sig)
+            except Exception:
+                pass
+        try:
+            await asyncio.wait_for(asyncio.gather(*(p.wait() for p in alive)), 0.2)
+        except asyncio.TimeoutError:
+            pass
+    sess["running"] = False
+    sess["rx_proc"] = None
+    sess["tx_procs"] = []
+    admission.release(sess["sid"])
+
+
+async def csv_watcher_async(sess):
+    # File, sysfs/ethtool and SQLite work runs in worker threads (one hop per
+    # wakeup) so SSE clients are never stalled behind it; only publishing
+    # happens on the event loop.
+    stop = sess["stop_event"]
+    csv_path = run_paths(sess).csv
+    proc = await asyncio.to_thread(rx_processor, sess)
+    reader = CsvTailReader(csv_path)
+    tx_paths = {str(p) for p in proc.tx.paths()}
+    watcher = FileWatcher([csv_path, *tx_paths])
+    proc.tx_watched = True
+    recorder = await asyncio.to_thread(open_recorder, sess["cfg"])
+    detector = steady_detector(sess["cfg"]) if sess["cfg"]["early_stop"] else None
+    while run_active(sess, stop):
+        payloads = await asyncio.to_thread(poll_csv_rows, reader, proc, recorder, detector)
+        publish_payloads(sess, payloads)
+        if detector and detector.steady:
+            publish_verdict(detector, sess=sess)
+            await stop_test_async(sess)
+            break
+        changed = await watcher.wait_async(WATCH_TIMEOUT_S)
+        if changed & tx_paths:
+            proc.tx_stale = True
+    watcher.close()
+    reader.close()
+    await asyncio.to_thread(close_processor, proc, recorder, run_end_status(detector, stop, sess))
+
+
+async def binary_watcher_async(sess):
+    stop = sess["stop_event"]
+    sock = sess["ingest"]
+    window = StatsWindow(sess["cfg"]["publish_interval_ms"] / 1000.0)
+    deadline = time.monotonic() + BINARY_FALLBACK_S
+    rows = []
+    while run_active(sess, stop) and not rows:
+        rows = poll_ingest(sock, window, sess)
+        if not rows:
+            if time.monotonic() >= deadline:
+                ingest_fallback(sess, sock)
+                await csv_watcher_async(sess)
+                return
+            await sock.wait_async(WATCH_TIMEOUT_S)
+    if not rows:
+        sock.close()
+        return
+    proc = await asyncio.to_thread(rx_processor, sess)
+    recorder = await asyncio.to_thread(open_recorder, sess["cfg"])
+    detector = steady_detector(sess["cfg"]) if sess["cfg"]["early_stop"] else None
+    while run_active(sess, stop):
+        payloads = await asyncio.to_thread(process_rows, proc, rows, recorder, detector)
+        publish_payloads(sess, payloads)
+        if detector and detector.steady:
+            publish_verdict(detector, sess=sess)
+            await stop_test_async(sess)
+            break
+        await sock.wait_async(WATCH_TIMEOUT_S)
+        rows = poll_ingest(sock, window, sess)
+    sock.close()
+    await asyncio.to_thread(close_processor, proc, recorder, run_end_status(detector, stop, sess))
+
+
+async def live_file_reader_async(sess):
+    stop = sess["stop_event"]
+    live_path = run_paths(sess).live
+    reader = CsvTailReader(live_path, header=False)
+    watcher = FileWatcher([live_path])
+    while run_active(sess, stop):
+        ingest_live(await asyncio.to_thread(read_live, reader), sess)
+        await watcher.wait_async(WATCH_TIMEOUT_S)
+    watcher.close()
+    reader.close()
+
+
+async def run_sweep_async(sweep):
+    sweep.state = "running"
+    try:
+        for i in range(len(sweep.points)):
+            if sweep.cancel.is_set():
+                break
+            cfg = run_cfg(sweep.point_data(i))
+            sub = broadcaster.subscribe(max_lag=broadcaster.capacity, name="sweep")
+            try:
+                if not await start_test_async(cfg):
+                    raise RuntimeError("a test is already running")
+                sweep.begin_point(i, steady_detector(cfg, sweep.window_s, sweep.settle_s))
+                deadline = time.monotonic() + cfg["duration"] + SWEEP_GRACE_S
+                while True:
+                    sweep_feed(sweep.detector, await broadcaster.next(sub, timeout=WATCH_TIMEOUT_S))
+                    reason = sweep_check(sweep, deadline)
+                    if reason:
+                        break
+            finally:
+                sub.close()
+            await stop_test_async()
+            sweep_point_done(sweep, cfg, reason)
+    except Exception as e:
+        await stop_test_async()
+        sweep_done(sweep, "error", str(e))
+        return
+    sweep_done(sweep, "stopped" if sweep.cancel.is_set() else "done")
+
+
+async def send_response_async(writer, status, body=b"", content_type="text/plain", headers=None, head=False):
+    # head: a HEAD response, the headers of body without the body.
+    status = HTTPStatus(status)
+    lines = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        f"Content-Type: {content_type}",
+        "Connection: close",
+    ]
+    # A 304 has no body; a Content-Length would describe the cached one.
+    if status != HTTPStatus.NOT_MODIFIED:
+        lines.append(f"Content-Length: {len(body)}")
+    for k, v in (headers or {}).items():
+        lines.append(f"{k}: {v}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (b"" if head else body))
+    await writer.drain()
+
+
+async def serve_events_async(writer, peer, query="", hub=None):
+    if hub is None:
+        hub = broadcaster
+    writer.write(
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: text/event-stream\r\n"
+        b"Cache-Control: no-cache\r\n"
+        b"Connection: keep-alive\r\n\r\n"
+    )
+    sub = hub.subscribe(name=peer, **events_options(query))
+    try:
+        while True:
+            delay = sub.pace()
+            if delay:
+                await asyncio.sleep(delay)
+            msgs = await hub.next(sub, timeout=5)
+            with metrics.timer("sse_write"):
+                if msgs:
+                    writer.write(b"".join(msgs))
+                    sub.record_sent(msgs)
+                else:
+                    writer.write(b": keep-alive\n\n")
+                await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        sub.close()
+
+
+async def serve_static_async(writer, path, request_headers, head=False):
+    status, body, headers = assets.respond(
+        path, request_headers.get("if-none-match"), request_headers.get("accept-encoding")
+    )
+    ctype = headers.pop("Content-Type")
+    await send_response_async(writer, status, body, ctype, headers, head=head)
+
+
+async def handle_post_async(writer, path, data):
+    if path == "/start":
+        if state["running"]:
+            await send_response_async(writer, HTTPStatus.CONFLICT, b"already running")
+            return
+        cfg = run_cfg(data)
+        try:
+            ok = await start_test_async(cfg)
+        except AdmissionError as e:
+            await send_response_async(writer, HTTPStatus.CONFLICT, str(e).encode("utf-8"))
+            return
+        except Exception as e:
+            await send_response_async(writer, HTTPStatus.INTERNAL_SERVER_ERROR, str(e).encode("utf-8"))
+            return
+        if not ok:
+            await send_response_async(writer, HTTPStatus.CONFLICT, b"already running")
+            return
+        await send_response_async(writer, HTTPStatus.OK, b"ok")
+        return
+
+    if path == "/runs":
+        cfg, sess = open_session(data)
+        try:
+            await start_test_async(cfg, sess)
+            status, body = register_session(sess)
+        except AdmissionError as e:
+            status, body = HTTPStatus.CONFLICT, {"error": str(e)}
+        except Exception as e:
+            status, body = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+        await send_response_async(writer, status, json.dumps(body).encode("utf-8"), "application/json")
+        return
+
+    sess, action = session_route(path)
+    if sess is not None and action == "stop":
+        await stop_test_async(sess)
+        await send_response_async(writer, HTTPStatus.OK, b"ok")
+        return
+
+    if path == "/apply":
+        cfg = build_cfg(data)
+        try:
+            if not Path(DEVICE).exists():
+                raise RuntimeError(f"Device not found: {DEVICE}")
+            force = bool(data.get("force", False))
+            async with state["board_lock_async"]:
+                await apply_board_config_async(cfg, force)
+                await setup_pc_vlan_async(cfg, force)
+            state["applied"] = True
+        except Exception as e:
+            await send_response_async(writer, HTTPStatus.INTERNAL_SERVER_ERROR, str(e).encode("utf-8"))
+            return
+        await send_response_async(writer, HTTPStatus.OK, b"ok")
+        return
+
+    if path == "/stop":
+        cancel_sweep()
+        await stop_test_async()
+        await send_response_async(writer, HTTPStatus.OK, b"ok")
+        return
+
+    if path == "/sweep":
+        status, body, sweep = sweep_request(data)
+        if sweep:
+            state["sweep_task"] = asyncio.create_task(run_sweep_async(sweep))
+        await send_response_async(writer, status, json.dumps(body).encode("utf-8"), "application/json")
+        return
+
+    if path == "/sweep/stop":
+        cancel_sweep()
+        await send_response_async(writer, HTTPStatus.OK, b"ok")
+        return
+
+    if path == "/profile":
+        status, body = profile_request(data)
+        await send_response_async(writer, status, json.dumps(body).encode("utf-8"), "application/json")
+        return
+
+    await send_response_async(writer, HTTPStatus.NOT_FOUND)
+
+
+async def handle_client_async(reader, writer):
+    peer = (writer.get_extra_info("peername") or ("",))[0]
+    try:
+        request = await reader.readline()
+        parts = request.decode("latin-1").split()
+        if len(parts) < 2:
+            return
+        method, target = parts[0], parts[1]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        path, _, query = target.partition("?")
+
+        if method == "GET":
+            sess, action = session_route(path)
+            if sess is not None and action == "events":
+                await serve_events_async(writer, peer, query, run_hub(sess))
+            elif sess is not None and action in ("status", "live"):
+                status, body = live_request(query, sess) if action == "live" else (HTTPStatus.OK, session_body(sess))
+                await send_response_async(writer, status, json.dumps(body).encode("utf-8"), "application/json")
+            elif path == "/status":
+                body = status_body()
+                await send_response_async(writer, HTTPStatus.OK, json.dumps(body).encode("utf-8"), "application/json")
+            elif path == "/runs" or path.startswith("/runs/"):
+                status, body = runs_request(path, query)
+                await send_response_async(writer, status, json.dumps(body).encode("utf-8"), "application/json")
+            elif path == "/sweep":
+                status, body = sweep_status()
+                await send_response_async(writer, status, json.dumps(body).encode("utf-8"), "application/json")
+            elif path == "/live":
+                status, body = live_request(query)
+                await send_response_async(writer, status, json.dumps(body).encode("utf-8"), "application/json")
+            elif path == "/metrics":
+                await send_response_async(writer, HTTPStatus.OK, metrics.render().encode("utf-8"), METRICS_CONTENT_TYPE)
+            elif path == "/events":
+                await serve_events_async(writer, peer, query)
+            else:
+                await serve_static_async(writer, path, headers)
+        elif method == "HEAD":
+            # Static files only, as Handler.do_HEAD.
+            await serve_static_async(writer, path, headers, head=True)
+        elif method == "POST":
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+                body = await reader.readexactly(length) if length > 0 else b""
+                await handle_post_async(writer, path, parse_post_body(body))
+            except BAD_REQUEST_ERRORS as e:
+                await send_response_async(writer, HTTPStatus.BAD_REQUEST, f"bad request: {e}".encode("utf-8"))
+        else:
+            await send_response_async(writer, HTTPStatus.METHOD_NOT_ALLOWED)
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_async_server(host, port):
+    global broadcaster
+    broadcaster = AsyncBroadcaster(append_max=CAP_LINES_MAX)
+    state["board_lock_async"] = asyncio.Lock()
+    return await asyncio.start_server(handle_client_async, host, port, backlog=1024)
+
+
+async def serve_async(host, port):
+    server = await start_async_server(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CBS real-time dashboard server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--asyncio", action="store_true", help="single-threaded asyncio server core")
+    parser.add_argument("--replay", metavar="DIR", help="replay a recorded run (cbs_rx.csv, tx_stats/, live_packets.csv)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor, 0 = as fast as possible")
+    parser.add_argument("--cfg", help="JSON file with the run cfg (same keys as /start) for --replay")
+    parser.add_argument("--no-serve", action="store_true", help="with --replay: no HTTP server, print pipeline throughput")
+    args = parser.parse_args()
+
+    if args.replay:
+        cfg = build_cfg(json.loads(Path(args.cfg).read_text()) if args.cfg else {})
+        src = Path(args.replay).resolve()
+
+        def replay():
+            stats = replay_run(src, cfg, args.speed)
+            print(
+                f"replayed {stats['rows']} rows ({stats['published']} samples) in {stats['elapsed_s']:.3f} s, "
+                f"{stats['rows_per_s']:.0f} rows/s"
+            )
+
+        if args.no_serve:
+            replay()
+            return
+        os.chdir(STATIC)
+        assets.load()
+        server = ThreadingHTTPServer((args.host, args.port), Handler)
+        threading.Thread(target=replay, daemon=True).start()
+        print(f"CBS RT replay on http://localhost:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    assets.load()
+    print(f"CBS RT server listening on http://localhost:{args.port}")
+    if args.asyncio:
+        try:
+            asyncio.run(serve_async(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return
     os.chdir(STATIC)
-    server = ThreadingHTTPServer(("0.0.0.0", 8010), Handler)
-    print("CBS RT server listening on http://localhost:8010")
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         pass
+
+
+if __name__ == "__main__":
+    main()
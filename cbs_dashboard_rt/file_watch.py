@@ -0,0 +1,171 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT = struct.Struct("iIII")
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        try:
+            lib = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            lib.inotify_init1.argtypes = [ctypes.c_int]
+            lib.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            _libc = lib
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc
+
+
+class FileWatcher:
+    # Wakes consumers when any of the given files is created or written.
+    # Uses inotify on the parent directories (the files are unlinked and
+    # recreated between runs); without inotify it falls back to stat polling
+    # whose interval backs off from min_interval to max_interval while idle.
+    def __init__(self, paths, min_interval=0.01, max_interval=0.5, use_inotify=True):
+        self.paths = [str(p) for p in paths]
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.fd = -1
+        self._wd_names = {}
+        self._sigs = {}
+        if use_inotify:
+            self._init_inotify()
+        if self.fd < 0:
+            self._sigs = {p: self._sig(p) for p in self.paths}
+
+    @property
+    def native(self):
+        return self.fd >= 0
+
+    def _init_inotify(self):
+        libc = _load_libc()
+        if not libc:
+            return
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return
+        by_dir = {}
+        for p in self.paths:
+            d, name = os.path.split(p)
+            by_dir.setdefault(d or ".", {})[name] = p
+        for d, names in by_dir.items():
+            wd = libc.inotify_add_watch(fd, os.fsencode(d), WATCH_MASK)
+            if wd < 0:
+                os.close(fd)
+                self._wd_names = {}
+                return
+            self._wd_names[wd] = names
+        self.fd = fd
+
+    def fileno(self):
+        return self.fd
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    @staticmethod
+    def _sig(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _drain(self):
+        changed = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            pos = 0
+            while pos + _EVENT.size <= len(buf):
+                wd, mask, _cookie, length = _EVENT.unpack_from(buf, pos)
+                name = buf[pos + _EVENT.size:pos + _EVENT.size + length].rstrip(b"\0")
+                pos += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(self.paths)
+                    continue
+                p = self._wd_names.get(wd, {}).get(os.fsdecode(name))
+                if p:
+                    changed.add(p)
+        return changed
+
+    def _poll_stat(self):
+        changed = set()
+        for p in self.paths:
+            sig = self._sig(p)
+            if sig != self._sigs.get(p):
+                self._sigs[p] = sig
+                changed.add(p)
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * 2)
+        return changed
+
+    def wait(self, timeout=None):
+        # Block until a watched path changes or timeout elapses.
+        if self.native:
+            ready = select.select([self.fd], [], [], timeout)[0]
+            return self._drain() if ready else set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._poll_stat()
+            if changed:
+                return changed
+            delay = self.interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+    async def wait_async(self, timeout=None):
+        if not self.native:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                changed = self._poll_stat()
+                if changed:
+                    return changed
+                delay = self.interval
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return set()
+                    delay = min(delay, remaining)
+                await asyncio.sleep(delay)
+        changed = self._drain()
+        if changed:
+            return changed
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_reader(self.fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await asyncio.wait_for(ready, timeout)
+        except asyncio.TimeoutError:
+            return set()
+        finally:
+            loop.remove_reader(self.fd)
+        return self._drain()
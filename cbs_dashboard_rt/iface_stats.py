@@ -0,0 +1,152 @@
+import array
+import fcntl
+import os
+import re
+import socket
+import struct
+import time
+
+IFACE_COUNTERS = (
+    "rx_packets", "rx_bytes", "rx_dropped", "rx_errors",
+    "tx_packets", "tx_bytes", "tx_dropped", "tx_errors",
+    # Frames the NIC had no ring buffer for (missed) or lost in its FIFO:
+    # drops on the host side, as opposed to frames the switch never sent.
+    "rx_missed_errors", "rx_fifo_errors",
+)
+
+SIOCETHTOOL = 0x8946
+ETHTOOL_GDRVINFO = 0x03
+ETHTOOL_GSTRINGS = 0x1B
+ETHTOOL_GSTATS = 0x1D
+ETH_SS_STATS = 1
+ETH_GSTRING_LEN = 32
+DRVINFO_SIZE = 196
+DRVINFO_N_STATS = 180
+
+# Per-queue driver counter names: rx_queue_0_packets (virtio, igb, ixgbe),
+# rx0_packets (mlx5), rx-0.packets (i40e, ice).
+QUEUE_STAT = re.compile(r"^(rx|tx)[_-]?(?:queue_)?(\d+)[._](.+)$")
+
+
+class _Ethtool:
+    # Driver statistics of one interface (what ethtool -S prints): names are
+    # fetched once, values with a single SIOCETHTOOL ioctl per read into a
+    # preallocated buffer.
+    def __init__(self, sock, iface):
+        self.sock = sock
+        self.iface = iface.encode()[:15]
+        info = self._call(array.array("B", struct.pack("I", ETHTOOL_GDRVINFO) + bytes(DRVINFO_SIZE - 4)))
+        n = struct.unpack_from("I", info, DRVINFO_N_STATS)[0]
+        if not n:
+            raise OSError(f"{iface}: no driver statistics")
+        names = self._call(array.array("B", struct.pack("III", ETHTOOL_GSTRINGS, ETH_SS_STATS, n) + bytes(n * ETH_GSTRING_LEN)))
+        self.names = [
+            bytes(names[12 + i * ETH_GSTRING_LEN:12 + (i + 1) * ETH_GSTRING_LEN]).split(b"\0", 1)[0].decode("ascii", "replace")
+            for i in range(n)
+        ]
+        self.buf = array.array("B", struct.pack("II", ETHTOOL_GSTATS, n) + bytes(n * 8))
+        self.values = memoryview(self.buf)[8:].cast("Q")
+
+    def _call(self, buf):
+        fcntl.ioctl(self.sock.fileno(), SIOCETHTOOL, struct.pack("16sP", self.iface, buf.buffer_info()[0]))
+        return buf
+
+    def read(self):
+        self._call(self.buf)
+        return tuple(self.values)
+
+
+def _open(path):
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+class IfaceSampler:
+    # Counters of the ingress/egress interfaces, read back to back in one
+    # sample() per rxcap row. The sysfs statistics files stay open and are
+    # re-read with pread (one syscall per counter, no open/close or Path
+    # objects), and driver counters come from one ioctl per interface.
+    # /proc/net/dev would be a single read but folds rx_missed_errors into
+    # its drop column, which is the split the Interface Deltas table needs.
+    def __init__(self, ifaces, counters=IFACE_COUNTERS, driver=True):
+        self.ifaces = list(dict.fromkeys(ifaces))
+        self.counters = counters
+        self.fds = {
+            iface: [_open(f"/sys/class/net/{iface}/statistics/{name}") for name in counters]
+            for iface in self.ifaces
+        }
+        self.sock = None
+        self.ethtool = {}
+        if driver:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            for iface in self.ifaces:
+                try:
+                    self.ethtool[iface] = _Ethtool(self.sock, iface)
+                except OSError:
+                    pass
+        self.t_last, self.last = self.read()
+
+    def close(self):
+        for fds in self.fds.values():
+            for fd in fds:
+                if fd is not None:
+                    os.close(fd)
+        self.fds = {}
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+        self.ethtool = {}
+
+    def _read_stats(self, fds):
+        out = []
+        for fd in fds:
+            try:
+                out.append(int(os.pread(fd, 32, 0)) if fd is not None else 0)
+            except (OSError, ValueError):
+                out.append(0)
+        return out
+
+    def read(self):
+        t = time.monotonic()
+        now = {}
+        for iface in self.ifaces:
+            eth = self.ethtool.get(iface)
+            try:
+                driver = eth.read() if eth else ()
+            except OSError:
+                driver = ()
+            now[iface] = (self._read_stats(self.fds.get(iface, ())), driver)
+        return t, now
+
+    def sample(self):
+        # Deltas since the previous sample: (dt_s, {iface: counter deltas},
+        # {iface: {"queues": {"rx-0": {...}}, "driver": {...}}}). Driver
+        # counters that did not change are left out.
+        t, now = self.read()
+        dt = t - self.t_last
+        stats = {}
+        nic = {}
+        for iface, (values, driver) in now.items():
+            prev_values, prev_driver = self.last[iface]
+            stats[iface] = {name: max(0, v - p) for name, v, p in zip(self.counters, values, prev_values)}
+            if driver and len(driver) == len(prev_driver):
+                nic[iface] = self._driver_delta(self.ethtool[iface].names, driver, prev_driver)
+        self.t_last, self.last = t, now
+        return dt, stats, nic
+
+    @staticmethod
+    def _driver_delta(names, now, prev):
+        queues = {}
+        other = {}
+        for name, v, p in zip(names, now, prev):
+            if v == p:
+                continue
+            d = v - p if v > p else 0
+            m = QUEUE_STAT.match(name)
+            if m:
+                queues.setdefault(f"{m.group(1)}-{m.group(2)}", {})[m.group(3)] = d
+            else:
+                other[name] = d
+        return {"queues": queues, "driver": other}
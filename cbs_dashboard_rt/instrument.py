@@ -0,0 +1,202 @@
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+# Stage latency buckets (seconds): 5 us .. 5 s.
+LATENCY_BUCKETS_S = (
+    5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+class StageHistogram:
+    # Cumulative-on-render latency histogram: observe() is one bisect and two
+    # adds under a lock, so it can sit on per-row paths.
+    def __init__(self, buckets=LATENCY_BUCKETS_S):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class _Timer:
+    __slots__ = ("hist", "t0")
+
+    def __init__(self, hist):
+        self.hist = hist
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t0)
+        return False
+
+
+def _fmt(v):
+    if isinstance(v, bool):
+        return "1" if v else "0"
+    if isinstance(v, int):
+        return str(v)
+    return repr(float(v))
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    esc = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, esc)) + "}"
+
+
+class Metrics:
+    # Server self-instrumentation in Prometheus text format (/metrics):
+    # per-stage latency histograms (timer/observe), counters (inc) and
+    # collectors read at scrape time (queue depths, bytes sent, ...), so the
+    # hot paths only pay for what they time.
+    def __init__(self, prefix="cbs"):
+        self.prefix = prefix
+        self.stages = {}
+        self.counters = {}
+        self.collectors = []
+        self._lock = threading.Lock()
+
+    def _stage(self, stage):
+        hist = self.stages.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self.stages.setdefault(stage, StageHistogram())
+        return hist
+
+    def timer(self, stage):
+        return _Timer(self._stage(stage))
+
+    def observe(self, stage, seconds):
+        self._stage(stage).observe(seconds)
+
+    def inc(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def collector(self, name, kind, help_text, fn):
+        # fn() returns a number or a list of (labels dict, number).
+        self.collectors.append((name, kind, help_text, fn))
+
+    def render(self):
+        p = self.prefix
+        out = [
+            f"# HELP {p}_stage_seconds Time spent per server stage.",
+            f"# TYPE {p}_stage_seconds histogram",
+        ]
+        for stage in sorted(self.stages):
+            counts, total, n = self.stages[stage].snapshot()
+            acc = 0
+            for le, c in zip(self.stages[stage].buckets, counts):
+                acc += c
+                out.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {acc}')
+            out.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {n}')
+            out.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {_fmt(total)}')
+            out.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {n}')
+        with self._lock:
+            counters = sorted(self.counters.items())
+        for name, v in counters:
+            out.append(f"# TYPE {p}_{name} counter")
+            out.append(f"{p}_{name} {_fmt(v)}")
+        for name, kind, help_text, fn in self.collectors:
+            try:
+                v = fn()
+            except Exception:
+                continue
+            out.append(f"# HELP {p}_{name} {help_text}")
+            out.append(f"# TYPE {p}_{name} {kind}")
+            if isinstance(v, list):
+                out.extend(f"{p}_{name}{_labels(labels)} {_fmt(x)}" for labels, x in v)
+            elif v is not None:
+                out.append(f"{p}_{name} {_fmt(v)}")
+        return "\n".join(out) + "\n"
+
+
+class StackSampler:
+    # Wall-clock sampling profiler: a daemon thread snapshots the stacks of
+    # every other thread each interval and counts them in folded form
+    # ("thread;file:func;file:func N"), which flamegraph.pl, speedscope and
+    # inferno read directly. Off unless started.
+    def __init__(self, interval_s=0.005, max_depth=64):
+        self.interval_s = interval_s
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self._stop = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self, interval_s=None):
+        if self.running:
+            return False
+        if interval_s:
+            self.interval_s = max(0.001, float(interval_s))
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = time.time()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        me = threading.get_ident()
+        stop = self._stop
+        while not stop.wait(self.interval_s):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                parts = []
+                while frame is not None and len(parts) < self.max_depth:
+                    code = frame.f_code
+                    parts.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                    frame = frame.f_back
+                parts.append(names.get(ident, str(ident)))
+                parts.reverse()
+                self.stacks[";".join(parts)] += 1
+            self.samples += 1
+
+    def stop(self, path=None):
+        # Stops sampling and writes the folded stacks to path (if given).
+        if not self.running:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if path:
+            with open(path, "w") as f:
+                for stack, n in self.stacks.most_common():
+                    f.write(f"{stack} {n}\n")
+        return self.status()
+
+    def status(self):
+        return {
+            "running": self.running,
+            "interval_ms": self.interval_s * 1000.0,
+            "samples": self.samples,
+            "stacks": len(self.stacks),
+            "started_at": self.started_at,
+        }
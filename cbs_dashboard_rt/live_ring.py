@@ -0,0 +1,68 @@
+import threading
+from collections import deque
+from itertools import islice
+
+
+class LiveRing:
+    # Fixed-size ring of live packet lines with monotonically increasing IDs:
+    # the line with ID n is the n-th line appended since the server started
+    # (IDs keep counting across runs, clear() only drops the lines). Writers
+    # (file readers) and readers (payload builder, /live clients) share one
+    # lock; every operation is bounded by the ring capacity, never by the file size.
+    def __init__(self, capacity=4096):
+        self.capacity = max(1, int(capacity))
+        self._lines = deque(maxlen=self.capacity)
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def extend(self, lines):
+        # Returns the ID after the last line appended.
+        with self._lock:
+            self._lines.extend(lines[-self.capacity:])
+            self._next_id += len(lines)
+            return self._next_id
+
+    def append(self, line):
+        with self._lock:
+            self._lines.append(line)
+            self._next_id += 1
+            return self._next_id
+
+    def clear(self):
+        with self._lock:
+            self._lines.clear()
+
+    @property
+    def next_id(self):
+        return self._next_id
+
+    def first_id(self):
+        with self._lock:
+            return self._next_id - len(self._lines)
+
+    def tail(self, n):
+        with self._lock:
+            out = list(islice(reversed(self._lines), max(0, n)))
+        out.reverse()
+        return out
+
+    def since(self, line_id, limit=None):
+        # Lines with ID >= line_id, oldest first, at most limit of them.
+        # "dropped" counts requested lines already overwritten, so a client
+        # polling with the returned next_id can tell it fell behind. An ID
+        # past the end (server restarted) starts over from the oldest line.
+        line_id = int(line_id)
+        with self._lock:
+            lines = self._lines
+            first = self._next_id - len(lines)
+            if line_id > self._next_id:
+                line_id = first
+            start = max(line_id, first)
+            stop = self._next_id if limit is None else min(self._next_id, start + max(0, int(limit)))
+            out = list(islice(lines, start - first, stop - first)) if stop > start else []
+            return {
+                "lines": out,
+                "first_id": start,
+                "next_id": stop,
+                "dropped": max(0, first - line_id),
+            }
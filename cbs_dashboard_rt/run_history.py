@@ -0,0 +1,258 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Numeric payload fields kept per sample. Per-TC lists are stored as one
+# column per TC (name_0 .. name_7) so SQL can aggregate them directly.
+SCALAR_FIELDS = (
+    "time_s", "total_mbps", "total_mbps_calc", "total_mbps_pcp", "unknown_mbps",
+    "total_pps", "drops", "total_pkts", "vlan_pkts", "non_vlan_pkts", "seq_pkts",
+    "embedded_pcp_pkts", "rx_ratio", "pcp_ratio", "pcp_ratio_count", "total_pred",
+    "total_tx", "pass_count",
+)
+TC_FIELDS = (
+    "per_tc_mbps", "per_tc_mbps_payload", "per_tc_pps", "per_tc_mbps_scaled",
+    "pred_mbps", "tx_tc_mbps", "exp_mbps", "exp_pps", "pcp_pkts",
+)
+TCS = 8
+TC_COLUMNS = tuple(f"{f}_{tc}" for f in TC_FIELDS for tc in range(TCS))
+COLUMNS = SCALAR_FIELDS + ("pass_mask",) + TC_COLUMNS
+PASS_MASK_COL = len(SCALAR_FIELDS) + 1
+# Pre-aggregated tables (bucket width in seconds) maintained while recording;
+# overview queries read the coarsest level that still fits the step.
+ROLLUP_LEVELS = (1.0, 10.0)
+
+
+# Bitwise AND of pass_mask over a GROUP BY bucket: a TC passes only if it
+# passed in every row (MIN of the whole mask would not be that).
+PASS_MASK_AND = "(" + " | ".join(
+    f"(MIN((CAST(pass_mask AS INTEGER) >> {tc}) & 1) << {tc})" for tc in range(TCS)
+) + ")"
+
+
+def rollup_table(level):
+    return f"samples_r{int(level)}"
+
+
+def payload_row(run_id, payload):
+    passes = payload.get("pass") or []
+    row = [run_id]
+    for f in SCALAR_FIELDS:
+        if f == "pass_count":
+            row.append(sum(1 for p in passes if p))
+        else:
+            row.append(payload.get(f, 0))
+    row.append(sum(1 << tc for tc, p in enumerate(passes) if p))
+    for f in TC_FIELDS:
+        values = payload.get(f) or []
+        row.extend(values[tc] if tc < len(values) else 0 for tc in range(TCS))
+    return row
+
+
+class Rollup:
+    # Running mean of sample rows within fixed time buckets.
+    def __init__(self, level):
+        self.level = level
+        self.key = None
+        self.sums = None
+        self.mask = 0
+        self.n = 0
+        self.done = []
+
+    def add(self, row):
+        key = int(row[1] // self.level)
+        if key != self.key:
+            self.emit()
+            self.key = key
+            self.sums = [0.0] * len(row)
+            self.mask = (1 << TCS) - 1
+        self.n += 1
+        for i in range(1, len(row)):
+            self.sums[i] += row[i]
+        self.mask &= int(row[PASS_MASK_COL])
+        self.sums[0] = row[0]
+
+    def emit(self):
+        if not self.n:
+            return
+        out = [self.sums[0]] + [v / self.n for v in self.sums[1:]]
+        out[PASS_MASK_COL] = self.mask
+        self.done.append(out)
+        self.n = 0
+
+    def take(self):
+        rows, self.done = self.done, []
+        return rows
+
+
+class RunRecorder:
+    # Append-only writer for one run; rows are buffered and inserted in
+    # batches (one transaction per flush), together with the rollup levels.
+    def __init__(self, history, run_id, batch=200, flush_s=2.0):
+        self.history = history
+        self.run_id = run_id
+        self.batch = batch
+        self.flush_s = flush_s
+        self.samples = 0
+        self._rows = []
+        self._last_t = None
+        self._last_flush = time.monotonic()
+        self._rollups = [Rollup(level) for level in ROLLUP_LEVELS]
+        self._db = history.connect()
+
+    def add(self, payload):
+        # Repeats of the last valid payload (same time_s) are not stored.
+        t = payload.get("time_s")
+        if t is None or (self._last_t is not None and t <= self._last_t):
+            return False
+        self._last_t = t
+        row = payload_row(self.run_id, payload)
+        self._rows.append(row)
+        for r in self._rollups:
+            r.add(row)
+        if len(self._rows) >= self.batch or time.monotonic() - self._last_flush >= self.flush_s:
+            self.flush()
+        return True
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        with self._db:
+            self._db.executemany(self.history.insert_sql, rows)
+            for r in self._rollups:
+                self._db.executemany(self.history.rollup_sql[r.level], r.take())
+            self._db.execute(
+                "UPDATE runs SET samples = samples + ? WHERE id = ?", (len(rows), self.run_id)
+            )
+        self.samples += len(rows)
+
+    def close(self, status="done"):
+        for r in self._rollups:
+            r.emit()
+        self.flush()
+        with self._db:
+            for r in self._rollups:
+                self._db.executemany(self.history.rollup_sql[r.level], r.take())
+            self._db.execute(
+                "UPDATE runs SET ended = ?, status = ? WHERE id = ?", (time.time(), status, self.run_id)
+            )
+        self._db.close()
+
+
+class RunHistory:
+    def __init__(self, path):
+        self.path = Path(path)
+        values = ", ".join("?" * (len(COLUMNS) + 1))
+        self.insert_sql = f"INSERT INTO samples (run_id, {', '.join(COLUMNS)}) VALUES ({values})"
+        self.rollup_sql = {
+            level: f"INSERT INTO {rollup_table(level)} (run_id, {', '.join(COLUMNS)}) VALUES ({values})"
+            for level in ROLLUP_LEVELS
+        }
+        self._init_lock = threading.Lock()
+        self._ready = False
+
+    def connect(self):
+        with self._init_lock:
+            if not self._ready:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(self.path)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS runs ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, started REAL, ended REAL, "
+                    "status TEXT, samples INTEGER DEFAULT 0, cfg TEXT)"
+                )
+                cols = ", ".join(f"{c} REAL" for c in COLUMNS)
+                for table in ("samples",) + tuple(rollup_table(lv) for lv in ROLLUP_LEVELS):
+                    db.execute(f"CREATE TABLE IF NOT EXISTS {table} (run_id INTEGER, {cols})")
+                    db.execute(f"CREATE INDEX IF NOT EXISTS {table}_run_t ON {table} (run_id, time_s)")
+                db.commit()
+                db.close()
+                self._ready = True
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def start_run(self, cfg):
+        db = self.connect()
+        with db:
+            cur = db.execute(
+                "INSERT INTO runs (started, status, cfg) VALUES (?, 'running', ?)",
+                (time.time(), json.dumps(cfg)),
+            )
+        run_id = cur.lastrowid
+        db.close()
+        return RunRecorder(self, run_id)
+
+    def list_runs(self, limit=200):
+        db = self.connect()
+        try:
+            rows = db.execute(
+                "SELECT id, started, ended, status, samples, cfg FROM runs ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        finally:
+            db.close()
+        return [
+            {"id": r[0], "started": r[1], "ended": r[2], "status": r[3], "samples": r[4], "cfg": json.loads(r[5] or "null")}
+            for r in rows
+        ]
+
+    def series(self, run_id, fields, t_from=None, t_to=None, step=None, max_points=2000):
+        # Downsampled series for the requested fields. Scalars come back as
+        # lists, per-TC fields as lists of 8-element lists. With no step the
+        # bucket width is chosen so that at most max_points are returned.
+        cols = []
+        for f in fields:
+            if f in SCALAR_FIELDS or f == "pass_mask":
+                cols.append(f)
+            elif f in TC_FIELDS:
+                cols.extend(f"{f}_{tc}" for tc in range(TCS))
+            else:
+                raise ValueError(f"unknown field: {f}")
+        where = "run_id = ?"
+        args = [run_id]
+        if t_from is not None:
+            where += " AND time_s >= ?"
+            args.append(t_from)
+        if t_to is not None:
+            where += " AND time_s <= ?"
+            args.append(t_to)
+        db = self.connect()
+        try:
+            lo, hi, n = db.execute(f"SELECT MIN(time_s), MAX(time_s), COUNT(*) FROM samples WHERE {where}", args).fetchone()
+            if not n:
+                return {"run": run_id, "step": step, "t": [], "series": {f: [] for f in fields}}
+            if step is None and n > max_points and hi > lo:
+                step = (hi - lo) / max_points
+            if step:
+                table = "samples"
+                for level in ROLLUP_LEVELS:
+                    if level <= step:
+                        table = rollup_table(level)
+                agg = ", ".join(PASS_MASK_AND if c == "pass_mask" else f"AVG({c})" for c in cols)
+                rows = db.execute(
+                    f"SELECT AVG(time_s), {agg} FROM {table} WHERE {where} "
+                    f"GROUP BY CAST((time_s - ?) / ? AS INTEGER) ORDER BY 1",
+                    args + [lo, step],
+                ).fetchall()
+            else:
+                rows = db.execute(
+                    f"SELECT time_s, {', '.join(cols)} FROM samples WHERE {where} ORDER BY time_s", args
+                ).fetchall()
+        finally:
+            db.close()
+        out = {"run": run_id, "step": step, "t": [r[0] for r in rows], "series": {}}
+        i = 1
+        for f in fields:
+            if f in TC_FIELDS:
+                out["series"][f] = [list(r[i:i + TCS]) for r in rows]
+                i += TCS
+            else:
+                out["series"][f] = [r[i] for r in rows]
+                i += 1
+        return out
@@ -0,0 +1,84 @@
+import os
+import threading
+from pathlib import Path
+
+
+class AdmissionError(Exception):
+    pass
+
+
+class SessionPaths:
+    # Output files of one run session: rxcap CSV, live lines, txgen stats
+    # directory and seq dump, plus the socket binary stats records go to
+    # (next to the CSV unless given).
+    def __init__(self, csv, live, tx_stats, seq_dump, stats_sock=None):
+        self.csv = Path(csv)
+        self.live = Path(live)
+        self.tx_stats = Path(tx_stats)
+        self.seq_dump = Path(seq_dump)
+        self.stats_sock = Path(stats_sock) if stats_sock else self.csv.parent / "rx_stats.sock"
+
+    @classmethod
+    def under(cls, root):
+        root = Path(root)
+        return cls(root / "cbs_rx.csv", root / "live_packets.csv", root / "tx_stats", root / "seq_dump.bin")
+
+    def clear(self):
+        # Remove the previous run's files (txgen stats are reset by
+        # TxStatsAggregator.reset_files).
+        self.csv.parent.mkdir(parents=True, exist_ok=True)
+        for p in (self.csv, self.live, self.seq_dump):
+            if p.exists():
+                p.unlink()
+
+
+class AdmissionControl:
+    # Keeps concurrent run sessions apart: a hardware run holds its rx_cpu
+    # and tx_cpus, both NICs, its VLAN id and (with use_board) its board
+    # egress/ingress ports until it ends, and a new run that needs any of
+    # them (or a CPU this process may not use) is refused. Two runs on the
+    # same board port would rewrite each other's shapers. Simulator runs are
+    # unpinned and hold nothing.
+    def __init__(self, cpus=None):
+        self.cpus = set(cpus) if cpus is not None else set(os.sched_getaffinity(0))
+        self.held = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def needs(cfg):
+        if cfg.get("backend") == "sim":
+            return set(), set(), None, set()
+        cpus = {int(cfg["rx_cpu"]), *(int(c) for c in cfg.get("tx_cpus") or [cfg["tx_cpu"]])}
+        ports = {str(cfg["egress_port"]), str(cfg["ingress_port"])} if cfg.get("use_board", True) else set()
+        return cpus, {cfg["ingress_iface"], cfg["egress_iface"]}, cfg.get("vlan_id"), ports
+
+    def admit(self, sid, cfg):
+        # Reserves what cfg needs for sid (replacing sid's previous hold);
+        # raises AdmissionError naming the first conflict.
+        cpus, ifaces, vlan, ports = self.needs(cfg)
+        with self._lock:
+            missing = sorted(cpus - self.cpus)
+            if missing:
+                raise AdmissionError(f"cpu {missing} not available (usable: {sorted(self.cpus)})")
+            for other, (o_cpus, o_ifaces, o_vlan, o_ports) in self.held.items():
+                if other == sid:
+                    continue
+                if cpus & o_cpus:
+                    raise AdmissionError(f"cpu {sorted(cpus & o_cpus)} in use by session {other}")
+                if ifaces & o_ifaces:
+                    raise AdmissionError(f"{', '.join(sorted(ifaces & o_ifaces))} in use by session {other}")
+                if vlan is not None and vlan == o_vlan:
+                    raise AdmissionError(f"vlan {vlan} in use by session {other}")
+                if ports & o_ports:
+                    raise AdmissionError(f"board port {', '.join(sorted(ports & o_ports))} in use by session {other}")
+            self.held[sid] = (cpus, ifaces, vlan, ports)
+
+    def release(self, sid):
+        with self._lock:
+            self.held.pop(sid, None)
+
+    def stats(self):
+        with self._lock:
+            held = {sid: sorted(h[0]) for sid, h in self.held.items()}
+        used = set().union(*map(set, held.values())) if held else set()
+        return {"cpus": sorted(self.cpus), "free_cpus": sorted(self.cpus - used), "held": held}
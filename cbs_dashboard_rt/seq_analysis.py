@@ -0,0 +1,173 @@
+import struct
+from bisect import bisect_right
+
+# rxcap --seq-dump record: one run of consecutive txgen sequence numbers
+# received on a TC, little endian <u8 tc, 3 pad, u32 first_seq, u32 count>.
+# The writer keeps one open run per TC and emits it when the next packet
+# does not continue it (loss, reorder, duplicate) or at the live interval,
+# so in-order traffic costs a record per interval, not per packet.
+SEQ_RECORD = struct.Struct("<BxxxII")
+SEQ_MASK = 0xFFFFFFFF
+SEQ_HALF = 1 << 31
+
+
+class SeqRangeTracker:
+    # Sequence accounting for one TC stream. Everything below hi has been
+    # either received or is an open gap; gaps are kept as sorted, disjoint
+    # [start, end) ranges. A gap that falls more than horizon sequence
+    # numbers behind hi (or overflows max_gaps) is closed: it stays counted
+    # as lost, and a packet arriving for it later counts as a duplicate.
+    # The u32 txgen sequence numbers wrap; they are unwrapped into an
+    # unbounded counter (base, hi and the gaps) by serial number arithmetic:
+    # a number is taken as the one nearest hi, so it may be up to 2**31
+    # behind or ahead of it.
+    def __init__(self, horizon=1 << 16, max_gaps=4096):
+        self.horizon = horizon
+        self.max_gaps = max_gaps
+        self.base = None
+        self.hi = 0
+        # hi as a u32, what the next in-order record starts at. -1 never
+        # matches one, so the first record takes the slow path and sets base.
+        self.next = -1
+        self.starts = []
+        self.ends = []
+        self.pending = 0
+        self.rx = 0
+        self.reordered = 0
+        self.reorder_max = 0
+        self.dup = 0
+
+    def add(self, seq, count):
+        # seq: u32 sequence number of the first of `count` packets.
+        if seq == self.next:
+            self.hi += count
+            self.next = self.hi & SEQ_MASK
+            self.rx += count
+            return
+        if self.base is None:
+            self.base = seq
+            self.hi = seq + count
+            self.rx += count
+        else:
+            hi = self.hi
+            self._add(hi + ((seq - hi + SEQ_HALF) & SEQ_MASK) - SEQ_HALF, count)
+        self.next = self.hi & SEQ_MASK
+
+    def _add(self, seq, count):
+        # seq unwrapped; not the in-order continuation of hi.
+        end = seq + count
+        hi = self.hi
+        if seq > hi:
+            self.starts.append(hi)
+            self.ends.append(seq)
+            self.pending += seq - hi
+            self.hi = end
+            self.rx += count
+            self._close_old()
+            return
+        if end > hi:
+            self.hi = end
+            self.rx += end - hi
+            end = hi
+        if seq < self.base:
+            below = min(end, self.base)
+            self.dup += below - seq
+            seq = below
+            if seq == end:
+                return
+        filled = self._fill(seq, end)
+        self.rx += filled
+        self.dup += end - seq - filled
+        if filled:
+            self.reordered += filled
+            depth = hi - seq
+            if depth > self.reorder_max:
+                self.reorder_max = depth
+
+    def _fill(self, seq, end):
+        # Remove [seq, end) from the open gaps; returns how much was missing.
+        starts, ends = self.starts, self.ends
+        i = bisect_right(ends, seq)
+        filled = 0
+        while i < len(starts) and starts[i] < end:
+            gs, ge = starts[i], ends[i]
+            lo, hi = max(gs, seq), min(ge, end)
+            filled += hi - lo
+            if gs < lo and hi < ge:
+                ends[i] = lo
+                starts.insert(i + 1, hi)
+                ends.insert(i + 1, ge)
+                break
+            if gs < lo:
+                ends[i] = lo
+                i += 1
+            elif hi < ge:
+                starts[i] = hi
+                break
+            else:
+                del starts[i], ends[i]
+        self.pending -= filled
+        return filled
+
+    def _close_old(self):
+        # Close gaps behind the horizon; on max_gaps overflow close the
+        # oldest quarter at once so the list is not shifted per record.
+        starts, ends = self.starts, self.ends
+        floor = self.hi - self.horizon
+        if ends[0] > floor and len(starts) <= self.max_gaps:
+            return
+        n = bisect_right(ends, floor)
+        if len(starts) - n > self.max_gaps:
+            n = len(starts) - self.max_gaps + self.max_gaps // 4
+        self.pending -= sum(ends[:n]) - sum(starts[:n])
+        del starts[:n], ends[:n]
+
+    @property
+    def expected(self):
+        return 0 if self.base is None else self.hi - self.base
+
+    @property
+    def lost(self):
+        # Open and closed gaps: sequence numbers sent but never seen (yet).
+        return self.expected - self.rx
+
+
+class SeqAnalyzer:
+    # Per-TC sequence trackers fed from --seq-dump records; fields() is
+    # merged into the /events payload.
+    def __init__(self, tcs=8, horizon=1 << 16, max_gaps=4096):
+        self.tcs = [SeqRangeTracker(horizon, max_gaps) for _ in range(tcs)]
+        self.records = 0
+        self.bad_records = 0
+
+    def feed(self, data):
+        # data: bytes/memoryview holding whole SEQ_RECORD records.
+        tcs = self.tcs
+        n = len(tcs)
+        count = 0
+        for tc, seq, cnt in SEQ_RECORD.iter_unpack(data):
+            count += 1
+            if tc >= n or not cnt:
+                self.bad_records += 1
+                continue
+            t = tcs[tc]
+            # In-order fast path of SeqRangeTracker.add, inlined.
+            if seq == t.next:
+                t.hi += cnt
+                t.next = (seq + cnt) & SEQ_MASK
+                t.rx += cnt
+            else:
+                t.add(seq, cnt)
+        self.records += count
+
+    def fields(self):
+        tcs = self.tcs
+        return {
+            "seq_rx": [t.rx for t in tcs],
+            "seq_lost": [t.lost for t in tcs],
+            "seq_pending": [t.pending for t in tcs],
+            "seq_reordered": [t.reordered for t in tcs],
+            "seq_reorder_max": [t.reorder_max for t in tcs],
+            "seq_dup": [t.dup for t in tcs],
+            "seq_records": self.records,
+        }
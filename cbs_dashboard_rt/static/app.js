@@ -19,6 +19,7 @@ const pcpBreakdownCanvas = document.getElementById('pcpBreakdownChart');
 const ifaceTableEl = document.getElementById('ifaceTable').querySelector('tbody');
 const capTableEl = document.getElementById('capTable').querySelector('tbody');
 const rxBreakdownEl = document.getElementById('rxBreakdown').querySelector('tbody');
+const nicTableEl = document.getElementById('nicTable').querySelector('tbody');
 
 const fields = {
   ingress: document.getElementById('ingress'),
@@ -39,27 +40,42 @@ const fields = {
   txBatch: document.getElementById('txBatch'),
   rxCpu: document.getElementById('rxCpu'),
   txCpu: document.getElementById('txCpu'),
+  txGroup: document.getElementById('txGroup'),
   useBoard: document.getElementById('useBoard'),
+  backend: document.getElementById('backend'),
+  ingest: document.getElementById('ingest'),
+  earlyStop: document.getElementById('earlyStop'),
+  steadyWindow: document.getElementById('steadyWindow'),
   capFilter: document.getElementById('capFilter'),
   rxSeqOnly: document.getElementById('rxSeqOnly'),
+  seqDump: document.getElementById('seqDump'),
+  arrivalHist: document.getElementById('arrivalHist'),
 };
 
 const defaultIdle = [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000];
 const historyLen = 120;
 const sampleHistoryLen = 24;
-const totalHistory = { rx: [], tx: [] };
-const totalChart = { canvas: totalChartCanvas, ctx: totalChartCanvas.getContext('2d'), size: null };
-const pcpHistory = { ratio: [], pcp: [], unknown: [] };
-const pcpChart = { canvas: pcpChartCanvas, ctx: pcpChartCanvas ? pcpChartCanvas.getContext('2d') : null, size: null };
-const pcpBreakdownChart = { canvas: pcpBreakdownCanvas, ctx: pcpBreakdownCanvas ? pcpBreakdownCanvas.getContext('2d') : null, size: null };
+const capLinesMax = 40;
+const pageParams = new URLSearchParams(location.search);
+// ?offscreen=0 keeps chart drawing on the main thread (for comparison).
+const charts = new ChartHost(pageParams.get('offscreen') !== '0');
+const totalHistory = { rx: new SeriesRing(historyLen), tx: new SeriesRing(historyLen) };
+const pcpHistory = { ratio: new SeriesRing(historyLen), pcp: new SeriesRing(historyLen), unknown: new SeriesRing(historyLen) };
+// Newest-first rows of the Recent Samples table, written in place.
+const sampleRows = [];
 const tcState = Array.from({length:8}, (_, tc) => ({
   tc,
   pred: defaultIdle[tc] / 1000,
   measured: 0,
-  history: [],
-  canvas: null,
-  ctx: null,
+  history: new SeriesRing(historyLen),
+  iat: null,
 }));
+const tcTable = new CellTable(tcTableEl, 8);
+const sampleTable = new CellTable(sampleTableEl, 6);
+const ifaceTable = new CellTable(ifaceTableEl, 11);
+const nicTable = new CellTable(nicTableEl, 3);
+const rxBreakdownTable = rxBreakdownEl ? new CellTable(rxBreakdownEl, 4) : null;
+const capTable = new CellTable(capTableEl, 10);
 
 function buildIdleInputs() {
   idleInputsEl.innerHTML = '';
@@ -79,166 +95,81 @@ function buildCharts() {
   tcState.forEach((s, i) => {
     const wrap = document.createElement('div');
     wrap.className = 'chart';
-    wrap.innerHTML = `<div class="label">TC${i} Mbps</div><canvas id="chart${i}" width="640" height="220"></canvas>`;
+    wrap.innerHTML = `<div class="label">TC${i} Mbps</div><canvas id="chart${i}" width="640" height="220"></canvas>
+      <div class="label iat" hidden>TC${i} inter-arrival</div><canvas class="iat" id="iat${i}" width="640" height="180" hidden></canvas>`;
     chartsEl.appendChild(wrap);
-    s.canvas = wrap.querySelector('canvas');
-    s.ctx = s.canvas.getContext('2d');
+    charts.add(`tc${i}`, wrap.querySelector('canvas'));
+    const iat = wrap.querySelector('canvas.iat');
+    s.iat = { canvas: iat, label: wrap.querySelector('.label.iat'), text: '', shown: false };
   });
+  charts.add('total', totalChartCanvas);
+  if (pcpChartCanvas) charts.add('pcp', pcpChartCanvas);
+  if (pcpBreakdownCanvas) charts.add('pcpBreakdown', pcpBreakdownCanvas);
 }
 
-function resizeCanvas(s) {
-  const dpr = window.devicePixelRatio || 1;
-  const rect = s.canvas.getBoundingClientRect();
-  const w = Math.max(320, rect.width);
-  const h = Math.max(180, rect.height);
-  s.canvas.width = Math.floor(w * dpr);
-  s.canvas.height = Math.floor(h * dpr);
-  s.ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
-  s.size = { w, h };
-}
-
-function drawTotalChart() {
-  const s = totalChart;
-  if (!s.size) resizeCanvas(s);
-  const ctx = s.ctx;
-  const w = s.size.w;
-  const h = s.size.h;
-  const pad = 34;
-  ctx.clearRect(0, 0, w, h);
-  ctx.strokeStyle = '#242b3a';
-  ctx.lineWidth = 1;
-  for (let i = 0; i <= 4; i++) {
-    const y = pad + (h - 2*pad) * (i / 4);
-    ctx.beginPath(); ctx.moveTo(pad, y); ctx.lineTo(w - pad, y); ctx.stroke();
-  }
-  const max = Math.max(1, ...totalHistory.rx, ...totalHistory.tx);
-
-  const drawLine = (arr, color) => {
-    ctx.strokeStyle = color;
-    ctx.lineWidth = 2;
-    ctx.beginPath();
-    arr.forEach((v, i) => {
-      const x = pad + (w - 2*pad) * (i / (historyLen - 1 || 1));
-      const y = pad + (h - 2*pad) * (1 - v / max);
-      if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
-    });
-    ctx.stroke();
+function lineSpec(series, colors, unit, max, ref = null) {
+  return {
+    kind: 'line',
+    len: historyLen,
+    max,
+    unit,
+    ref,
+    series: series.map((ring, i) => ({ values: ring.toArray(), color: colors[i] })),
   };
-  drawLine(totalHistory.rx, '#6ee7b7');
-  drawLine(totalHistory.tx, '#6aa9ff');
-
-  ctx.fillStyle = '#9aa4b2';
-  ctx.font = '10px "Space Grotesk", "SF Pro Display", sans-serif';
-  ctx.fillText('Mbps', 4, 12);
-  ctx.fillText('time (s)', w / 2 - 20, h - 6);
-  for (let i = 0; i <= 4; i++) {
-    const y = pad + (h - 2*pad) * (i / 4);
-    const v = (max * (1 - i / 4)).toFixed(1);
-    ctx.fillText(v, 4, y + 3);
-  }
 }
 
-function drawLineChart(chart, series, colors, unit, maxOverride = null) {
-  if (!chart || !chart.canvas) return;
-  if (!chart.size) resizeCanvas(chart);
-  const ctx = chart.ctx;
-  const w = chart.size.w;
-  const h = chart.size.h;
-  const pad = 34;
-  ctx.clearRect(0, 0, w, h);
-  ctx.strokeStyle = '#242b3a';
-  ctx.lineWidth = 1;
-  for (let i = 0; i <= 4; i++) {
-    const y = pad + (h - 2 * pad) * (i / 4);
-    ctx.beginPath(); ctx.moveTo(pad, y); ctx.lineTo(w - pad, y); ctx.stroke();
+function drawCharts(data) {
+  const { rx, tx } = totalHistory;
+  charts.draw('total', lineSpec([rx, tx], ['#6ee7b7', '#6aa9ff'], 'Mbps', Math.max(1, rx.max(), tx.max())));
+  if (pcpChartCanvas) charts.draw('pcp', lineSpec([pcpHistory.ratio], ['#7dd3fc'], '%', 100));
+  if (pcpBreakdownCanvas) {
+    const { pcp, unknown } = pcpHistory;
+    charts.draw('pcpBreakdown', lineSpec([pcp, unknown], ['#6ee7b7', '#f472b6'], 'Mbps', Math.max(1, pcp.max(), unknown.max())));
   }
-  const flat = series.flat();
-  const max = maxOverride !== null ? maxOverride : Math.max(1, ...flat);
-  series.forEach((arr, idx) => {
-    ctx.strokeStyle = colors[idx];
-    ctx.lineWidth = 2;
-    ctx.beginPath();
-    arr.forEach((v, i) => {
-      const x = pad + (w - 2 * pad) * (i / (historyLen - 1 || 1));
-      const y = pad + (h - 2 * pad) * (1 - v / max);
-      if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
-    });
-    ctx.stroke();
+  tcState.forEach((s) => {
+    const max = Math.max(s.history.max(), s.pred, 1);
+    charts.draw(`tc${s.tc}`, lineSpec([s.history], ['#6ee7b7'], 'Mbps', max, { value: s.pred, color: '#6aa9ff' }));
+    if (data && data.iat_hist) drawIatHist(s, data);
   });
-  ctx.fillStyle = '#9aa4b2';
-  ctx.font = '10px "Space Grotesk", "SF Pro Display", sans-serif';
-  ctx.fillText(unit, 4, 12);
-  ctx.fillText('time (s)', w / 2 - 20, h - 6);
-  for (let i = 0; i <= 4; i++) {
-    const y = pad + (h - 2 * pad) * (i / 4);
-    const v = (max * (1 - i / 4)).toFixed(1);
-    ctx.fillText(v, 4, y + 3);
-  }
+  charts.flush();
 }
 
-function drawChart(s) {
-  const ctx = s.ctx;
-  if (!s.size) resizeCanvas(s);
-  const w = s.size.w;
-  const h = s.size.h;
-  const pad = 34;
-
-  ctx.clearRect(0, 0, w, h);
-  ctx.strokeStyle = '#242b3a';
-  ctx.lineWidth = 1;
-  for (let i = 0; i <= 4; i++) {
-    const y = pad + (h - 2*pad) * (i / 4);
-    ctx.beginPath(); ctx.moveTo(pad, y); ctx.lineTo(w - pad, y); ctx.stroke();
+// Inter-arrival histogram (log2 bins, log count scale) with p50/p99 and the
+// max burst vs. the CBS bound in the label.
+function drawIatHist(s, data) {
+  const h = s.iat;
+  const tc = s.tc;
+  if (!h.shown) {
+    h.shown = true;
+    h.canvas.hidden = false;
+    h.label.hidden = false;
+    charts.add(`iat${tc}`, h.canvas);
   }
-
-  const max = Math.max(...s.history, s.pred, 1);
-
-  // predicted line
-  ctx.strokeStyle = '#6aa9ff';
-  ctx.setLineDash([6, 6]);
-  ctx.beginPath();
-  const ypred = pad + (h - 2*pad) * (1 - s.pred / max);
-  ctx.moveTo(pad, ypred); ctx.lineTo(w - pad, ypred); ctx.stroke();
-  ctx.setLineDash([]);
-
-  // measured line
-  ctx.strokeStyle = '#6ee7b7';
-  ctx.lineWidth = 2;
-  ctx.beginPath();
-  s.history.forEach((v, i) => {
-    const x = pad + (w - 2*pad) * (i / (historyLen - 1 || 1));
-    const y = pad + (h - 2*pad) * (1 - v / max);
-    if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
-  });
-  ctx.stroke();
-
-  // axes labels
-  ctx.fillStyle = '#9aa4b2';
-  ctx.font = '10px "Space Grotesk", "SF Pro Display", sans-serif';
-  ctx.fillText('Mbps', 4, 12);
-  ctx.fillText('time (s)', w / 2 - 20, h - 6);
-  // y-axis ticks
-  for (let i = 0; i <= 4; i++) {
-    const y = pad + (h - 2*pad) * (i / 4);
-    const v = (max * (1 - i / 4)).toFixed(1);
-    ctx.fillText(v, 4, y + 3);
+  const bound = data.burst_bound[tc];
+  const burst = `burst ${data.burst_max[tc]}${bound ? ' / bound ' + bound : ''}`;
+  const text = `TC${tc} inter-arrival p50 ${data.iat_p50_us[tc]}us p99 ${data.iat_p99_us[tc]}us p99.9 ${data.iat_p999_us[tc]}us, ${burst}`;
+  if (h.text !== text) {
+    h.text = text;
+    h.label.textContent = text;
   }
+  h.label.style.color = data.burst_ok[tc] === false ? '#f87171' : '';
+  charts.draw(`iat${tc}`, { kind: 'hist', counts: data.iat_hist[tc], edges: data.iat_hist_edges_us });
 }
 
 function updateTable() {
-  tcTableEl.innerHTML = '';
+  tcTable.resize(8);
   tcState.forEach((s) => {
-    const tr = document.createElement('tr');
     const errMbps = (s.expected && s.expected > 0) ? (Math.abs(s.measured - s.expected) / s.expected) * 100 : 0;
-    tr.innerHTML = `
-      <td>${s.tc}</td>
-      <td>${(s.tx || 0).toFixed(2)}</td>
-      <td>${s.measured.toFixed(2)}</td>
-      <td>${s.pred.toFixed(2)}</td>
-      <td>${errMbps.toFixed(1)}%</td>
-    `;
-    tcTableEl.appendChild(tr);
-
+    tcTable.setRow(s.tc, [
+      s.tc,
+      (s.tx || 0).toFixed(2),
+      s.measured.toFixed(2),
+      s.pred.toFixed(2),
+      `${errMbps.toFixed(1)}%`,
+      s.latency == null ? '-' : s.latency.toFixed(1),
+      s.seq ? `${s.seq.lost} / ${s.seq.reordered} (${s.seq.depth}) / ${s.seq.dup}` : '-',
+      s.fine ? `${s.fine[0].toFixed(1)} - ${s.fine[1].toFixed(1)}` : '-',
+    ]);
   });
 }
 
@@ -311,13 +242,20 @@ function collectPayload(extra = {}) {
     rx_batch: parseInt(fields.rxBatch.value, 10),
     tx_batch: parseInt(fields.txBatch.value, 10),
     rx_cpu: parseInt(fields.rxCpu.value, 10),
-    tx_cpu: parseInt(fields.txCpu.value, 10),
+    tx_cpus: fields.txCpu.value,
+    tx_group_size: fields.txGroup ? (parseInt(fields.txGroup.value, 10) || 1) : 1,
     egress_port: fields.egressPort.value,
     ingress_port: fields.ingressPort.value,
     dst_ip: fields.dstip.value,
     use_board: fields.useBoard ? (fields.useBoard.value === 'true') : true,
+    backend: fields.backend ? fields.backend.value : 'hw',
+    ingest: fields.ingest ? fields.ingest.value : 'csv',
+    early_stop: fields.earlyStop ? (fields.earlyStop.value === 'true') : false,
+    steady_window_s: fields.steadyWindow ? (parseFloat(fields.steadyWindow.value) || 5) : 5,
     capture_filter: fields.capFilter ? fields.capFilter.value : 'dst',
     rx_seq_only: fields.rxSeqOnly ? (fields.rxSeqOnly.value === 'true') : true,
+    seq_dump: fields.seqDump ? (fields.seqDump.value === 'true') : false,
+    arrival_hist: fields.arrivalHist ? (fields.arrivalHist.value === 'true') : false,
     idle_slope_kbps: idle,
     ...extra
   };
@@ -379,6 +317,60 @@ startBtn.addEventListener('click', start);
 stopBtn.addEventListener('click', stop);
 applyBtn.addEventListener('click', applyCBS);
 
+const sweepTableEl = document.getElementById('sweepTable').querySelector('tbody');
+const sweepStatusEl = document.getElementById('sweepStatus');
+function addSweepRow(row) {
+  const p = row.params || {};
+  const slope = p.idle_slope_kbps || [];
+  const slopeText = slope.every((v) => v === slope[0]) ? String(slope[0] ?? '-') : slope.join('/');
+  const maxErr = Math.max(...(row.mean_err || [0]).map((e) => Math.abs(e))) * 100;
+  const tr = document.createElement('tr');
+  tr.innerHTML = `
+    <td>${row.i}</td>
+    <td>${slopeText}</td>
+    <td>${p.packet_size ?? '-'}</td>
+    <td>${p.rate_per_tc_mbps ?? '-'}</td>
+    <td><span class="status-badge ${row.verdict === 'pass' ? 'success' : 'error'}">${row.verdict.toUpperCase()}</span></td>
+    <td>${row.reason}</td>
+    <td>${row.run_s.toFixed(1)}</td>
+    <td>${maxErr.toFixed(2)}</td>
+  `;
+  sweepTableEl.appendChild(tr);
+}
+function showSweep(summary) {
+  sweepTableEl.innerHTML = '';
+  (summary.rows || []).forEach(addSweepRow);
+  sweepStatusEl.textContent = `${summary.state} ${summary.done}/${summary.points}${summary.error ? ' - ' + summary.error : ''}`;
+}
+function startSweep() {
+  let grid;
+  try {
+    grid = JSON.parse(document.getElementById('sweepGrid').value);
+  } catch (e) {
+    sweepStatusEl.textContent = 'invalid grid JSON';
+    return;
+  }
+  fetch('/sweep', {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({
+      base: collectPayload(),
+      grid,
+      window_s: parseFloat(document.getElementById('sweepWindow').value) || 5,
+    })
+  }).then((r) => r.json()).then((res) => {
+    if (res.error) {
+      sweepStatusEl.textContent = res.error;
+      return;
+    }
+    sweepTableEl.innerHTML = '';
+    sweepStatusEl.textContent = `running 0/${res.points}`;
+  });
+}
+document.getElementById('sweepStartBtn').addEventListener('click', startSweep);
+document.getElementById('sweepStopBtn').addEventListener('click', () => fetch('/sweep/stop', {method: 'POST'}));
+fetch('/sweep').then((r) => (r.ok ? r.json() : null)).then((s) => s && showSweep(s)).catch(() => {});
+
 buildIdleInputs();
 buildCharts();
 updateTable();
@@ -397,116 +389,72 @@ if (fields.vlan) {
 }
 syncPktFields('init');
 
-function resizeAllCharts() {
-  tcState.forEach((s) => {
-    if (s.canvas) resizeCanvas(s);
-  });
-  if (totalChart.canvas) resizeCanvas(totalChart);
-  if (pcpChart.canvas) resizeCanvas(pcpChart);
-  if (pcpBreakdownChart.canvas) resizeCanvas(pcpBreakdownChart);
-}
-window.addEventListener('resize', () => {
-  resizeAllCharts();
-  tcState.forEach(drawChart);
-  drawTotalChart();
-  if (pcpChart.canvas) drawLineChart(pcpChart, [pcpHistory.ratio], ['#7dd3fc'], '%', 100);
-  if (pcpBreakdownChart.canvas) drawLineChart(pcpBreakdownChart, [pcpHistory.pcp, pcpHistory.unknown], ['#6ee7b7', '#f472b6'], 'Mbps');
-});
-resizeAllCharts();
-drawTotalChart();
+window.addEventListener('resize', () => charts.resizeAll());
+drawCharts(null);
 
 fetch('/status').then(r => r.json()).then(s => setButtons(!!s.running)).catch(() => {});
-const es = new EventSource('/events');
+// ?events=delta[&max_hz=N] opts into the delta wire mode: one keyframe, then
+// only changed fields, with cap_lines sent as newly appended lines.
+const deltaMode = pageParams.get('events') === 'delta';
+// ?bench=1 (bench.html) feeds synthetic payloads through window.dashboardFeed
+// instead of /events.
+const benchMode = pageParams.has('bench');
+let deltaState = null;
 let lastIfacePayload = null;
 let lastCapLines = null;
 let lastRxBreakdown = null;
-es.onmessage = (ev) => {
-  const data = JSON.parse(ev.data);
-  if (typeof data.running === 'boolean') {
-    setButtons(data.running);
+function decodeEvent(raw) {
+  const msg = JSON.parse(raw);
+  if (!deltaMode) return msg;
+  if (msg.t === 'key') {
+    deltaState = msg.f;
+  } else if (deltaState) {
+    Object.assign(deltaState, msg.set);
+    const added = msg.append && msg.append.cap_lines;
+    if (added) deltaState.cap_lines = (deltaState.cap_lines || []).concat(added).slice(-capLinesMax);
+  } else {
+    return null;
   }
+  return { ...deltaState };
+}
+
+// Main-thread cost per event (ingest) and per frame (render), read by bench.html.
+const renderStats = { events: 0, frames: 0, ingestMs: 0, renderMs: [], chartMode: charts.mode };
+window.renderStats = renderStats;
+
+let latest = null;
+const frame = new FrameScheduler(render);
+
+// Per event: only bookkeeping (history rings, sample rows, sticky fields);
+// DOM and charts wait for the next animation frame.
+function ingest(data) {
+  const t0 = performance.now();
   const rxTotal = Number.isFinite(data.total_mbps_calc) ? data.total_mbps_calc : (Number.isFinite(data.total_mbps) ? data.total_mbps : 0);
   const txTotal = (data.tx_tc_mbps || []).reduce((a, b) => a + b, 0);
-  totalRxMbpsEl.textContent = rxTotal.toFixed(2);
-  if (totalRxCalcEl) {
-    const rxRaw = Number.isFinite(data.total_mbps) ? data.total_mbps : 0;
-    totalRxCalcEl.textContent = rxRaw.toFixed(2);
-  }
   const rxPcp = Number.isFinite(data.total_mbps_pcp) ? data.total_mbps_pcp : 0;
   const unk = Number.isFinite(data.unknown_mbps) ? data.unknown_mbps : 0;
-  if (totalRxPcpEl) {
-    totalRxPcpEl.textContent = rxPcp.toFixed(2);
-  }
-  if (rxUnknownEl) {
-    const eff = Number.isFinite(data.pkt_size_eff) ? data.pkt_size_eff : 0;
-    rxUnknownEl.textContent = `${unk.toFixed(2)} / ${eff.toFixed(1)} B`;
-  }
-  if (pcpUnknownLineEl) {
-    pcpUnknownLineEl.textContent = `${rxPcp.toFixed(2)} / ${unk.toFixed(2)}`;
-  }
   let ratio = (data.pcp_ratio_count !== undefined) ? data.pcp_ratio_count : data.pcp_ratio;
-  if (ratio === 0 && totalHistory.rx.length > 0 && totalHistory.rx[totalHistory.rx.length - 1] > 0) {
-    const last = pcpHistory.ratio[pcpHistory.ratio.length - 1];
+  if (ratio === 0 && totalHistory.rx.length > 0 && totalHistory.rx.last() > 0) {
+    const last = pcpHistory.ratio.last();
     if (last !== undefined) ratio = last / 100;
   }
-  if (pcpCoverageEl) {
-    const pcpRatio = ((ratio || 0) * 100).toFixed(1);
-    const floor = data.pps_floor ? data.pps_floor : '';
-    pcpCoverageEl.textContent = `${pcpRatio}% / ${floor}`;
-  }
-  totalTxMbpsEl.textContent = txTotal.toFixed(2);
-  if (rxTxRatioEl) {
-    const ratio = txTotal > 0 ? (rxTotal / txTotal) * 100 : 0;
-    rxTxRatioEl.textContent = `${ratio.toFixed(1)}%`;
-  }
-  totalPktsEl.textContent = `${data.total_pkts} / drops ${data.drops}`;
-  if (sumLineEl) {
-    const predSum = (data.total_pred || 0).toFixed(2);
-    const txSum = (data.total_tx || txTotal || 0).toFixed(2);
-    const rxSum = rxTotal.toFixed(2);
-    const rxTx = txTotal > 0 ? ((rxTotal / txTotal) * 100).toFixed(1) : '0.0';
-    sumLineEl.textContent = `${predSum} / ${txSum} / ${rxSum} / ${rxTx}%`;
-  }
+  data.view = { rxTotal, txTotal, rxPcp, unk, ratio };
 
   totalHistory.rx.push(rxTotal);
   totalHistory.tx.push(txTotal);
-  if (totalHistory.rx.length > historyLen) totalHistory.rx.shift();
-  if (totalHistory.tx.length > historyLen) totalHistory.tx.shift();
-  drawTotalChart();
-
   pcpHistory.ratio.push(((ratio || 0) * 100));
   pcpHistory.pcp.push(rxPcp);
   pcpHistory.unknown.push(unk);
-  if (pcpHistory.ratio.length > historyLen) pcpHistory.ratio.shift();
-  if (pcpHistory.pcp.length > historyLen) pcpHistory.pcp.shift();
-  if (pcpHistory.unknown.length > historyLen) pcpHistory.unknown.shift();
-  if (pcpChart.canvas) drawLineChart(pcpChart, [pcpHistory.ratio], ['#7dd3fc'], '%', 100);
-  if (pcpBreakdownChart.canvas) drawLineChart(pcpBreakdownChart, [pcpHistory.pcp, pcpHistory.unknown], ['#6ee7b7', '#f472b6'], 'Mbps');
-
-  const sampleRow = {
-    t: data.time_s,
-    rx: data.total_mbps,
-    tx: txTotal,
-    pps: data.total_pps,
-    pkts: data.total_pkts,
-    drops: data.drops,
-  };
-  if (!window.__sampleHistory) window.__sampleHistory = [];
-  window.__sampleHistory.push(sampleRow);
-  if (window.__sampleHistory.length > sampleHistoryLen) window.__sampleHistory.shift();
-  sampleTableEl.innerHTML = '';
-  [...window.__sampleHistory].reverse().forEach((r) => {
-    const tr = document.createElement('tr');
-    tr.innerHTML = `
-      <td>${r.t.toFixed(1)}</td>
-      <td>${r.rx.toFixed(2)}</td>
-      <td>${r.tx.toFixed(2)}</td>
-      <td>${r.pps.toFixed(0)}</td>
-      <td>${r.pkts}</td>
-      <td>${r.drops}</td>
-    `;
-    sampleTableEl.appendChild(tr);
-  });
+
+  sampleRows.unshift([
+    data.time_s.toFixed(1),
+    data.total_mbps.toFixed(2),
+    txTotal.toFixed(2),
+    data.total_pps.toFixed(0),
+    data.total_pkts,
+    data.drops,
+  ]);
+  if (sampleRows.length > sampleHistoryLen) sampleRows.length = sampleHistoryLen;
 
   if (data.iface_delta) {
     const allZero = (obj) => obj && Object.values(obj).every((v) => Number(v || 0) === 0);
@@ -514,98 +462,38 @@ es.onmessage = (ev) => {
     if (ifaceIsZero && lastIfacePayload) {
       data.iface_delta = lastIfacePayload.iface_delta;
       data.ingress_delta = lastIfacePayload.ingress_delta;
+      data.nic_delta = lastIfacePayload.nic_delta;
     } else if (!ifaceIsZero) {
-      lastIfacePayload = { iface_delta: data.iface_delta, ingress_delta: data.ingress_delta || {} };
+      lastIfacePayload = {
+        iface_delta: data.iface_delta,
+        ingress_delta: data.ingress_delta || {},
+        nic_delta: data.nic_delta || {},
+      };
     }
-    ifaceTableEl.innerHTML = '';
-    const rows = [
-      { name: 'egress', d: data.iface_delta },
-      { name: 'ingress', d: data.ingress_delta || {} },
-    ];
-    rows.forEach((r) => {
-      const d = r.d || {};
-      const tr = document.createElement('tr');
-      tr.innerHTML = `
-        <td>${r.name}</td>
-        <td>${d.rx_packets || 0}</td>
-        <td>${d.rx_bytes || 0}</td>
-        <td>${d.rx_dropped || 0}</td>
-        <td>${d.rx_errors || 0}</td>
-        <td>${d.tx_packets || 0}</td>
-        <td>${d.tx_bytes || 0}</td>
-        <td>${d.tx_dropped || 0}</td>
-        <td>${d.tx_errors || 0}</td>
-      `;
-      ifaceTableEl.appendChild(tr);
-    });
   }
 
-  if (rxBreakdownEl) {
-    const currBreakdown = {
-      vlan_pkts: data.vlan_pkts ?? 0,
-      non_vlan_pkts: data.non_vlan_pkts ?? 0,
-      seq_pkts: data.seq_pkts ?? 0,
-      embedded_pcp_pkts: data.embedded_pcp_pkts ?? 0,
-    };
-    const isZero = Object.values(currBreakdown).every((v) => Number(v || 0) === 0);
-    if (isZero && lastRxBreakdown) {
-      Object.assign(currBreakdown, lastRxBreakdown);
-    } else if (!isZero) {
-      lastRxBreakdown = { ...currBreakdown };
-    }
-    rxBreakdownEl.innerHTML = '';
-    const tr = document.createElement('tr');
-    tr.innerHTML = `
-      <td>${currBreakdown.vlan_pkts}</td>
-      <td>${currBreakdown.non_vlan_pkts}</td>
-      <td>${currBreakdown.seq_pkts}</td>
-      <td>${currBreakdown.embedded_pcp_pkts}</td>
-    `;
-    rxBreakdownEl.appendChild(tr);
+  const currBreakdown = {
+    vlan_pkts: data.vlan_pkts ?? 0,
+    non_vlan_pkts: data.non_vlan_pkts ?? 0,
+    seq_pkts: data.seq_pkts ?? 0,
+    embedded_pcp_pkts: data.embedded_pcp_pkts ?? 0,
+  };
+  const isZero = Object.values(currBreakdown).every((v) => Number(v || 0) === 0);
+  if (isZero && lastRxBreakdown) {
+    Object.assign(currBreakdown, lastRxBreakdown);
+  } else if (!isZero) {
+    lastRxBreakdown = { ...currBreakdown };
   }
+  data.rxBreakdown = currBreakdown;
 
-  if (data.cap_mode && data.cap_lines) {
-    capTableEl.innerHTML = '';
-    const lines = data.cap_lines.length ? data.cap_lines : (lastCapLines || []);
-    if (data.cap_lines.length) lastCapLines = data.cap_lines.slice();
-    const view = lines.slice().reverse();
-    view.forEach((line) => {
-      if (data.cap_mode === 'tshark' || data.cap_mode === 'rxcap') {
-        let parts = data.cap_mode === 'tshark'
-          ? line.replace(/^\"|\"$/g, '').split('","')
-          : line.split(',');
-        if (data.cap_mode === 'rxcap' && parts.length >= 6) {
-          const vlan = parseInt(parts[4], 10);
-          const pcp = parseInt(parts[5], 10);
-          const cfgVlan = parseInt(fields.vlan.value, 10) || 0;
-          if (vlan < 0 && cfgVlan > 0) parts[4] = String(cfgVlan);
-          if (pcp < 0) parts[5] = '-';
-        }
-        const tr = document.createElement('tr');
-        tr.innerHTML = `
-          <td>${parts[0] || ''}</td>
-          <td>${parts[1] || ''}</td>
-          <td>${parts[2] || ''}</td>
-          <td>${parts[3] || ''}</td>
-          <td>${parts[4] || ''}</td>
-          <td>${parts[5] || ''}</td>
-          <td>${parts[6] || ''}</td>
-          <td>${parts[7] || ''}</td>
-          <td>${parts[8] || ''}</td>
-          <td>${parts[9] || ''}</td>
-        `;
-        capTableEl.appendChild(tr);
-      } else {
-        const tr = document.createElement('tr');
-        tr.innerHTML = `
-          <td colspan="10" style="text-align:left;">${line}</td>
-        `;
-        capTableEl.appendChild(tr);
-      }
-    });
+  if (data.cap_lines) {
+    if (data.cap_lines.length) lastCapLines = data.cap_lines;
+    else data.cap_lines = lastCapLines || [];
   }
 
   const useScaled = (data.pcp_ratio !== undefined && data.pcp_ratio < 0.9);
+  // Binary ingest: per-TC RX rate range over the ~1 ms stats records.
+  const fineScale = (data.pkt_size_eff || 0) * 8 / 1e6;
   for (let tc = 0; tc < 8; tc++) {
     const s = tcState[tc];
     const raw = data.per_tc_mbps[tc] || 0;
@@ -616,9 +504,147 @@ es.onmessage = (ev) => {
     s.expected = (data.exp_mbps && data.exp_mbps[tc]) ? data.exp_mbps[tc] : s.pred;
     s.expectedPps = (data.exp_pps && data.exp_pps[tc]) ? data.exp_pps[tc] : 0;
     s.pass = data.pass[tc];
+    if (data.pred_mbps) s.pred = data.pred_mbps[tc];
+    s.latency = data.cbs_model ? data.cbs_model.latency_us[tc] : null;
+    s.seq = data.seq_rx ? {
+      lost: data.seq_lost[tc], reordered: data.seq_reordered[tc], depth: data.seq_reorder_max[tc], dup: data.seq_dup[tc],
+    } : null;
+    s.fine = data.fine_tc_pps_max
+      ? [data.fine_tc_pps_min[tc] * fineScale, data.fine_tc_pps_max[tc] * fineScale] : null;
     s.history.push(s.measured);
-    if (s.history.length > historyLen) s.history.shift();
-    drawChart(s);
   }
+
+  latest = data;
+  renderStats.events++;
+  renderStats.ingestMs += performance.now() - t0;
+  frame.request();
+}
+
+function setText(el, text) {
+  if (el && el.textContent !== text) el.textContent = text;
+}
+
+function renderIfaces(data) {
+  const rows = [
+    ['egress', data.iface_delta || {}],
+    ['ingress', data.ingress_delta || {}],
+  ];
+  ifaceTable.resize(rows.length);
+  rows.forEach(([name, d], r) => {
+    ifaceTable.setRow(r, [
+      name,
+      d.rx_packets || 0, d.rx_bytes || 0, d.rx_dropped || 0, d.rx_errors || 0,
+      d.tx_packets || 0, d.tx_bytes || 0, d.tx_dropped || 0, d.tx_errors || 0,
+      d.rx_missed_errors || 0, d.rx_fifo_errors || 0,
+    ]);
+  });
+
+  // Driver counters (ethtool -S) that changed: per queue, then the rest.
+  const nicRows = [];
+  Object.entries(data.nic_delta || {}).forEach(([name, nic]) => {
+    const groups = [
+      ...Object.entries(nic.queues || {}),
+      ['driver', nic.driver || {}],
+    ];
+    groups.forEach(([group, counters]) => {
+      const entries = Object.entries(counters);
+      if (entries.length) nicRows.push([name, group, entries.map(([k, v]) => `${k}=${v}`).join(' ')]);
+    });
+  });
+  nicTable.resize(nicRows.length);
+  nicRows.forEach((row, r) => nicTable.setRow(r, row));
+}
+
+function renderCapLines(data) {
+  const lines = data.cap_lines;
+  capTable.resize(lines.length);
+  const cfgVlan = parseInt(fields.vlan.value, 10) || 0;
+  for (let r = 0; r < lines.length; r++) {
+    const line = lines[lines.length - 1 - r];
+    if (data.cap_mode === 'tshark' || data.cap_mode === 'rxcap') {
+      const parts = data.cap_mode === 'tshark'
+        ? line.replace(/^\"|\"$/g, '').split('","')
+        : line.split(',');
+      if (data.cap_mode === 'rxcap' && parts.length >= 6) {
+        const vlan = parseInt(parts[4], 10);
+        const pcp = parseInt(parts[5], 10);
+        if (vlan < 0 && cfgVlan > 0) parts[4] = String(cfgVlan);
+        if (pcp < 0) parts[5] = '-';
+      }
+      capTable.setRow(r, parts);
+    } else {
+      capTable.setWide(r, true, line);
+    }
+  }
+}
+
+// Once per animation frame, from the newest payload only.
+function render() {
+  const data = latest;
+  if (!data) return;
+  latest = null;
+  const t0 = performance.now();
+  if (typeof data.running === 'boolean' && data.running !== isRunning) {
+    setButtons(data.running);
+  }
+  const { rxTotal, txTotal, rxPcp, unk, ratio } = data.view;
+  setText(totalRxMbpsEl, rxTotal.toFixed(2));
+  setText(totalRxCalcEl, (Number.isFinite(data.total_mbps) ? data.total_mbps : 0).toFixed(2));
+  setText(totalRxPcpEl, rxPcp.toFixed(2));
+  const eff = Number.isFinite(data.pkt_size_eff) ? data.pkt_size_eff : 0;
+  setText(rxUnknownEl, `${unk.toFixed(2)} / ${eff.toFixed(1)} B`);
+  setText(pcpUnknownLineEl, `${rxPcp.toFixed(2)} / ${unk.toFixed(2)}`);
+  setText(pcpCoverageEl, `${((ratio || 0) * 100).toFixed(1)}% / ${data.pps_floor ? data.pps_floor : ''}`);
+  setText(totalTxMbpsEl, txTotal.toFixed(2));
+  setText(rxTxRatioEl, `${(txTotal > 0 ? (rxTotal / txTotal) * 100 : 0).toFixed(1)}%`);
+  setText(totalPktsEl, `${data.total_pkts} / drops ${data.drops}`);
+  if (sumLineEl) {
+    const predSum = (data.total_pred || 0).toFixed(2);
+    const txSum = (data.total_tx || txTotal || 0).toFixed(2);
+    const rxTx = txTotal > 0 ? ((rxTotal / txTotal) * 100).toFixed(1) : '0.0';
+    setText(sumLineEl, `${predSum} / ${txSum} / ${rxTotal.toFixed(2)} / ${rxTx}%`);
+  }
+
+  sampleTable.resize(sampleRows.length);
+  sampleRows.forEach((row, r) => sampleTable.setRow(r, row));
+  if (data.iface_delta) renderIfaces(data);
+  if (rxBreakdownTable) {
+    const b = data.rxBreakdown;
+    rxBreakdownTable.resize(1);
+    rxBreakdownTable.setRow(0, [b.vlan_pkts, b.non_vlan_pkts, b.seq_pkts, b.embedded_pcp_pkts]);
+  }
+  if (data.cap_mode && data.cap_lines) renderCapLines(data);
   updateTable();
-};
+  drawCharts(data);
+
+  const ms = performance.now() - t0;
+  renderStats.workerMs = charts.workerMs;
+  renderStats.frames++;
+  renderStats.renderMs.push(ms);
+  if (renderStats.renderMs.length > 1000) renderStats.renderMs.splice(0, 500);
+}
+
+if (benchMode) {
+  window.dashboardFeed = ingest;
+} else {
+  const es = new EventSource(deltaMode ? `/events?mode=delta&max_hz=${parseFloat(pageParams.get('max_hz')) || 0}` : '/events');
+  es.addEventListener('sweep', (ev) => {
+    const msg = JSON.parse(ev.data);
+    if (msg.type === 'point') {
+      addSweepRow(msg.row);
+      sweepStatusEl.textContent = `running ${msg.row.i + 1}/${msg.points}`;
+    } else if (msg.type === 'done') {
+      showSweep(msg);
+    }
+  });
+  es.addEventListener('verdict', (ev) => {
+    const v = JSON.parse(ev.data);
+    const failed = v.per_tc.filter((tc) => !tc.pass).map((tc) => `TC${tc.tc}`);
+    const label = v.pass ? 'PASS' : `FAIL ${failed.join(',')}`;
+    setStatus(`${label} (${v.reason}, ${v.elapsed_s}s)`, v.pass ? 'ok' : 'err');
+  });
+  es.onmessage = (ev) => {
+    const data = decodeEvent(ev.data);
+    if (data) ingest(data);
+  };
+}
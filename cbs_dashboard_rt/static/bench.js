@@ -0,0 +1,166 @@
+// Dashboard frame-time benchmark (bench.html): loads the dashboard in an
+// iframe with ?bench=1, feeds synthetic /events payloads through
+// window.dashboardFeed at each rate and records the requestAnimationFrame
+// interval and the main-thread ingest/render cost, with charts drawn in the
+// worker (OffscreenCanvas) and on the main thread.
+const resultsEl = document.getElementById('results').querySelector('tbody');
+const statusEl = document.getElementById('benchStatus');
+const frameEl = document.getElementById('dash');
+
+function synthPayload(i, iat) {
+  const t = i * 0.1;
+  const perTc = Array.from({ length: 8 }, (_, tc) => (tc + 1) * (1 + 0.05 * Math.sin(t + tc)));
+  const lines = Array.from({ length: 40 }, (_, k) => {
+    const n = i * 40 + k;
+    return `${(n / 4000).toFixed(9)},512,02:00:00:00:00:0${n % 8},c8:4d:44:26:3b:a6,100,${n % 8},10.0.100.1,10.0.100.2,5005,5001`;
+  });
+  const counters = (k) => ({
+    rx_packets: 1000 + k, rx_bytes: 512000 + k, rx_dropped: 0, rx_errors: 0,
+    tx_packets: 1000 + k, tx_bytes: 512000 + k, tx_dropped: 0, tx_errors: 0,
+    rx_missed_errors: k % 3, rx_fifo_errors: 0,
+  });
+  const p = {
+    running: true,
+    time_s: t,
+    total_mbps: 36 + Math.sin(t),
+    total_mbps_calc: 36 + Math.sin(t),
+    total_mbps_pcp: 35,
+    unknown_mbps: 1,
+    pkt_size_eff: 512,
+    pps_floor: 1000,
+    total_pps: 8800,
+    drops: 0,
+    total_pkts: i * 880,
+    per_tc_mbps: perTc,
+    per_tc_mbps_scaled: perTc,
+    per_tc_pps: perTc.map((v) => v * 244),
+    tx_tc_mbps: perTc.map((v) => v * 1.1),
+    exp_mbps: perTc.map((_, tc) => tc + 1),
+    exp_pps: perTc.map((_, tc) => (tc + 1) * 244),
+    pred_mbps: perTc.map((_, tc) => tc + 1),
+    pass: perTc.map(() => true),
+    pcp_ratio: 0.97,
+    pcp_ratio_count: 0.97,
+    total_pred: 36,
+    total_tx: 39.6,
+    vlan_pkts: i * 880,
+    non_vlan_pkts: 0,
+    seq_pkts: i * 880,
+    embedded_pcp_pkts: i * 880,
+    cap_mode: 'rxcap',
+    cap_lines: lines,
+    iface_delta: counters(i),
+    ingress_delta: counters(i + 1),
+    nic_delta: { egress: { queues: { 'rx-0': { packets: 880 } }, driver: {} } },
+    cbs_model: { latency_us: perTc.map((_, tc) => 100 * (8 - tc)) },
+  };
+  if (iat) {
+    const edges = Array.from({ length: 33 }, (_, k) => 2 ** (k / 2));
+    p.iat_hist = perTc.map((_, tc) => edges.slice(1).map((_, k) => Math.round(1000 * Math.exp(-((k - 10 - tc) ** 2) / 8) + (i + k) % 5)));
+    p.iat_hist_edges_us = edges.map((e) => Math.round(e * 100) / 100);
+    p.iat_p50_us = perTc.map(() => 999);
+    p.iat_p99_us = perTc.map(() => 1998);
+    p.iat_p999_us = perTc.map(() => 2949);
+    p.burst_max = perTc.map(() => 1);
+    p.burst_bound = perTc.map(() => 1);
+    p.burst_ok = perTc.map(() => true);
+  }
+  return p;
+}
+
+function pct(values, q) {
+  if (!values.length) return 0;
+  const s = Float64Array.from(values).sort();
+  return s[Math.min(s.length - 1, Math.floor(q * s.length))];
+}
+
+function loadDashboard(offscreen) {
+  return new Promise((resolve) => {
+    frameEl.onload = () => resolve(frameEl.contentWindow);
+    frameEl.src = `index.html?bench=1&offscreen=${offscreen ? 1 : 0}`;
+  });
+}
+
+async function runRate(win, hz, seconds, iat) {
+  const stats = win.renderStats;
+  stats.events = 0;
+  stats.frames = 0;
+  stats.ingestMs = 0;
+  stats.renderMs.length = 0;
+  const intervals = [];
+  let prev = null;
+  let done = false;
+  const tick = (t) => {
+    if (prev !== null) intervals.push(t - prev);
+    prev = t;
+    if (!done) win.requestAnimationFrame(tick);
+  };
+  win.requestAnimationFrame(tick);
+  // Events are fed on schedule (catching up after timer slack) like an
+  // EventSource would deliver them.
+  let sent = 0;
+  const t0 = performance.now();
+  await new Promise((resolve) => {
+    const timer = setInterval(() => {
+      const elapsed = performance.now() - t0;
+      const due = Math.min(Math.floor(elapsed * hz / 1000), hz * seconds);
+      while (sent < due) win.dashboardFeed(synthPayload(sent++, iat));
+      if (sent >= hz * seconds) {
+        clearInterval(timer);
+        resolve();
+      }
+    }, 2);
+  });
+  done = true;
+  await new Promise((resolve) => setTimeout(resolve, 100));
+  return {
+    hz,
+    events: stats.events,
+    frames: stats.frames,
+    frameP50: pct(intervals, 0.5),
+    frameP95: pct(intervals, 0.95),
+    frameMax: intervals.length ? Math.max(...intervals) : 0,
+    janky: intervals.length ? intervals.filter((v) => v > 16.7).length / intervals.length : 0,
+    renderP50: pct(stats.renderMs, 0.5),
+    renderP95: pct(stats.renderMs, 0.95),
+    ingestUs: stats.events ? (stats.ingestMs / stats.events) * 1000 : 0,
+  };
+}
+
+function addResult(mode, r, workerMs) {
+  const tr = document.createElement('tr');
+  [
+    mode, r.hz, r.events, r.frames,
+    r.frameP50.toFixed(1), r.frameP95.toFixed(1), r.frameMax.toFixed(1),
+    `${(r.janky * 100).toFixed(1)}%`, r.renderP50.toFixed(2), r.renderP95.toFixed(2),
+    r.ingestUs.toFixed(0), mode === 'worker' ? workerMs.toFixed(2) : '-',
+  ].forEach((v) => {
+    const td = document.createElement('td');
+    td.textContent = String(v);
+    tr.appendChild(td);
+  });
+  resultsEl.appendChild(tr);
+}
+
+async function runBench() {
+  const rates = document.getElementById('rates').value.split(',').map((v) => parseFloat(v)).filter((v) => v > 0);
+  const seconds = parseFloat(document.getElementById('seconds').value) || 5;
+  const iat = document.getElementById('iat').checked;
+  const modes = document.getElementById('both').checked ? [true, false] : [true];
+  resultsEl.textContent = '';
+  const results = [];
+  for (const offscreen of modes) {
+    const win = await loadDashboard(offscreen);
+    const mode = win.renderStats.chartMode;
+    for (const hz of rates) {
+      statusEl.textContent = `${mode} ${hz} Hz...`;
+      const r = await runRate(win, hz, seconds, iat);
+      addResult(mode, r, win.renderStats.workerMs);
+      results.push({ mode, ...r });
+    }
+  }
+  statusEl.textContent = 'done';
+  window.benchResults = results;
+}
+
+document.getElementById('runBtn').addEventListener('click', runBench);
@@ -0,0 +1,27 @@
+// Draws the dashboard charts on OffscreenCanvases handed over by ChartHost
+// (render.js), so line/histogram drawing stays off the page's main thread.
+importScripts('charts.js');
+
+const surfaces = new Map();
+
+self.onmessage = (ev) => {
+  const m = ev.data;
+  if (m.type === 'canvas') {
+    surfaces.set(m.id, { canvas: m.canvas, ctx: m.canvas.getContext('2d'), w: 0, h: 0 });
+  } else if (m.type === 'resize') {
+    const s = surfaces.get(m.id);
+    if (!s) return;
+    s.canvas.width = Math.floor(m.w * m.dpr);
+    s.canvas.height = Math.floor(m.h * m.dpr);
+    s.ctx.setTransform(m.dpr, 0, 0, m.dpr, 0, 0);
+    s.w = m.w;
+    s.h = m.h;
+  } else if (m.type === 'frame') {
+    const t0 = performance.now();
+    for (const [id, spec] of m.specs) {
+      const s = surfaces.get(id);
+      if (s) drawSpec(s.ctx, s.w, s.h, spec);
+    }
+    self.postMessage({ type: 'drawn', ms: performance.now() - t0 });
+  }
+};
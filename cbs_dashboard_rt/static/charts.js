@@ -0,0 +1,84 @@
+// Chart drawing shared by the page (main-thread fallback) and
+// chart_worker.js: no DOM access, ctx is the 2D context of a canvas or
+// OffscreenCanvas already scaled to CSS pixels.
+const CHART_FONT = '10px "Space Grotesk", "SF Pro Display", sans-serif';
+const CHART_PAD = 34;
+
+function drawGrid(ctx, w, h, pad) {
+  ctx.strokeStyle = '#242b3a';
+  ctx.lineWidth = 1;
+  for (let i = 0; i <= 4; i++) {
+    const y = pad + (h - 2 * pad) * (i / 4);
+    ctx.beginPath(); ctx.moveTo(pad, y); ctx.lineTo(w - pad, y); ctx.stroke();
+  }
+}
+
+// spec: { kind: 'line', len, max, unit, ref?: { value, color },
+//         series: [{ values: Float32Array (oldest first), color }] }
+function drawLineSpec(ctx, w, h, spec) {
+  const pad = CHART_PAD;
+  const max = spec.max || 1;
+  const xStep = (w - 2 * pad) / (spec.len - 1 || 1);
+  const yScale = (h - 2 * pad) / max;
+  ctx.clearRect(0, 0, w, h);
+  drawGrid(ctx, w, h, pad);
+
+  if (spec.ref) {
+    ctx.strokeStyle = spec.ref.color;
+    ctx.setLineDash([6, 6]);
+    ctx.beginPath();
+    const y = h - pad - spec.ref.value * yScale;
+    ctx.moveTo(pad, y); ctx.lineTo(w - pad, y); ctx.stroke();
+    ctx.setLineDash([]);
+  }
+
+  ctx.lineWidth = 2;
+  spec.series.forEach(({ values, color }) => {
+    ctx.strokeStyle = color;
+    ctx.beginPath();
+    for (let i = 0; i < values.length; i++) {
+      const x = pad + xStep * i;
+      const y = h - pad - values[i] * yScale;
+      if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
+    }
+    ctx.stroke();
+  });
+
+  ctx.fillStyle = '#9aa4b2';
+  ctx.font = CHART_FONT;
+  ctx.fillText(spec.unit, 4, 12);
+  ctx.fillText('time (s)', w / 2 - 20, h - 6);
+  for (let i = 0; i <= 4; i++) {
+    const y = pad + (h - 2 * pad) * (i / 4);
+    ctx.fillText((max * (1 - i / 4)).toFixed(1), 4, y + 3);
+  }
+}
+
+// Inter-arrival histogram (log2 bins, log count scale).
+// spec: { kind: 'hist', counts, edges (us) }
+function drawHistSpec(ctx, w, h, spec) {
+  const pad = 24;
+  const counts = spec.counts;
+  const edges = spec.edges;
+  ctx.clearRect(0, 0, w, h);
+  let peak = 1;
+  for (let i = 0; i < counts.length; i++) if (counts[i] > peak) peak = counts[i];
+  const max = Math.log10(1 + peak);
+  const bw = (w - 2 * pad) / counts.length;
+  ctx.fillStyle = '#6aa9ff';
+  for (let i = 0; i < counts.length; i++) {
+    const bh = (h - 2 * pad) * (Math.log10(1 + counts[i]) / max);
+    ctx.fillRect(pad + i * bw + 1, h - pad - bh, bw - 2, bh);
+  }
+  ctx.fillStyle = '#9aa4b2';
+  ctx.font = CHART_FONT;
+  for (let i = 0; i < edges.length; i += 4) {
+    const us = edges[i];
+    ctx.fillText(us >= 1000 ? `${us / 1000}ms` : `${us}us`, pad + i * bw, h - 8);
+  }
+}
+
+function drawSpec(ctx, w, h, spec) {
+  if (spec.kind === 'hist') drawHistSpec(ctx, w, h, spec);
+  else drawLineSpec(ctx, w, h, spec);
+}
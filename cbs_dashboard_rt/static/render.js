@@ -0,0 +1,255 @@
+// Rendering layer for app.js: typed-array history rings, one
+// requestAnimationFrame per frame however many events arrive, tables whose
+// cells are built once and updated in place, and a chart host that draws
+// in a worker on OffscreenCanvas where the browser supports it.
+
+// Sample indices in a fixed circular buffer, used as a monotonic deque.
+class IndexDeque {
+  constructor(capacity) {
+    this.buf = new Float64Array(capacity + 1);
+    this.head = 0;
+    this.size = 0;
+  }
+
+  clear() {
+    this.head = 0;
+    this.size = 0;
+  }
+
+  front() {
+    return this.buf[this.head];
+  }
+
+  back() {
+    return this.buf[(this.head + this.size - 1) % this.buf.length];
+  }
+
+  popFront() {
+    this.head = (this.head + 1) % this.buf.length;
+    this.size--;
+  }
+
+  popBack() {
+    this.size--;
+  }
+
+  pushBack(i) {
+    this.buf[(this.head + this.size) % this.buf.length] = i;
+    this.size++;
+  }
+}
+
+// The last `capacity` samples of one series in a Float32Array. push() is
+// O(1) amortized and keeps the running max/min in two monotonic deques, so
+// chart scaling never spreads the whole history into Math.max.
+class SeriesRing {
+  constructor(capacity) {
+    this.capacity = capacity;
+    this.values = new Float32Array(capacity);
+    this.count = 0;
+    this.hi = new IndexDeque(capacity);
+    this.lo = new IndexDeque(capacity);
+  }
+
+  get length() {
+    return Math.min(this.count, this.capacity);
+  }
+
+  at(i) {
+    return this.values[i % this.capacity];
+  }
+
+  push(v) {
+    const i = this.count++;
+    this.values[i % this.capacity] = v;
+    const x = this.values[i % this.capacity];
+    const oldest = this.count - this.capacity;
+    const { hi, lo } = this;
+    while (hi.size && hi.front() < oldest) hi.popFront();
+    while (lo.size && lo.front() < oldest) lo.popFront();
+    while (hi.size && this.at(hi.back()) <= x) hi.popBack();
+    while (lo.size && this.at(lo.back()) >= x) lo.popBack();
+    hi.pushBack(i);
+    lo.pushBack(i);
+  }
+
+  last() {
+    return this.count ? this.at(this.count - 1) : undefined;
+  }
+
+  max(empty = 0) {
+    return this.hi.size ? this.at(this.hi.front()) : empty;
+  }
+
+  min(empty = 0) {
+    return this.lo.size ? this.at(this.lo.front()) : empty;
+  }
+
+  // Oldest-first copy (the charts get their own buffer per frame).
+  toArray() {
+    const n = this.length;
+    const out = new Float32Array(n);
+    const start = (this.count - n) % this.capacity;
+    const first = this.values.subarray(start, Math.min(this.capacity, start + n));
+    out.set(first);
+    if (first.length < n) out.set(this.values.subarray(0, n - first.length), first.length);
+    return out;
+  }
+}
+
+// Runs fn at most once per animation frame, with the frame timestamp.
+class FrameScheduler {
+  constructor(fn) {
+    this.pending = false;
+    this.run = (t) => {
+      this.pending = false;
+      fn(t);
+    };
+  }
+
+  request() {
+    if (this.pending) return;
+    this.pending = true;
+    requestAnimationFrame(this.run);
+  }
+}
+
+// A tbody of `cols` columns: rows and cells are created once (resize) and
+// set() only writes textContent when the text changed.
+class CellTable {
+  constructor(tbody, cols) {
+    this.tbody = tbody;
+    this.cols = cols;
+    this.rows = [];
+    tbody.textContent = '';
+  }
+
+  resize(n) {
+    while (this.rows.length < n) {
+      const tr = document.createElement('tr');
+      const cells = [];
+      for (let c = 0; c < this.cols; c++) {
+        const td = document.createElement('td');
+        tr.appendChild(td);
+        cells.push({ td, text: '' });
+      }
+      this.tbody.appendChild(tr);
+      this.rows.push({ tr, cells, wide: false });
+    }
+    while (this.rows.length > n) this.rows.pop().tr.remove();
+  }
+
+  set(r, c, value) {
+    const cell = this.rows[r].cells[c];
+    const text = String(value);
+    if (cell.text !== text) {
+      cell.td.textContent = text;
+      cell.text = text;
+    }
+  }
+
+  setRow(r, values) {
+    this.setWide(r, false);
+    for (let c = 0; c < this.cols; c++) this.set(r, c, values[c] ?? '');
+  }
+
+  // One left-aligned cell spanning the row (free-form capture lines).
+  setWide(r, wide, text) {
+    const row = this.rows[r];
+    if (row.wide !== wide) {
+      row.wide = wide;
+      row.cells[0].td.colSpan = wide ? this.cols : 1;
+      row.cells[0].td.style.textAlign = wide ? 'left' : '';
+      for (let c = 1; c < this.cols; c++) row.cells[c].td.hidden = wide;
+    }
+    if (wide) this.set(r, 0, text);
+  }
+}
+
+// Canvases drawn with charts.js. With a worker the canvases are transferred
+// as OffscreenCanvas and all charts of a frame go out in one message; while
+// the worker is still drawing, newer specs replace the queued ones instead
+// of piling up. Otherwise (no OffscreenCanvas, or ?offscreen=0) flush()
+// draws on the main thread.
+class ChartHost {
+  constructor(useWorker) {
+    this.surfaces = new Map();
+    this.pending = new Map();
+    this.last = new Map();
+    this.busy = false;
+    this.workerMs = 0;
+    this.worker = null;
+    if (useWorker && typeof Worker !== 'undefined' && typeof OffscreenCanvas !== 'undefined'
+        && 'transferControlToOffscreen' in HTMLCanvasElement.prototype) {
+      try {
+        this.worker = new Worker('chart_worker.js');
+        this.worker.onmessage = (ev) => {
+          this.busy = false;
+          this.workerMs = ev.data.ms;
+          this.flush();
+        };
+      } catch (e) {
+        this.worker = null;
+      }
+    }
+  }
+
+  get mode() {
+    return this.worker ? 'worker' : 'main';
+  }
+
+  add(id, canvas) {
+    const s = { canvas, ctx: null, w: 0, h: 0 };
+    if (this.worker) {
+      const off = canvas.transferControlToOffscreen();
+      this.worker.postMessage({ type: 'canvas', id, canvas: off }, [off]);
+    } else {
+      s.ctx = canvas.getContext('2d');
+    }
+    this.surfaces.set(id, s);
+    this.resize(id);
+  }
+
+  resize(id) {
+    const s = this.surfaces.get(id);
+    if (!s) return;
+    const dpr = window.devicePixelRatio || 1;
+    const rect = s.canvas.getBoundingClientRect();
+    s.w = Math.max(320, rect.width);
+    s.h = Math.max(180, rect.height);
+    if (this.worker) {
+      this.worker.postMessage({ type: 'resize', id, w: s.w, h: s.h, dpr });
+    } else {
+      s.canvas.width = Math.floor(s.w * dpr);
+      s.canvas.height = Math.floor(s.h * dpr);
+      s.ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    }
+    // A resized canvas is blank: draw its last chart again.
+    if (this.last.has(id) && !this.pending.has(id)) this.pending.set(id, this.last.get(id));
+  }
+
+  resizeAll() {
+    this.surfaces.forEach((s, id) => this.resize(id));
+    this.flush();
+  }
+
+  draw(id, spec) {
+    this.pending.set(id, spec);
+    this.last.set(id, spec);
+  }
+
+  flush() {
+    if (!this.pending.size) return;
+    if (this.worker) {
+      if (this.busy) return;
+      this.busy = true;
+      this.worker.postMessage({ type: 'frame', specs: [...this.pending] });
+    } else {
+      this.pending.forEach((spec, id) => {
+        const s = this.surfaces.get(id);
+        if (s) drawSpec(s.ctx, s.w, s.h, spec);
+      });
+    }
+    this.pending.clear();
+  }
+}
@@ -0,0 +1,132 @@
+import gzip
+import hashlib
+import os
+import threading
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import unquote
+
+# Smaller files are not worth a Content-Encoding round trip.
+GZIP_MIN_BYTES = 512
+COMPRESSIBLE = (".html", ".js", ".css", ".json", ".svg", ".txt")
+
+
+class StaticAsset:
+    def __init__(self, path, sig, body, content_type):
+        self.sig = sig
+        self.body = body
+        self.content_type = content_type
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        self.etag = f'"{digest}"'
+        self.gzip = None
+        if path.suffix in COMPRESSIBLE and len(body) >= GZIP_MIN_BYTES:
+            packed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(packed) < len(body):
+                self.gzip = packed
+                self.gzip_etag = f'"{digest}-gz"'
+
+
+def _accepts_gzip(accept_encoding):
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            q = params.strip()
+            try:
+                return not (q.startswith("q=") and float(q[2:] or 0) == 0)
+            except ValueError:
+                return True
+    return False
+
+
+def _etag_matches(if_none_match, etags):
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in etags:
+            return True
+    return False
+
+
+class StaticCache:
+    # static/ kept in memory with a content-hash ETag and a gzip variant per
+    # file. Every request stats the file (one syscall) and reloads it when
+    # its mtime or size changed, so edits show up on the next refresh while
+    # unchanged files cost a 304. Responses use Cache-Control: no-cache:
+    # browsers keep the copy but revalidate it each load.
+    def __init__(self, root, content_types):
+        self.root = Path(root).resolve()
+        self.content_types = content_types
+        self.assets = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        # Preloads every file under root (startup); returns the file count.
+        for path in self.root.rglob("*"):
+            if path.is_file():
+                self.get(str(path.relative_to(self.root)))
+        return len(self.assets)
+
+    def get(self, rel):
+        try:
+            target = (self.root / rel.lstrip("/")).resolve()
+        except (OSError, ValueError):
+            # Embedded NUL (a decoded %00) or an unresolvable path.
+            return None
+        if self.root not in target.parents:
+            return None
+        try:
+            st = os.stat(target)
+        except OSError:
+            self.assets.pop(target, None)
+            return None
+        sig = (st.st_mtime_ns, st.st_size)
+        asset = self.assets.get(target)
+        if asset is not None and asset.sig == sig:
+            return asset
+        if not target.is_file():
+            return None
+        with self._lock:
+            asset = self.assets.get(target)
+            if asset is None or asset.sig != sig:
+                ctype = self.content_types.get(target.suffix, "application/octet-stream")
+                asset = StaticAsset(target, sig, target.read_bytes(), ctype)
+                self.assets[target] = asset
+        return asset
+
+    def respond(self, path, if_none_match=None, accept_encoding=None):
+        # (status, body, headers) for GET path (the URL path, still
+        # percent-encoded); body is empty for 304/404.
+        path = unquote(path)
+        if path == "/":
+            path = "/index.html"
+        asset = self.get(path)
+        if asset is None:
+            return HTTPStatus.NOT_FOUND, b"", {"Content-Type": "text/plain"}
+        use_gzip = asset.gzip is not None and _accepts_gzip(accept_encoding)
+        etag = asset.gzip_etag if use_gzip else asset.etag
+        headers = {
+            "Content-Type": asset.content_type,
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+        }
+        if asset.gzip is not None:
+            headers["Vary"] = "Accept-Encoding"
+        if _etag_matches(if_none_match, (etag,)):
+            return HTTPStatus.NOT_MODIFIED, b"", headers
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return HTTPStatus.OK, asset.gzip, headers
+        return HTTPStatus.OK, asset.body, headers
+
+    def stats(self):
+        assets = list(self.assets.values())
+        return {
+            "files": len(assets),
+            "bytes": sum(len(a.body) for a in assets),
+            "gzip_bytes": sum(len(a.gzip) if a.gzip is not None else len(a.body) for a in assets),
+        }
@@ -0,0 +1,221 @@
+import asyncio
+import os
+import select
+import socket
+import struct
+
+# rxcap --stats-sock datagrams: DGRAM_HEADER <4s magic, u8 version, u8 kind,
+# u16 count> followed by `count` records of that kind, little endian.
+# KIND_STATS records are the rxcap CSV row as fixed-width fields (same
+# order as the CSV header); KIND_PACKETS records are one received packet
+# each <f64 t, u16 len, u8 pcp, 1 pad> (sequence numbers go through
+# --seq-dump, not here). A writer batches records
+# of one kind per datagram, at most MAX_DGRAM bytes.
+DGRAM_MAGIC = b"CBSR"
+DGRAM_VERSION = 1
+DGRAM_HEADER = struct.Struct("<4sBBH")
+KIND_STATS = 1
+KIND_PACKETS = 2
+STATS_FIELDS = (
+    "time_s", "total_pkts", "total_pps", "total_mbps", "drops",
+    *(f"pcp{tc}_pkts" for tc in range(8)),
+    "vlan_pkts", "non_vlan_pkts", "seq_pkts", "embedded_pcp_pkts",
+)
+STATS_RECORD = struct.Struct("<dQddQ8QQQQQ")
+PACKET_RECORD = struct.Struct("<dHBx")
+MAX_DGRAM = 65000
+# Float tolerance on StatsWindow boundaries (record times are f64 seconds).
+WINDOW_SLACK_S = 1e-9
+RECORD_SIZES = {KIND_STATS: STATS_RECORD.size, KIND_PACKETS: PACKET_RECORD.size}
+
+
+def pack_datagrams(kind, records):
+    # Writer side (traffic_sim, tests): records are tuples for kind's struct;
+    # returns the datagrams to send.
+    rec = STATS_RECORD if kind == KIND_STATS else PACKET_RECORD
+    per = (MAX_DGRAM - DGRAM_HEADER.size) // rec.size
+    out = []
+    for i in range(0, len(records), per):
+        chunk = records[i:i + per]
+        out.append(DGRAM_HEADER.pack(DGRAM_MAGIC, DGRAM_VERSION, kind, len(chunk))
+                   + b"".join(rec.pack(*r) for r in chunk))
+    return out
+
+
+class RecordSocket:
+    # Bound AF_UNIX datagram socket rxcap sends its records to. poll()
+    # drains whatever is queued with recv_into one reused buffer and returns
+    # the stats and packet record bytes, each a single bytearray holding
+    # whole records: one copy per datagram, nothing per field. Bind it
+    # before rxcap starts so the first records are not refused.
+    def __init__(self, path, rcvbuf=4 << 20):
+        self.path = str(path)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+        except OSError:
+            pass
+        self.sock.bind(self.path)
+        self.sock.setblocking(False)
+        # close() only unlinks the path while it is still this socket's: the
+        # next run of the session may have bound a new one there already.
+        self.ino = os.stat(self.path).st_ino
+        self.buf = bytearray(1 << 16)
+        self.view = memoryview(self.buf)
+        self.datagrams = 0
+        self.bad_datagrams = 0
+        self.stats_records = 0
+        self.packet_records = 0
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def poll(self, max_bytes=8 << 20):
+        stats = bytearray()
+        packets = bytearray()
+        view = self.view
+        hdr = DGRAM_HEADER.size
+        while len(stats) + len(packets) < max_bytes:
+            try:
+                n = self.sock.recv_into(self.buf)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break
+            self.datagrams += 1
+            if n < hdr:
+                self.bad_datagrams += 1
+                continue
+            magic, version, kind, count = DGRAM_HEADER.unpack_from(view)
+            size = RECORD_SIZES.get(kind)
+            if magic != DGRAM_MAGIC or version != DGRAM_VERSION or size is None or n < hdr + count * size:
+                self.bad_datagrams += 1
+                continue
+            body = view[hdr:hdr + count * size]
+            if kind == KIND_STATS:
+                stats += body
+                self.stats_records += count
+            else:
+                packets += body
+                self.packet_records += count
+        return stats, packets
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self.sock], [], [], timeout)
+        return bool(ready)
+
+    async def wait_async(self, timeout):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_reader(self.sock, lambda: ready.done() or ready.set_result(None))
+        try:
+            await asyncio.wait_for(ready, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(self.sock)
+
+    def close(self):
+        self.sock.close()
+        try:
+            if os.stat(self.path).st_ino == self.ino:
+                os.unlink(self.path)
+        except OSError:
+            pass
+
+    def stats(self):
+        return {
+            "datagrams": self.datagrams,
+            "bad_datagrams": self.bad_datagrams,
+            "stats_records": self.stats_records,
+            "packet_records": self.packet_records,
+        }
+
+
+class StatsWindow:
+    # Folds fine-grained (e.g. 1 ms) stats records into one row per publish
+    # interval for RxSampleProcessor. The counters are cumulative, so the
+    # window's last record carries everything the per-row deltas need; what
+    # the coarser rows would lose is the short-term rate, kept as the per-TC
+    # min/max packet rate over the record intervals inside the window
+    # (row["fine"], merged into the payload).
+    def __init__(self, interval_s=0.1, tcs=8):
+        self.interval_s = interval_s
+        self.tcs = tcs
+        self.prev = None
+        self.start = None
+        self.records = 0
+        self._reset()
+
+    def _reset(self):
+        self.pps_max = [0.0] * self.tcs
+        self.pps_min = [None] * self.tcs
+        self.dt_min = None
+        self.n = 0
+
+    def feed(self, data):
+        # data: whole STATS_RECORD records; returns the rows that closed a
+        # window, as dicts keyed like the CSV columns.
+        rows = []
+        prev = self.prev
+        tcs = self.tcs
+        pps_max, pps_min = self.pps_max, self.pps_min
+        for rec in STATS_RECORD.iter_unpack(data):
+            self.records += 1
+            t = rec[0]
+            if prev is None or self.start is None:
+                self.start = t
+                prev = rec
+                rows.append(self._row(rec))
+                continue
+            dt = t - prev[0]
+            if dt > 0:
+                for tc in range(tcs):
+                    pps = (rec[5 + tc] - prev[5 + tc]) / dt
+                    if pps > pps_max[tc]:
+                        pps_max[tc] = pps
+                    if pps_min[tc] is None or pps < pps_min[tc]:
+                        pps_min[tc] = pps
+                if self.dt_min is None or dt < self.dt_min:
+                    self.dt_min = dt
+                self.n += 1
+            prev = rec
+            # Windows are on a fixed schedule from the first record, with
+            # slack for float timestamps: a sum of 100 x 0.001 is short of
+            # 0.1, and restarting each window at t would then close it one
+            # record late every time. After a gap longer than a window the
+            # schedule restarts at t.
+            if t - self.start >= self.interval_s - WINDOW_SLACK_S:
+                self.start += self.interval_s
+                if t - self.start >= self.interval_s - WINDOW_SLACK_S:
+                    self.start = t
+                rows.append(self._row(rec))
+                self._reset()
+                pps_max, pps_min = self.pps_max, self.pps_min
+        self.prev = prev
+        return rows
+
+    def _row(self, rec):
+        row = dict(zip(STATS_FIELDS, rec))
+        if self.n:
+            row["fine"] = {
+                "fine_records": self.n,
+                "fine_interval_ms": round(self.dt_min * 1e3, 3),
+                "fine_tc_pps_max": [round(v) for v in self.pps_max],
+                "fine_tc_pps_min": [round(v or 0.0) for v in self.pps_min],
+            }
+        return row
+
+
+def feed_packets(arrivals, data):
+    # Packet records into an ArrivalAnalyzer (what it would otherwise parse
+    # out of the live lines).
+    tcs = arrivals.tcs
+    for t, _len, pcp in PACKET_RECORD.iter_unpack(data):
+        if pcp < tcs:
+            arrivals.add(pcp, t)
@@ -0,0 +1,137 @@
+from collections import deque
+
+
+class TcErrorStats:
+    # Running per-TC error statistics over /events payloads: measured vs.
+    # expected rate, relative error and the fraction of passing samples.
+    def __init__(self, tcs=8):
+        self.tcs = tcs
+        self.n = 0
+        self.sum_rx = [0.0] * tcs
+        self.sum_exp = [0.0] * tcs
+        self.sum_err = [0.0] * tcs
+        self.max_err = [0.0] * tcs
+        self.passes = [0] * tcs
+
+    def add(self, payload):
+        rx = payload.get("per_tc_mbps") or [0.0] * self.tcs
+        exp = payload.get("exp_mbps") or [0.0] * self.tcs
+        passes = payload.get("pass") or [False] * self.tcs
+        self.n += 1
+        for tc in range(self.tcs):
+            err = (rx[tc] - exp[tc]) / exp[tc] if exp[tc] > 0 else 0.0
+            self.sum_rx[tc] += rx[tc]
+            self.sum_exp[tc] += exp[tc]
+            self.sum_err[tc] += err
+            if abs(err) > abs(self.max_err[tc]):
+                self.max_err[tc] = err
+            self.passes[tc] += bool(passes[tc])
+
+    def summary(self):
+        n = self.n or 1
+        return {
+            "samples": self.n,
+            "rx_mbps": [v / n for v in self.sum_rx],
+            "exp_mbps": [v / n for v in self.sum_exp],
+            "mean_err": [v / n for v in self.sum_err],
+            "max_err": list(self.max_err),
+            "pass_frac": [v / n for v in self.passes],
+        }
+
+
+class SteadyStateDetector:
+    # Declares steady state once, over the last window_s seconds of rxcap
+    # time, every TC has either passed on every sample (rolling rate within
+    # tolerance of the expected rate) or shown a statistically stable error:
+    # the 95% confidence half-width of its mean error is within stable_eps.
+    # Consecutive samples share the rolling average, so the sample count is
+    # divided by smooth (the rolling window length) for the interval.
+    # Samples before settle_s are ignored, both for the decision and for the
+    # error statistics.
+    Z95 = 1.96
+
+    def __init__(self, window_s=5.0, settle_s=2.0, tolerance=0.1, stable_eps=None, smooth=1, tcs=8):
+        self.window_s = window_s
+        self.settle_s = settle_s
+        self.tolerance = tolerance
+        self.stable_eps = tolerance / 4 if stable_eps is None else stable_eps
+        self.smooth = max(1, int(smooth))
+        self.tcs = tcs
+        self.t0 = None
+        self.t = None
+        self.window = deque()
+        self.steady = False
+        self.reason = None
+        self.stats = TcErrorStats(tcs)
+
+    def push(self, payload):
+        t = payload.get("time_s")
+        if self.steady or t is None or (self.t is not None and t <= self.t):
+            return self.steady
+        if self.t0 is None:
+            self.t0 = t
+        self.t = t
+        if t - self.t0 < self.settle_s:
+            return self.steady
+        self.stats.add(payload)
+        rx = payload.get("per_tc_mbps") or [0.0] * self.tcs
+        exp = payload.get("exp_mbps") or [0.0] * self.tcs
+        errs = [(rx[tc] - exp[tc]) / exp[tc] if exp[tc] > 0 else 0.0 for tc in range(self.tcs)]
+        passes = list(payload.get("pass") or [False] * self.tcs)
+        window = self.window
+        window.append((t, errs, passes))
+        # The window starts at the newest sample at or before t - window_s,
+        # so it fills whatever the row spacing (0.101 s rows never land
+        # exactly window_s apart); 0.1% slack for float rxcap times.
+        full = self.window_s * 0.999
+        while len(window) > 1 and t - window[1][0] >= full:
+            window.popleft()
+        if t - window[0][0] >= full:
+            self._decide()
+        return self.steady
+
+    def window_stats(self):
+        # Per-TC mean error, 95% half-width and all-pass flag over the window.
+        n = len(self.window)
+        out = []
+        for tc in range(self.tcs):
+            errs = [w[1][tc] for w in self.window]
+            mean = sum(errs) / n if n else 0.0
+            var = sum((e - mean) ** 2 for e in errs) / (n - 1) if n > 1 else 0.0
+            n_eff = max(1.0, n / self.smooth)
+            half = self.Z95 * (var / n_eff) ** 0.5 if n > 1 else float("inf")
+            out.append({
+                "tc": tc,
+                "mean_err": mean,
+                "ci95": half,
+                "all_pass": n > 0 and all(w[2][tc] for w in self.window),
+            })
+        return out
+
+    def _decide(self):
+        tcs = self.window_stats()
+        if all(s["all_pass"] for s in tcs):
+            self.steady, self.reason = True, "within-tolerance"
+        elif all(s["all_pass"] or s["ci95"] <= self.stable_eps for s in tcs):
+            self.steady, self.reason = True, "stable-error"
+
+    def verdict(self, reason=None):
+        # Final per-TC verdict from the current window (or all samples after
+        # settle_s when the window never filled).
+        tcs = self.window_stats() if self.window else []
+        for s in tcs:
+            s["pass"] = s["all_pass"] or abs(s["mean_err"]) <= self.tolerance
+        return {
+            "reason": reason or self.reason or "ended",
+            "steady": self.steady,
+            "pass": bool(tcs) and all(s["pass"] for s in tcs),
+            "time_s": self.t,
+            "elapsed_s": round(self.elapsed_s, 2),
+            "window_s": self.window_s,
+            "tolerance": self.tolerance,
+            "per_tc": tcs,
+        }
+
+    @property
+    def elapsed_s(self):
+        return 0.0 if self.t is None else self.t - self.t0
@@ -0,0 +1,117 @@
+import csv
+import itertools
+import threading
+import time
+
+SWEEP_PARAMS = ("idle_slope_kbps", "packet_size", "rate_per_tc_mbps")
+
+
+def expand_grid(grid, tcs=8):
+    # {"packet_size": [256, 512], "idle_slope_kbps": [5000, [1000, ...]]}
+    # -> one dict per combination, in key order (last key varies fastest).
+    # A scalar idle slope applies to every TC.
+    keys = [k for k in grid if k in SWEEP_PARAMS]
+    unknown = [k for k in grid if k not in SWEEP_PARAMS]
+    if unknown:
+        raise ValueError(f"unsupported sweep parameter: {', '.join(unknown)}")
+    values = []
+    for k in keys:
+        vals = grid[k] if isinstance(grid[k], list) else [grid[k]]
+        if k == "idle_slope_kbps":
+            vals = [v if isinstance(v, list) else [v] * tcs for v in vals]
+        if not vals:
+            raise ValueError(f"empty sweep values: {k}")
+        values.append(vals)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+class Sweep:
+    # One parameter sweep: the point list, per-point detectors and the
+    # summary table. Driven by run_sweep()/run_sweep_async() in the server.
+    def __init__(self, sweep_id, base, grid, window_s=5.0, settle_s=2.0):
+        self.id = sweep_id
+        self.base = dict(base)
+        self.grid = grid
+        self.points = expand_grid(grid)
+        self.window_s = window_s
+        self.settle_s = settle_s
+        self.state = "pending"
+        self.error = None
+        self.rows = []
+        self.index = None
+        self.detector = None
+        self.point_started = None
+        self.started = time.time()
+        self.ended = None
+        self.cancel = threading.Event()
+
+    def point_data(self, i):
+        # /start body for point i; the board diff makes re-applying cheap.
+        data = dict(self.base)
+        data.update(self.points[i])
+        data["apply_first"] = True
+        # The sweep ends points itself; the run's own early stop would race it.
+        data["early_stop"] = False
+        return data
+
+    def begin_point(self, i, detector):
+        self.index = i
+        self.detector = detector
+        self.point_started = time.monotonic()
+        return self.detector
+
+    def finish_point(self, cfg, reason):
+        det = self.detector
+        stats = det.stats.summary()
+        tol = cfg["tolerance"]
+        ok = stats["samples"] > 0 and all(abs(e) <= tol for e in stats["mean_err"])
+        row = {
+            "i": self.index,
+            "params": self.points[self.index],
+            "verdict": "pass" if ok else "fail",
+            "steady": det.steady,
+            "reason": reason,
+            "criterion": det.reason,
+            "run_s": round(det.elapsed_s, 2),
+            "wall_s": round(time.monotonic() - self.point_started, 2),
+            **stats,
+        }
+        self.rows.append(row)
+        self.detector = None
+        return row
+
+    def finish(self, state, error=None):
+        self.state = state
+        self.error = error
+        self.ended = time.time()
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "state": self.state,
+            "error": self.error,
+            "points": len(self.points),
+            "done": len(self.rows),
+            "current": self.index if self.detector else None,
+            "elapsed_s": round((self.ended or time.time()) - self.started, 1),
+            "rows": self.rows,
+        }
+
+    def write_csv(self, path):
+        # Flat summary table: one line per point, per-TC columns.
+        fields = ["i", *SWEEP_PARAMS, "verdict", "steady", "reason", "criterion", "run_s", "wall_s", "samples"]
+        per_tc = ("rx_mbps", "exp_mbps", "mean_err", "max_err", "pass_frac")
+        fields += [f"{name}_{tc}" for name in per_tc for tc in range(8)]
+        with open(path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(fields)
+            for r in self.rows:
+                params = r["params"]
+                line = [r["i"]]
+                for k in SWEEP_PARAMS:
+                    v = params.get(k, self.base.get(k, ""))
+                    line.append(" ".join(str(x) for x in v) if isinstance(v, list) else v)
+                line += [r["verdict"], int(r["steady"]), r["reason"], r["criterion"] or "", r["run_s"], r["wall_s"], r["samples"]]
+                for name in per_tc:
+                    line += [round(v, 4) for v in r[name]]
+                w.writerow(line)
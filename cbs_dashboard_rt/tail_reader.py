@@ -0,0 +1,124 @@
+import os
+
+
+class CsvTailReader:
+    # Follows an append-only CSV (rxcap/txgen output) from the last offset.
+    # Only complete lines are returned; a trailing partial line is buffered
+    # until the writer finishes it. Truncation or unlink+recreate (new inode)
+    # resets the offset and the cached header.
+    def __init__(self, path, header=True, max_bytes=4 << 20):
+        self.path = str(path)
+        self.has_header = header
+        self.max_bytes = max_bytes
+        self.header = None
+        self.offset = 0
+        self.rows_read = 0
+        self._fh = None
+        self._ident = None
+        self._partial = b""
+
+    def reset(self):
+        if self._fh:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+        self._fh = None
+        self._ident = None
+        self._partial = b""
+        self.header = None
+        self.offset = 0
+        self.rows_read = 0
+
+    close = reset
+
+    @property
+    def is_open(self):
+        return self._fh is not None
+
+    def _open(self):
+        try:
+            fh = open(self.path, "rb")
+        except OSError:
+            return False
+        st = os.fstat(fh.fileno())
+        self._fh = fh
+        self._ident = (st.st_dev, st.st_ino)
+        return True
+
+    def _sync(self):
+        # Detect unlink/recreate and truncation before reading.
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            if self._fh:
+                self.reset()
+            return None
+        if self._fh is None:
+            if not self._open():
+                return None
+        elif (st.st_dev, st.st_ino) != self._ident or st.st_size < self.offset:
+            self.reset()
+            if not self._open():
+                return None
+            st = os.fstat(self._fh.fileno())
+        return st.st_size
+
+    def poll_lines(self):
+        size = self._sync()
+        if size is None or size <= self.offset:
+            return []
+        want = min(size - self.offset, self.max_bytes)
+        chunk = os.pread(self._fh.fileno(), want, self.offset)
+        if not chunk:
+            return []
+        self.offset += len(chunk)
+        data = self._partial + chunk
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            self._partial = data
+            return []
+        self._partial = data[cut + 1:]
+        lines = data[:cut].decode("utf-8", "replace").split("\n")
+        out = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if self.has_header and self.header is None:
+                self.header = line.split(",")
+                continue
+            out.append(line)
+        self.rows_read += len(out)
+        return out
+
+    def poll(self):
+        return [line.split(",") for line in self.poll_lines()]
+
+    def poll_dicts(self):
+        rows = self.poll()
+        if not rows or not self.header:
+            return []
+        header = self.header
+        return [dict(zip(header, row)) for row in rows]
+
+
+class RecordTailReader(CsvTailReader):
+    # Same follow/reset logic for an append-only file of fixed-size binary
+    # records (rxcap --seq-dump); poll_records() returns whole records only.
+    def __init__(self, path, record_size, max_bytes=4 << 20):
+        super().__init__(path, header=False, max_bytes=max_bytes - max_bytes % record_size)
+        self.record_size = record_size
+
+    def poll_records(self):
+        size = self._sync()
+        if size is None or size <= self.offset:
+            return b""
+        want = min(size - self.offset, self.max_bytes)
+        chunk = os.pread(self._fh.fileno(), want, self.offset)
+        self.offset += len(chunk)
+        data = self._partial + chunk if self._partial else chunk
+        cut = len(data) - len(data) % self.record_size
+        self._partial = data[cut:]
+        self.rows_read += cut // self.record_size
+        return memoryview(data)[:cut]
@@ -0,0 +1,112 @@
+from array import array
+
+
+class TcMetricsEngine:
+    # Per-TC rate math for one rxcap interval: Mbps/pps, rolling means over
+    # `window` samples, expected rate and pass/fail.
+    # Rolling windows are fixed array('d') rings with running sums, so each
+    # sample costs O(TCs) regardless of the window length. Sums are rebuilt
+    # from the ring periodically to keep float drift bounded.
+    # With a CbsModel the expected rate comes from the model (frame overhead,
+    # link rate, TC interaction); without one it is min(idle slope, TX).
+    RESUM_EVERY = 4096
+
+    def __init__(self, idle_slope_kbps, pkt_size, tolerance, window=5, tcs=8, model=None):
+        self.tcs = tcs
+        self.window = max(1, int(window))
+        self.pkt_size = pkt_size
+        self.tolerance = tolerance
+        self.model = model
+        if model:
+            self.pred_mbps = list(model.expected_default)
+        else:
+            self.pred_mbps = [float(idle_slope_kbps[tc]) / 1000.0 for tc in range(tcs)]
+        self.mbps_ring = array("d", bytes(8 * self.window * tcs))
+        self.pps_ring = array("d", bytes(8 * self.window * tcs))
+        self.mbps_sum = [0.0] * tcs
+        self.pps_sum = [0.0] * tcs
+        self.count = 0
+        self.slot = 0
+        self.pushes = 0
+
+    def set_pred(self, pred_mbps):
+        self.pred_mbps = [float(v) for v in pred_mbps]
+
+    def _resum(self):
+        tcs = self.tcs
+        n = self.count
+        for tc in range(tcs):
+            self.mbps_sum[tc] = sum(self.mbps_ring[i * tcs + tc] for i in range(n))
+            self.pps_sum[tc] = sum(self.pps_ring[i * tcs + tc] for i in range(n))
+
+    def push(self, dt, pcp_delta, tx_mbps):
+        # pcp_delta: per-TC packet count deltas; tx_mbps: per-TC TX rate.
+        tcs = self.tcs
+        pkt_size = self.pkt_size
+        bits = pkt_size * 8
+        denom = dt * 1_000_000
+        base = self.slot * tcs
+        if self.count < self.window:
+            self.count += 1
+        n = self.count
+        mbps_ring = self.mbps_ring
+        pps_ring = self.pps_ring
+        mbps_sum = self.mbps_sum
+        pps_sum = self.pps_sum
+        tolerance = self.tolerance
+        model_exp = self.model.expected(tx_mbps) if self.model else None
+
+        per_tc_mbps = [0.0] * tcs
+        per_tc_mbps_payload = [0.0] * tcs
+        per_tc_pps = [0.0] * tcs
+        exp_mbps = [0.0] * tcs
+        exp_pps = [0.0] * tcs
+        pass_list = [False] * tcs
+        sum_pcp_delta = 0
+        total = 0.0
+        for tc in range(tcs):
+            dp = pcp_delta[tc]
+            if dp > 0:
+                sum_pcp_delta += dp
+            if dt > 0:
+                mbps = (dp * bits) / denom
+                pps = dp / dt
+            else:
+                mbps = 0.0
+                pps = 0.0
+            i = base + tc
+            mbps_sum[tc] += mbps - mbps_ring[i]
+            pps_sum[tc] += pps - pps_ring[i]
+            mbps_ring[i] = mbps
+            pps_ring[i] = pps
+            avg = mbps_sum[tc] / n
+            per_tc_mbps[tc] = avg
+            per_tc_mbps_payload[tc] = mbps
+            per_tc_pps[tc] = pps_sum[tc] / n
+            total += avg
+            if model_exp:
+                expected = model_exp[tc]
+            else:
+                pred = self.pred_mbps[tc]
+                tx = tx_mbps[tc]
+                expected = min(pred, tx) if tx > 0 else pred
+            exp_mbps[tc] = expected
+            exp_pps[tc] = (expected * 1_000_000 / 8) / pkt_size if pkt_size > 0 else 0.0
+            diff = abs(avg - expected) / expected if expected > 0 else 0
+            pass_list[tc] = diff <= tolerance
+
+        self.slot = (self.slot + 1) % self.window
+        self.pushes += 1
+        if self.pushes % self.RESUM_EVERY == 0:
+            self._resum()
+        return {
+            "per_tc_mbps": per_tc_mbps,
+            "per_tc_mbps_payload": per_tc_mbps_payload,
+            "per_tc_pps": per_tc_pps,
+            "pred_mbps": list(self.pred_mbps),
+            "exp_mbps": exp_mbps,
+            "exp_pps": exp_pps,
+            "pass": pass_list,
+            "total_mbps_pcp": total,
+            "sum_pcp_delta": sum_pcp_delta,
+        }
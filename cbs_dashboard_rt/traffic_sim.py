@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# Software stand-in for txgen (8 per-TC streams), the LAN9662 credit-based
+# shaper and rxcap. Writes the same files the real tools do, so the server
+# can be exercised end to end without the board or raw sockets:
+#   --csv        rxcap CSV (time_s,total_pkts,...,pcp0_pkts..pcp7_pkts,...)
+#   --live-file  rxcap live packet lines (t,len,src,dst,vlan,pcp,...)
+#   --stats-dir  txgen stats per TC (time,packets,bytes,pps,mbps,errors)
+#   --seq-dump   rxcap sequence runs (seq_analysis.SEQ_RECORD)
+#   --live-all   live lines for every packet instead of sampled ones
+#   --stats-sock rxcap binary stats records (stats_ingest) every
+#                --stats-interval-ms, plus packet records with --stats-packets
+import argparse
+import signal
+import socket
+import time
+from collections import deque
+from pathlib import Path
+
+from cbs_model import WIRE_OVERHEAD_BYTES
+from seq_analysis import SEQ_RECORD
+from stats_ingest import KIND_PACKETS, KIND_STATS, pack_datagrams
+
+RX_HEADER = (
+    "time_s,total_pkts,total_pps,total_mbps,drops,"
+    + ",".join(f"pcp{tc}_pkts" for tc in range(8))
+    + ",vlan_pkts,non_vlan_pkts,seq_pkts,embedded_pcp_pkts"
+)
+TX_HEADER = "time,packets,bytes,pps,mbps,errors"
+
+
+class CbsShaperSim:
+    # Fluid per-tick model of txgen -> per-TC queue -> CBS -> strict priority
+    # egress. Packets are counted, never materialized, so the cost of a tick
+    # does not depend on the packet rate. Credit grows at idleSlope while a
+    # TC has frames queued, each frame sent costs its length plus
+    # cbs_overhead_bytes in bits (the link carries wire_overhead_bytes), and a
+    # frame may start while credit >= 0 (so credit bottoms out above -1
+    # frame). Positive credit is dropped when the queue empties. An idle
+    # slope at or above the link rate leaves the TC unshaped; one of 0 never
+    # earns credit, so that TC sends nothing (as CbsModel expects).
+    def __init__(self, rate_per_tc_mbps, idle_slope_kbps, packet_size, link_mbps=1000.0,
+                 queue_pkts=1024, tcs=8, cbs_overhead_bytes=WIRE_OVERHEAD_BYTES,
+                 wire_overhead_bytes=WIRE_OVERHEAD_BYTES):
+        self.tcs = tcs
+        self.packet_size = packet_size
+        self.frame_bits = packet_size * 8
+        self.credit_bits = (packet_size + cbs_overhead_bytes) * 8
+        self.wire_bits = (packet_size + wire_overhead_bytes) * 8
+        self.link_bps = link_mbps * 1e6
+        self.queue_pkts = queue_pkts
+        if isinstance(rate_per_tc_mbps, (int, float)):
+            rate_per_tc_mbps = [rate_per_tc_mbps] * tcs
+        self.offered_pps = [r * 1e6 / self.frame_bits for r in rate_per_tc_mbps]
+        self.idle_bps = [float(s) * 1000.0 for s in idle_slope_kbps]
+        self.credit = [0.0] * tcs
+        self.queue = [0] * tcs
+        self.carry = [0.0] * tcs
+        self.link_carry = 0.0
+        self.tx_pkts = [0] * tcs
+        self.rx_pkts = [0] * tcs
+        self.dropped = [0] * tcs
+        # Sequence tracking (enable_seq): queued [first_seq, count] ranges per
+        # TC; a tail drop leaves a hole in the numbering like a lost frame.
+        self.seq_queue = None
+        self.next_seq = [0] * tcs
+        self.seq_open = [None] * tcs
+        self.seq_runs = []
+        # Per-packet departures (enable_departures): (tc, tick start, dt, n);
+        # the n frames are spread evenly over the tick.
+        self.now = 0.0
+        self.departures = None
+
+    def enable_departures(self):
+        self.departures = []
+
+    def take_departures(self):
+        out = self.departures
+        self.departures = []
+        return out
+
+    def enable_seq(self):
+        self.seq_queue = [deque() for _ in range(self.tcs)]
+
+    def _emit_seq(self, tc, n):
+        q = self.seq_queue[tc]
+        open_run = self.seq_open[tc]
+        while n:
+            r = q[0]
+            take = min(n, r[1])
+            if open_run and open_run[0] + open_run[1] == r[0]:
+                open_run[1] += take
+            else:
+                if open_run:
+                    self.seq_runs.append((tc, open_run[0], open_run[1]))
+                open_run = [r[0], take]
+            r[0] += take
+            r[1] -= take
+            if not r[1]:
+                q.popleft()
+            n -= take
+        self.seq_open[tc] = open_run
+
+    def take_seq_runs(self):
+        # Completed runs plus the open one per TC, as (tc, first_seq, count).
+        runs = self.seq_runs
+        for tc, r in enumerate(self.seq_open):
+            if r:
+                runs.append((tc, r[0], r[1]))
+        self.seq_runs = []
+        self.seq_open = [None] * self.tcs
+        return runs
+
+    def step(self, dt):
+        frame_bits = self.credit_bits
+        wire_bits = self.wire_bits
+        link_frames = self.link_bps * dt / wire_bits + self.link_carry
+        budget = int(link_frames)
+        self.link_carry = link_frames - budget
+        queue = self.queue
+        credit = self.credit
+        # Arrivals; fractional packets carry over to the next tick.
+        for tc in range(self.tcs):
+            arr = self.offered_pps[tc] * dt + self.carry[tc]
+            n = int(arr)
+            self.carry[tc] = arr - n
+            self.tx_pkts[tc] += n
+            room = self.queue_pkts - queue[tc]
+            sent = n
+            if n > room:
+                self.dropped[tc] += n - room
+                n = room
+            queue[tc] += n
+            if self.seq_queue is not None:
+                if n:
+                    self.seq_queue[tc].append([self.next_seq[tc], n])
+                self.next_seq[tc] += sent
+        # Strict priority: TC7 first.
+        for tc in range(self.tcs - 1, -1, -1):
+            q = queue[tc]
+            idle = self.idle_bps[tc]
+            if idle >= self.link_bps:
+                # Unshaped (as CbsModel).
+                n = min(q, budget)
+            elif idle <= 0:
+                # Idle slope 0 never earns credit: the queue only drops.
+                n = 0
+            else:
+                if q:
+                    credit[tc] += idle * dt
+                elif credit[tc] < 0:
+                    credit[tc] = min(0.0, credit[tc] + idle * dt)
+                c = credit[tc]
+                n = min(q, budget, int(c // frame_bits) + 1) if c >= 0 else 0
+                credit[tc] = c - n * frame_bits
+                if q == n and credit[tc] > 0:
+                    credit[tc] = 0.0
+            queue[tc] = q - n
+            budget -= n
+            self.rx_pkts[tc] += n
+            if n and self.seq_queue is not None:
+                self._emit_seq(tc, n)
+            if n and self.departures is not None:
+                self.departures.append((tc, self.now, dt, n))
+        self.now += dt
+
+    def advance(self, seconds, tick):
+        steps = int(seconds / tick)
+        for _ in range(steps):
+            self.step(tick)
+        rest = seconds - steps * tick
+        if rest > 1e-12:
+            self.step(rest)
+
+
+class SimWriter:
+    # Emits rxcap/txgen style output for a CbsShaperSim as simulated time
+    # advances: one rxcap row per csv_interval, live lines per live_interval
+    # and one txgen stats row per second per TC; sequence runs go out with
+    # the live lines. With sock_path, stats records go to that datagram
+    # socket every sock_interval (sent in batches of ~10 ms) and, with
+    # sock_packets, one packet record per departure at the live interval.
+    def __init__(self, sim, csv_path, live_path, stats_dir, csv_interval=0.1, live_interval=0.1,
+                 vlan=100, src_ip="10.0.100.1", dst_ip="10.0.100.2", dst_mac="ff:ff:ff:ff:ff:ff",
+                 seq_path=None, live_all=False, sock_path=None, sock_interval=0.001, sock_packets=False):
+        self.sim = sim
+        self.csv_interval = csv_interval
+        self.live_interval = live_interval
+        self.vlan = vlan
+        self.src_ip = src_ip
+        self.dst_ip = dst_ip
+        self.dst_mac = dst_mac
+        self.t = 0.0
+        self.next_csv = 0.0
+        self.next_live = live_interval
+        self.next_stats = 1.0
+        self.last_rx_total = 0
+        self.last_rx_tc = [0] * sim.tcs
+        self.last_tx_tc = [0] * sim.tcs
+        self.rx = open(csv_path, "w", buffering=1) if csv_path else None
+        self.live = open(live_path, "w", buffering=1) if live_path else None
+        self.seq = open(seq_path, "wb", buffering=0) if seq_path else None
+        # live_all: one live line per packet (every departure) instead of one
+        # sampled line per TC and interval.
+        self.live_all = bool(live_all and self.live)
+        self.sock = None
+        self.sock_path = sock_path
+        self.sock_interval = sock_interval
+        self.next_sock = 0.0 if sock_path else float("inf")
+        self.sock_batch = max(1, round(0.01 / sock_interval))
+        self.sock_stats = []
+        self.sock_total = 0
+        self.sock_dropped = 0
+        if sock_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.sock.setblocking(False)
+        self.sock_packets = bool(sock_packets and self.sock)
+        if self.live_all or self.sock_packets:
+            sim.enable_departures()
+        if self.seq:
+            sim.enable_seq()
+        self.stats = []
+        if stats_dir:
+            Path(stats_dir).mkdir(parents=True, exist_ok=True)
+            for tc in range(sim.tcs):
+                fh = open(Path(stats_dir) / f"tx_stats_tc{tc}.csv", "w", buffering=1)
+                fh.write(TX_HEADER + "\n")
+                self.stats.append(fh)
+        if self.rx:
+            self.rx.write(RX_HEADER + "\n")
+
+    def next_deadline(self):
+        return min(self.next_csv, self.next_live, self.next_stats, self.next_sock)
+
+    def run_until(self, t, tick):
+        # Advance the model to simulated time t, writing every output whose
+        # deadline falls inside the span.
+        while True:
+            due = self.next_deadline()
+            if due > t:
+                break
+            self.sim.advance(due - self.t, tick)
+            self.t = due
+            if due >= self.next_csv:
+                self.write_rx(self.csv_interval)
+                self.next_csv += self.csv_interval
+            if due >= self.next_sock:
+                self.add_sock_stats()
+                self.next_sock += self.sock_interval
+            if due >= self.next_live:
+                self.write_live()
+                self.write_seq()
+                self.next_live += self.live_interval
+            if due >= self.next_stats:
+                self.write_stats(1.0)
+                self.next_stats += 1.0
+        if t > self.t:
+            self.sim.advance(t - self.t, tick)
+            self.t = t
+
+    def write_rx(self, interval):
+        if not self.rx:
+            return
+        sim = self.sim
+        total = sum(sim.rx_pkts)
+        pps = (total - self.last_rx_total) / interval if self.t > 0 else 0.0
+        self.last_rx_total = total
+        mbps = pps * sim.frame_bits / 1e6
+        pcp = ",".join(str(n) for n in sim.rx_pkts)
+        self.rx.write(f"{self.t:.3f},{total},{pps:.1f},{mbps:.3f},0,{pcp},{total},0,{total},{total}\n")
+
+    def add_sock_stats(self):
+        sim = self.sim
+        total = sum(sim.rx_pkts)
+        pps = (total - self.sock_total) / self.sock_interval if self.t > 0 else 0.0
+        self.sock_total = total
+        self.sock_stats.append((self.t, total, pps, pps * sim.frame_bits / 1e6, 0, *sim.rx_pkts, total, 0, total, total))
+        if len(self.sock_stats) >= self.sock_batch:
+            self.send(KIND_STATS, self.sock_stats)
+            self.sock_stats = []
+
+    def send(self, kind, records):
+        # A receiver that is not there (yet) or not keeping up loses the
+        # records, like rxcap would; it never stalls the simulation.
+        for dgram in pack_datagrams(kind, records):
+            try:
+                self.sock.sendto(dgram, self.sock_path)
+            except OSError:
+                self.sock_dropped += 1
+
+    def send_packets(self, departures):
+        records = []
+        size = self.sim.packet_size
+        for tc, t0, dt, n in departures:
+            step = dt / n
+            records.extend((t0 + (k + 1) * step, size, tc) for k in range(n))
+        if records:
+            self.send(KIND_PACKETS, records)
+
+    def write_live(self):
+        sim = self.sim
+        departures = sim.take_departures() if self.live_all or self.sock_packets else None
+        if self.sock_packets:
+            self.send_packets(departures)
+        if not self.live:
+            return
+        if self.live_all:
+            self.write_live_all(departures)
+            return
+        lines = []
+        for tc in range(sim.tcs):
+            if sim.rx_pkts[tc] != self.last_rx_tc[tc]:
+                lines.append(
+                    f"{self.t:.4f},{sim.packet_size},02:00:00:00:00:0{tc},{self.dst_mac},{self.vlan},{tc},"
+                    f"{self.src_ip},{self.dst_ip},{5000 + tc},5001\n"
+                )
+        self.last_rx_tc = list(sim.rx_pkts)
+        if lines:
+            self.live.write("".join(lines))
+
+    def write_live_all(self, departures):
+        sim = self.sim
+        lines = []
+        for tc, t0, dt, n in departures:
+            head = f",{sim.packet_size},02:00:00:00:00:0{tc},{self.dst_mac},{self.vlan},{tc},"
+            tail = f"{self.src_ip},{self.dst_ip},{5000 + tc},5001\n"
+            step = dt / n
+            lines.extend(f"{t0 + (k + 1) * step:.9f}{head}{tail}" for k in range(n))
+        if lines:
+            self.live.write("".join(lines))
+
+    def write_seq(self):
+        if not self.seq:
+            return
+        runs = self.sim.take_seq_runs()
+        if runs:
+            self.seq.write(b"".join(SEQ_RECORD.pack(*r) for r in runs))
+
+    def write_stats(self, interval):
+        sim = self.sim
+        for tc, fh in enumerate(self.stats):
+            pkts = sim.tx_pkts[tc]
+            pps = (pkts - self.last_tx_tc[tc]) / interval
+            mbps = pps * sim.frame_bits / 1e6
+            fh.write(f"{self.t:g},{pkts},{pkts * sim.packet_size},{pps:.0f},{mbps:.2f},0\n")
+        self.last_tx_tc = list(sim.tx_pkts)
+
+    def close(self):
+        self.write_seq()
+        if self.sock:
+            if self.sock_stats:
+                self.send(KIND_STATS, self.sock_stats)
+            self.sock.close()
+        for fh in [self.rx, self.live, self.seq, *self.stats]:
+            if fh:
+                fh.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="txgen/rxcap/CBS simulator")
+    ap.add_argument("--rate", type=float, default=60.0, help="offered Mbps per TC")
+    ap.add_argument("--idle-slope", default="5000", help="kbps, one value or 8 comma-separated")
+    ap.add_argument("-l", "--packet-size", type=int, default=512)
+    ap.add_argument("--link-mbps", type=float, default=1000.0)
+    ap.add_argument("--cbs-overhead", type=int, default=WIRE_OVERHEAD_BYTES, help="bytes charged per frame by the shaper")
+    ap.add_argument("--wire-overhead", type=int, default=WIRE_OVERHEAD_BYTES, help="FCS + preamble + IFG bytes")
+    ap.add_argument("--queue", type=int, default=1024, help="per-TC queue depth (frames)")
+    ap.add_argument("--duration", type=float, default=20.0)
+    ap.add_argument("--tick-ms", type=float, default=1.0)
+    ap.add_argument("--csv-interval-ms", type=float, default=100.0)
+    ap.add_argument("--live-rate-ms", type=float, default=100.0)
+    ap.add_argument("--csv")
+    ap.add_argument("--live-file")
+    ap.add_argument("--stats-dir")
+    ap.add_argument("--seq-dump")
+    ap.add_argument("--live-all", action="store_true", help="one live line per packet")
+    ap.add_argument("--stats-sock", help="unix datagram socket for binary stats records")
+    ap.add_argument("--stats-interval-ms", type=float, default=1.0)
+    ap.add_argument("--stats-packets", action="store_true", help="also send one record per packet")
+    ap.add_argument("--vlan", type=int, default=100)
+    ap.add_argument("--dst-ip", default="10.0.100.2")
+    ap.add_argument("--dst-mac", default="ff:ff:ff:ff:ff:ff")
+    ap.add_argument("--speed", type=float, default=1.0, help="time factor, 0 = as fast as possible")
+    args = ap.parse_args()
+
+    slopes = [float(s) for s in args.idle_slope.split(",")]
+    if len(slopes) == 1:
+        slopes *= 8
+    sim = CbsShaperSim(
+        args.rate, slopes, args.packet_size, args.link_mbps, args.queue,
+        cbs_overhead_bytes=args.cbs_overhead, wire_overhead_bytes=args.wire_overhead,
+    )
+    out = SimWriter(
+        sim, args.csv, args.live_file, args.stats_dir,
+        csv_interval=args.csv_interval_ms / 1000.0, live_interval=args.live_rate_ms / 1000.0,
+        vlan=args.vlan, dst_ip=args.dst_ip, dst_mac=args.dst_mac, seq_path=args.seq_dump,
+        live_all=args.live_all, sock_path=args.stats_sock, sock_interval=args.stats_interval_ms / 1000.0,
+        sock_packets=args.stats_packets,
+    )
+    tick = args.tick_ms / 1000.0
+    stop = []
+    signal.signal(signal.SIGINT, lambda *_: stop.append(1))
+    signal.signal(signal.SIGTERM, lambda *_: stop.append(1))
+    wall0 = time.perf_counter()
+    try:
+        while not stop and out.t < args.duration:
+            t = min(out.next_deadline(), args.duration)
+            if args.speed > 0:
+                delay = wall0 + t / args.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            out.run_until(t, tick)
+    finally:
+        out.close()
+    wall = time.perf_counter() - wall0
+    pkts = sum(sim.tx_pkts)
+    print(
+        f"simulated {out.t:.1f} s, {pkts} tx / {sum(sim.rx_pkts)} rx pkts, "
+        f"{sum(sim.dropped)} queue drops, {pkts / wall if wall > 0 else 0:.0f} pkts/s accounted"
+        + (f", {out.sock_dropped} stats datagrams undelivered" if out.sock else "")
+    )
+
+
+if __name__ == "__main__":
+    main()
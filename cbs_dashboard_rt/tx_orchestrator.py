@@ -0,0 +1,105 @@
+import os
+import time
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+
+def plan_tx_groups(tcs, cpus, group_size=1):
+    # Split the TCs into txgen processes of up to group_size TCs each and
+    # place them round-robin on cpus. Returns [(cpu, [tc, ...]), ...].
+    tcs = list(tcs)
+    cpus = [int(c) for c in cpus] or [0]
+    size = max(1, int(group_size))
+    groups = [tcs[i:i + size] for i in range(0, len(tcs), size)]
+    return [(cpus[i % len(cpus)], g) for i, g in enumerate(groups)]
+
+
+def parse_cpu_list(value):
+    # "3,4,5", "3-5", [3, 4, 5] or 3 -> [3, 4, 5]
+    if isinstance(value, (list, tuple)):
+        return [int(v) for v in value]
+    if isinstance(value, int):
+        return [value]
+    cpus = []
+    for part in str(value).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def privileged(argv):
+    # rxcap/txgen need raw sockets; the server normally already runs as root,
+    # so sudo is only prepended when it does not.
+    if os.geteuid() == 0:
+        return list(argv)
+    return ["sudo", *argv]
+
+
+def pinned_session(cpu):
+    # preexec_fn: new process group (for killpg) and CPU affinity, replacing
+    # a `taskset -c` exec per process. Affinity is inherited through sudo.
+    def setup():
+        os.setsid()
+        if cpu is not None:
+            try:
+                os.sched_setaffinity(0, {int(cpu)})
+            except OSError:
+                pass
+    return setup
+
+
+def proc_ticks(pid):
+    # utime + stime of pid and its direct children (txgen under sudo);
+    # None once pid is gone.
+    total = 0
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(p) for p in f.read().split()]
+    except OSError:
+        pass
+    for p in pids:
+        try:
+            with open(f"/proc/{p}/stat") as f:
+                fields = f.read().rpartition(")")[2].split()
+        except OSError:
+            if p == pid:
+                return None
+            continue
+        total += int(fields[11]) + int(fields[12])
+    return total
+
+
+class ProcCpuMonitor:
+    # Per-process CPU use of the running txgen/rxcap processes, as a percent
+    # of one core averaged since the previous sample() call.
+    def __init__(self):
+        self.procs = []
+        self._last = {}
+
+    def track(self, role, pid, cpu=None, tcs=None):
+        self.procs.append({"role": role, "pid": pid, "cpu": cpu, "tcs": tcs})
+        self._last[pid] = (time.monotonic(), proc_ticks(pid) or 0)
+
+    def clear(self):
+        self.procs = []
+        self._last = {}
+
+    def sample(self):
+        now = time.monotonic()
+        out = []
+        for p in self.procs:
+            pid = p["pid"]
+            ticks = proc_ticks(pid)
+            t0, ticks0 = self._last.get(pid, (now, ticks or 0))
+            alive = ticks is not None
+            if alive:
+                self._last[pid] = (now, ticks)
+            else:
+                ticks = ticks0
+            pct = 100.0 * (ticks - ticks0) / CLK_TCK / (now - t0) if alive and now > t0 else 0.0
+            out.append({**p, "alive": alive, "cpu_pct": round(pct, 1), "cpu_s": round(ticks / CLK_TCK, 2)})
+        return out
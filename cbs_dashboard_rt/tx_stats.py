@@ -0,0 +1,107 @@
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from tail_reader import CsvTailReader
+
+# txgen --stats-file columns: time,packets,bytes,pps,mbps,errors
+TX_TIME_COL = 0
+TX_MBPS_COL = 4
+
+
+class TxStatsAggregator:
+    # Tails the per-TC txgen stats files and keeps every row as a running
+    # integral of megabits over txgen time, so the TX rate can be averaged
+    # exactly over any rxcap interval. Owns the files' lifecycle: reset_files()
+    # removes the previous run's output before txgen is started.
+    def __init__(self, stats_dir, tcs=8):
+        self.dir = Path(stats_dir)
+        self.tcs = tcs
+        self.readers = [CsvTailReader(self.path(tc)) for tc in range(tcs)]
+        self.alt_readers = [CsvTailReader(self.alt_path(tc)) for tc in range(tcs)]
+        self._clear()
+
+    def _clear(self):
+        self.times = [array("d") for _ in range(self.tcs)]
+        self.cum_mbit = [array("d") for _ in range(self.tcs)]
+        self.last_mbps = [0.0] * self.tcs
+
+    def path(self, tc):
+        return self.dir / f"tx_stats_tc{tc}.csv"
+
+    def alt_path(self, tc):
+        return self.dir / f"tx_stats.csv.tc{tc}"
+
+    def paths(self):
+        out = []
+        for tc in range(self.tcs):
+            out.append(self.path(tc))
+            out.append(self.alt_path(tc))
+        return out
+
+    def reset_files(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        for p in self.paths():
+            if p.exists():
+                p.unlink()
+        self.close()
+        self._clear()
+
+    def close(self):
+        for r in self.readers + self.alt_readers:
+            r.close()
+
+    def poll(self):
+        # Parse rows appended since the last call; returns how many were added.
+        added = 0
+        for tc in range(self.tcs):
+            rows = self.readers[tc].poll()
+            if not rows and not self.readers[tc].is_open:
+                rows = self.alt_readers[tc].poll()
+            for row in rows:
+                added += self._add(tc, row)
+        return added
+
+    def _add(self, tc, row):
+        try:
+            t = float(row[TX_TIME_COL])
+            mbps = float(row[TX_MBPS_COL])
+        except (IndexError, ValueError):
+            return 0
+        times = self.times[tc]
+        cum = self.cum_mbit[tc]
+        prev_t = times[-1] if times else 0.0
+        if t <= prev_t and times:
+            return 0
+        prev_c = cum[-1] if cum else 0.0
+        # Each row reports the rate over (prev_t, t].
+        times.append(t)
+        cum.append(prev_c + mbps * (t - prev_t))
+        self.last_mbps[tc] = mbps
+        return 1
+
+    def rows(self, tc):
+        return len(self.times[tc])
+
+    def mbit_at(self, tc, t):
+        times = self.times[tc]
+        cum = self.cum_mbit[tc]
+        if not times:
+            return 0.0
+        if t >= times[-1]:
+            return cum[-1] + self.last_mbps[tc] * (t - times[-1])
+        i = bisect_left(times, t)
+        t0 = times[i - 1] if i > 0 else 0.0
+        c0 = cum[i - 1] if i > 0 else 0.0
+        span = times[i] - t0
+        if span <= 0:
+            return cum[i]
+        return c0 + (cum[i] - c0) * (max(t, t0) - t0) / span
+
+    def mean_mbps(self, tc, t0, t1):
+        # Time-weighted TX rate over [t0, t1]; the latest rate for an empty span.
+        if not self.times[tc]:
+            return 0.0
+        if t1 <= t0:
+            return self.last_mbps[tc]
+        return (self.mbit_at(tc, t1) - self.mbit_at(tc, t0)) / (t1 - t0)
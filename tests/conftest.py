@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The server modules are flat siblings imported by name (as the server and
+# bench/ scripts do).
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "cbs_dashboard_rt"))
@@ -0,0 +1,78 @@
+import pytest
+
+from arrival_hist import ArrivalAnalyzer
+from cbs_model import cbs_model
+
+CFG = {
+    "idle_slope_kbps": [10_000, 20_000, 30_000, 40_000, 50_000, 60_000, 70_000, 80_000],
+    "packet_size": 512,
+    "rate_per_tc_mbps": 200,
+    "link_mbps": 1000.0,
+}
+# TC6 sits under a 300 Mbps TC7, so its hiCredit allows back-to-back frames.
+BURST_CFG = {**CFG, "idle_slope_kbps": [5_000] * 5 + [100_000, 300_000, 300_000]}
+# Relative bucket error of LogLinearHistogram(sub_bits=5).
+HIST_ERR = 1 / 16
+
+
+def analyzer(model):
+    return ArrivalAnalyzer(model.burst_frames, CFG["packet_size"], CFG["link_mbps"])
+
+
+def test_saturated_shaper_spacing():
+    # A saturated TC leaves the shaper one frame per credit_bits / idleSlope.
+    model = cbs_model(CFG)
+    a = analyzer(model)
+    for tc in range(8):
+        gap = model.credit_bits / model.idle_bps[tc]
+        for k in range(2000):
+            a.add(tc, 1.0 + k * gap)
+    f = a.fields()
+    for tc in range(8):
+        gap_us = model.credit_bits / model.idle_bps[tc] * 1e6
+        assert f["iat_p50_us"][tc] == pytest.approx(gap_us, rel=HIST_ERR)
+        assert f["iat_p99_us"][tc] == pytest.approx(gap_us, rel=HIST_ERR)
+        assert f["burst_max"][tc] == 1
+        assert f["burst_ok"][tc] is True
+
+
+def test_bursts_up_to_hicredit():
+    # After an idle spell a TC may send burst_frames frames back to back
+    # (wire time apart), then settles to the idle slope spacing.
+    model = cbs_model(BURST_CFG)
+    a = analyzer(model)
+    wire = model.wire_bits / model.link_bps
+    tc = 6
+    n = model.burst_frames[tc]
+    assert n > 1
+    t = 0.0
+    for _ in range(50):
+        for _ in range(n):
+            a.add(tc, t)
+            t += wire
+        t += 0.01
+    f = a.fields()
+    assert f["burst_max"][tc] == n
+    assert f["burst_ok"][tc] is True
+    assert f["iat_p50_us"][tc] == pytest.approx(wire * 1e6, rel=HIST_ERR)
+
+    # One frame more than hiCredit allows is flagged.
+    for _ in range(n + 1):
+        a.add(tc, t)
+        t += wire
+    f = a.fields()
+    assert f["burst_max"][tc] == n + 1
+    assert f["burst_ok"][tc] is False
+
+
+def test_sampled_live_lines_are_not_cbs_spacing():
+    # What rxcap's sampled live lines (one per TC per live_rate_ms) give:
+    # the sample period, whatever the shaper does. The server refuses that
+    # source (test_server_cfg.py).
+    model = cbs_model(CFG)
+    a = analyzer(model)
+    lines = [f"{k * 0.1:.4f},512,src,dst,100,0,a,b,1,2" for k in range(100)]
+    a.feed_lines(lines)
+    gap_us = model.credit_bits / model.idle_bps[0] * 1e6
+    assert a.fields()["iat_p50_us"][0] == pytest.approx(100_000, rel=HIST_ERR)
+    assert a.fields()["iat_p50_us"][0] > 100 * gap_us
@@ -0,0 +1,31 @@
+from board_config import BoardConfigManager, render_patch
+
+CFG = {
+    "vlan_id": 100, "egress_port": 1, "ingress_port": 2,
+    "idle_slope_kbps": [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000],
+}
+
+
+def applied(tmp_path, cfg=CFG):
+    board = BoardConfigManager(tmp_path)
+    changes, _ = board.plan(cfg)
+    board.commit(changes)
+    return board
+
+
+def test_one_tc_change_resends_port_shaper_list(tmp_path):
+    board = applied(tmp_path)
+    slopes = list(CFG["idle_slope_kbps"])
+    slopes[3] = 4500
+    changes, path = board.plan({**CFG, "idle_slope_kbps": slopes})
+    assert set(changes) == {("cbs", 1, tc) for tc in range(8)}
+    patch = render_patch(changes)
+    assert patch.count("traffic-class:") == 8
+    assert "idle-slope: 4500" in patch
+    assert "pcp-decoding" not in patch
+
+
+def test_unchanged_cfg_sends_nothing(tmp_path):
+    board = applied(tmp_path)
+    assert board.plan(dict(CFG)) is None
+    assert board.skipped == 1
@@ -0,0 +1,36 @@
+import pytest
+
+from cbs_model import CbsModel
+from traffic_sim import CbsShaperSim
+
+SLOPES = [0, 10_000, 20_000, 0, 40_000, 50_000, 60_000, 70_000]
+OFFERED = [60.0] * 8
+
+
+def test_idle_slope_zero_expects_nothing():
+    model = CbsModel(SLOPES, 512, offered_mbps=OFFERED)
+    exp = model.expected(OFFERED)
+    assert exp[0] == exp[3] == 0.0
+    assert model.cap_mbps[0] == 0.0
+    assert model.burst_frames[0] is None and model.latency_us[3] is None
+    # A disabled TC takes nothing from the TCs below it.
+    assert exp[2] == pytest.approx(20.0 * 512 / 536)
+    assert model.burst_frames[2] is not None
+
+
+def test_idle_slope_at_link_rate_is_unshaped():
+    model = CbsModel([1_000_000] * 8, 512, offered_mbps=[60.0] * 8)
+    assert not any(model.shaped)
+    assert model.expected([60.0] * 8) == [60.0] * 8
+    assert model.burst_frames == [None] * 8
+
+
+def test_sim_sends_nothing_on_idle_slope_zero():
+    sim = CbsShaperSim(OFFERED, SLOPES, 512)
+    sim.advance(1.0, 0.001)
+    model = CbsModel(SLOPES, 512, offered_mbps=OFFERED)
+    exp = model.expected(OFFERED)
+    rx_mbps = [n * 512 * 8 / 1e6 for n in sim.rx_pkts]
+    assert rx_mbps[0] == rx_mbps[3] == 0
+    for tc in (1, 2, 4, 5, 6, 7):
+        assert rx_mbps[tc] == pytest.approx(exp[tc], rel=0.02)
@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+
+import cbs_rt_server as core
+from run_history import RunHistory
+
+
+def payload(t, passes):
+    return {"time_s": t, "total_mbps": 80.0, "per_tc_mbps": [10.0] * 8, "pass": passes}
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    hist = RunHistory(tmp_path / "runs.sqlite")
+    monkeypatch.setattr(core, "history", hist)
+    return hist
+
+
+def record(history, payloads):
+    rec = history.start_run({})
+    for p in payloads:
+        rec.add(p)
+    rec.close()
+    return rec.run_id
+
+
+def test_bucket_pass_mask_is_bitwise_and(history):
+    ok = [True] * 8
+    # TC0 fails in one row, TC1 in the other: MIN(mask) would keep one.
+    run = record(history, [
+        payload(0.1 * k, [k % 2 == 1, k % 2 == 0] + ok[2:]) for k in range(20)
+    ])
+    masks = history.series(run, ["pass_mask"], step=0.5)["series"]["pass_mask"]
+    assert masks == [0b11111100] * 4
+    raw = history.series(run, ["pass_mask"])["series"]["pass_mask"]
+    assert {int(m) for m in raw} == {0b11111101, 0b11111110}
+
+
+def test_series_rejects_bad_max_points(history):
+    run = record(history, [payload(0.1 * k, [True] * 8) for k in range(5)])
+    for query in ("max_points=0", "max_points=-5", "step=-1", "max_points=x"):
+        status, body = core.runs_request(f"/runs/{run}/series", query)
+        assert status == HTTPStatus.BAD_REQUEST
+        assert "error" in body
+    status, body = core.runs_request(f"/runs/{run}/series", "max_points=2&fields=pass_mask")
+    assert status == HTTPStatus.OK
+    assert len(body["t"]) <= 3
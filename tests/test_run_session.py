@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from run_session import AdmissionControl, AdmissionError
+
+HW = {
+    "backend": "hw", "rx_cpu": 2, "tx_cpus": [3], "tx_cpu": 3, "vlan_id": 100,
+    "ingress_iface": "eth0", "egress_iface": "eth1", "egress_port": "1", "ingress_port": "2",
+    "use_board": True,
+}
+
+
+def other(**kw):
+    # A second hardware run on its own CPUs, NICs and VLAN.
+    return {**HW, "rx_cpu": 4, "tx_cpus": [5], "tx_cpu": 5, "vlan_id": 200,
+            "ingress_iface": "eth2", "egress_iface": "eth3", **kw}
+
+
+def test_board_ports_are_exclusive():
+    adm = AdmissionControl(cpus=range(8))
+    adm.admit("a", HW)
+    with pytest.raises(AdmissionError, match="board port 1, 2"):
+        adm.admit("b", other())
+    with pytest.raises(AdmissionError, match="board port 2"):
+        adm.admit("b", other(egress_port="3"))
+    adm.admit("b", other(egress_port="3", ingress_port="4"))
+    adm.release("a")
+    adm.admit("c", other(rx_cpu=2, tx_cpus=[6], tx_cpu=6, vlan_id=300, ingress_iface="eth4", egress_iface="eth5"))
+
+
+def test_direct_and_sim_runs_hold_no_ports():
+    adm = AdmissionControl(cpus=range(8))
+    adm.admit("a", HW)
+    adm.admit("b", other(use_board=False))
+    adm.admit("c", {**HW, "backend": "sim"})
+    assert adm.stats()["held"] == {"a": [2, 3], "b": [4, 5], "c": []}
+
+
+def test_sessions_registry_under_concurrent_handlers():
+    import cbs_rt_server as core
+
+    errors = []
+
+    def churn():
+        try:
+            for _ in range(200):
+                cfg, sess = core.open_session({"backend": "sim"})
+                core.register_session(sess)
+                core.session_route(f"/runs/{sess['sid']}/events")
+                [s["sid"] for s in core.session_list()]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=churn) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(core.session_list()) <= core.SESSIONS_KEPT + 4
@@ -0,0 +1,63 @@
+import cbs_rt_server as core
+from iface_stats import IFACE_COUNTERS
+from tx_stats import TxStatsAggregator
+
+
+class CountingSampler:
+    # Stands in for IfaceSampler: every sample() reports the packets received
+    # since the previous one, here a fixed amount per call.
+    def __init__(self, ifaces, rx_packets=1000):
+        self.ifaces = ifaces
+        self.rx_packets = rx_packets
+        self.samples = 0
+
+    def sample(self):
+        self.samples += 1
+        stats = {iface: dict.fromkeys(IFACE_COUNTERS, 0) for iface in self.ifaces}
+        for iface in self.ifaces:
+            stats[iface]["rx_packets"] = self.rx_packets
+        return 0.1, stats, {}
+
+    def close(self):
+        pass
+
+
+def rows(n, start=30):
+    out = []
+    for i in range(start, start + n):
+        pkts = i * 800
+        row = {"time_s": i * 0.1, "total_pkts": pkts, "total_pps": 8000.0, "total_mbps": 57.344, "drops": 0}
+        row.update({f"pcp{tc}_pkts": i * 100 for tc in range(8)})
+        out.append(row)
+    return out
+
+
+def processor(tmp_path):
+    cfg = core.run_cfg({"backend": "sim"})
+    sess = core.new_session("t", core.SessionPaths.under(tmp_path))
+    proc = core.RxSampleProcessor(cfg, tx_stats=TxStatsAggregator(tmp_path / "tx"), read_ifaces=False, sess=sess)
+    proc.ifaces = CountingSampler([cfg["egress_iface"], cfg["ingress_iface"]])
+    return cfg, proc
+
+
+def test_catch_up_batch_samples_ifaces_once(tmp_path):
+    cfg, proc = processor(tmp_path)
+    proc.process(rows(1, start=29)[0])
+    payloads = core.process_rows(proc, rows(20), None, None)
+    assert len(payloads) == 20
+    assert proc.ifaces.samples == 1
+    # The batch's one delta is on its last row, not its first.
+    assert payloads[-1]["iface_delta"]["rx_packets"] == 1000
+    assert all(p["iface_delta"]["rx_packets"] == 0 for p in payloads[:-1])
+    assert payloads[-1]["iface_dt_s"] == 0.1
+    proc.close()
+
+
+def test_one_row_per_poll_samples_every_row(tmp_path):
+    cfg, proc = processor(tmp_path)
+    proc.process(rows(1, start=29)[0])
+    for r in rows(5):
+        (payload,) = core.process_rows(proc, [r], None, None)
+        assert payload["iface_delta"]["rx_packets"] == 1000
+    assert proc.ifaces.samples == 5
+    proc.close()
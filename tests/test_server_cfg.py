@@ -0,0 +1,60 @@
+import pytest
+
+import cbs_rt_server as core
+
+
+def test_arrival_hist_needs_per_packet_source():
+    with pytest.raises(ValueError):
+        core.run_cfg({"backend": "hw", "arrival_hist": True})
+    sim = core.run_cfg({"backend": "sim", "arrival_hist": True})
+    assert "--live-all" in core.sim_argv(sim)
+    hw = core.run_cfg({"backend": "hw", "arrival_hist": True, "ingest": "binary"})
+    assert "--stats-packets" in core.rx_argv(hw)
+
+
+def test_sweep_checks_every_point():
+    status, body, sweep = core.sweep_request({
+        "base": {"backend": "hw", "arrival_hist": True}, "grid": {"packet_size": [512, 1024]},
+    })
+    assert status == 400
+    assert sweep is None
+    assert "arrival_hist" in body["error"] and "backend=sim" in body["error"]
+
+
+def fake_rxcap(tmp_path, monkeypatch, help_text):
+    rxcap = tmp_path / "rxcap"
+    rxcap.write_text(f"#!/bin/sh\necho '{help_text}'\n")
+    rxcap.chmod(0o755)
+    monkeypatch.setattr(core, "RXCAP", str(rxcap))
+    monkeypatch.setattr(core, "rxcap_help", {})
+
+
+def hw_session(tmp_path):
+    sess = core.new_session("t", core.SessionPaths.under(tmp_path))
+    cfg = core.run_cfg({"backend": "hw", "arrival_hist": True, "ingest": "binary"})
+    sess["arrivals"] = core.arrival_analyzer(cfg)
+    return cfg, sess
+
+
+def test_rxcap_without_stats_sock_stays_on_csv(tmp_path, monkeypatch):
+    fake_rxcap(tmp_path, monkeypatch, "usage: rxcap IFACE [--csv FILE] [--stats-socket-buf N]")
+    cfg, sess = hw_session(tmp_path)
+    core.open_ingest(cfg, sess)
+    assert sess["ingest"] is None
+    assert cfg["ingest"] == "csv"
+    # Sampled live lines are no per-packet source.
+    assert sess["arrivals"] is None
+    argv = core.rx_argv(cfg, core.run_paths(sess))
+    assert "--stats-sock" not in argv and "--stats-packets" not in argv
+
+
+def test_rxcap_with_stats_sock_binds_socket(tmp_path, monkeypatch):
+    fake_rxcap(tmp_path, monkeypatch, "usage: rxcap IFACE [--stats-sock PATH] [--stats-packets]")
+    cfg, sess = hw_session(tmp_path)
+    core.open_ingest(cfg, sess)
+    try:
+        assert cfg["ingest"] == "binary"
+        assert sess["packet_ingest"] and sess["arrivals"] is not None
+        assert "--stats-sock" in core.rx_argv(cfg, core.run_paths(sess))
+    finally:
+        sess["ingest"].close()
@@ -0,0 +1,81 @@
+import asyncio
+from http import HTTPStatus
+
+import cbs_rt_server as core
+from static_cache import StaticCache
+
+
+class CapturingWriter:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def get_extra_info(self, name):
+        return ("127.0.0.1", 0)
+
+    def close(self):
+        pass
+
+
+def cache(tmp_path):
+    (tmp_path / "index.html").write_text("<html></html>")
+    (tmp_path / "chart v2.js").write_text("export {};")
+    return StaticCache(tmp_path, core.CONTENT_TYPES)
+
+
+def test_percent_encoded_paths_are_decoded(tmp_path):
+    assets = cache(tmp_path)
+    status, body, headers = assets.respond("/chart%20v2.js")
+    assert status == HTTPStatus.OK
+    assert body == b"export {};"
+    assert headers["Content-Type"] == "application/javascript"
+    assert assets.respond("/")[0] == HTTPStatus.OK
+
+
+def test_encoded_escapes_stay_inside_root(tmp_path):
+    (tmp_path / "static").mkdir()
+    (tmp_path / "secret.txt").write_text("no")
+    assets = cache(tmp_path / "static")
+    for path in ("/..%2fsecret.txt", "/%2e%2e/secret.txt", "/index.html%00.js"):
+        assert assets.respond(path)[0] == HTTPStatus.NOT_FOUND
+
+
+def test_async_304_has_no_content_length(tmp_path):
+    assets = cache(tmp_path)
+    etag = assets.respond("/index.html")[2]["ETag"]
+    status, body, headers = assets.respond("/index.html", etag)
+    assert status == HTTPStatus.NOT_MODIFIED
+    writer = CapturingWriter()
+    asyncio.run(core.send_response_async(writer, status, body, headers.pop("Content-Type"), headers))
+    head = writer.data.decode("latin-1").lower()
+    assert head.startswith("http/1.1 304")
+    assert "content-length" not in head
+    assert f"etag: {etag}".lower() in head
+
+
+def async_request(request):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(request)
+        reader.feed_eof()
+        writer = CapturingWriter()
+        await core.handle_client_async(reader, writer)
+        return writer.data
+    return asyncio.run(run())
+
+
+def test_async_head_matches_get_without_body(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "assets", cache(tmp_path))
+    get = async_request(b"GET /chart%20v2.js HTTP/1.1\r\nHost: x\r\n\r\n")
+    head = async_request(b"HEAD /chart%20v2.js HTTP/1.1\r\nHost: x\r\n\r\n")
+    get_head, _, get_body = get.partition(b"\r\n\r\n")
+    head_head, _, head_body = head.partition(b"\r\n\r\n")
+    assert head_head.startswith(b"HTTP/1.1 200")
+    assert head_head == get_head
+    assert get_body == b"export {};"
+    assert head_body == b""
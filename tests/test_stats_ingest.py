@@ -0,0 +1,50 @@
+import pytest
+
+from stats_ingest import STATS_RECORD, StatsWindow
+from steady_state import SteadyStateDetector
+
+
+def stats_data(seconds, interval_s=0.001, pps_per_tc=10_000):
+    # 1 ms records with the time accumulated the way the writers keep it
+    # (t += interval), so it drifts below i * interval.
+    step = int(pps_per_tc * interval_s)
+    recs = []
+    t = 0.0
+    for i in range(int(seconds / interval_s) + 1):
+        pcp = [i * step] * 8
+        total = sum(pcp)
+        recs.append(STATS_RECORD.pack(t, total, 80_000.0, 60.0, 0, *pcp, total, 0, total, total))
+        t += interval_s
+    return b"".join(recs)
+
+
+def payload(row):
+    mbps = [10.0] * 8
+    return {"time_s": row["time_s"], "per_tc_mbps": mbps, "exp_mbps": mbps, "pass": [True] * 8}
+
+
+def test_rows_every_publish_interval():
+    rows = StatsWindow(0.1).feed(stats_data(3.0))
+    times = [r["time_s"] for r in rows]
+    assert len(times) == 31
+    assert times[1:] == pytest.approx([0.1 * k for k in range(1, 31)], abs=1e-6)
+    assert all(r["fine"]["fine_records"] == 100 for r in rows[1:])
+
+
+def test_window_schedule_restarts_after_gap():
+    window = StatsWindow(0.1)
+    rows = window.feed(stats_data(0.2))
+    late = STATS_RECORD.pack(1.0, 0, 0.0, 0.0, 0, *[0] * 8, 0, 0, 0, 0)
+    rows += window.feed(late + STATS_RECORD.pack(1.05, 0, 0.0, 0.0, 0, *[0] * 8, 0, 0, 0, 0))
+    # One row for the record after the gap, none half a window later.
+    assert [round(r["time_s"], 3) for r in rows] == [0.0, 0.1, 0.2, 1.0]
+
+
+def test_binary_rows_reach_steady_state():
+    detector = SteadyStateDetector(window_s=2.0, settle_s=1.0)
+    for row in StatsWindow(0.1).feed(stats_data(10.0)):
+        if detector.push(payload(row)):
+            break
+    assert detector.steady
+    assert detector.reason == "within-tolerance"
+    assert detector.t == pytest.approx(3.0, abs=1e-6)
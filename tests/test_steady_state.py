@@ -0,0 +1,50 @@
+import pytest
+
+from steady_state import SteadyStateDetector
+
+
+def payload(t, ok=True):
+    mbps = [10.0] * 8
+    rx = mbps if ok else [5.0] * 8
+    return {"time_s": t, "per_tc_mbps": rx, "exp_mbps": mbps, "pass": [ok] * 8}
+
+
+def run(times, detector):
+    for t in times:
+        if detector.push(payload(t)):
+            return t
+    return None
+
+
+@pytest.mark.parametrize("spacing", [0.1, 0.101, 0.15, 0.3, 0.7])
+def test_window_fills_at_any_row_spacing(spacing):
+    times = [2.0 + k * spacing for k in range(200)]
+    t = run(times, SteadyStateDetector(window_s=2.0, settle_s=1.0))
+    # Settled at 3.0, then the first row a whole window after the first
+    # sample past settle.
+    first = next(x for x in times if x - 2.0 >= 1.0)
+    assert t == next(x for x in times if x - first >= 2.0 * 0.999)
+
+
+def test_accumulated_float_times():
+    times = []
+    t = 2.0
+    for _ in range(100):
+        times.append(t)
+        t += 0.1
+    assert run(times, SteadyStateDetector(window_s=2.0, settle_s=1.0)) == pytest.approx(5.0)
+
+
+def test_window_starts_at_newest_sample_before_span():
+    # Failing samples with a noisy error never settle, so the window keeps
+    # sliding: it always reaches back to t - window_s, never less.
+    d = SteadyStateDetector(window_s=2.0, settle_s=0.0)
+    for k in range(40):
+        p = payload(k * 0.101, ok=False)
+        p["per_tc_mbps"] = [5.0 if k % 2 else 15.0] * 8
+        d.push(p)
+        span = d.t - d.window[0][0]
+        if d.t >= 2.0:
+            assert 2.0 * 0.999 <= span < 2.0 + 0.101
+    assert not d.steady
+    assert d.window[0][0] == pytest.approx(19 * 0.101)
@@ -0,0 +1,114 @@
+from collections import deque
+
+import pytest
+
+from tc_metrics import TcMetricsEngine
+
+IDLE = [1000 * (tc + 1) for tc in range(8)]
+PKT = 1400
+FIELDS = ("per_tc_mbps", "per_tc_mbps_payload", "per_tc_pps", "pred_mbps", "exp_mbps", "exp_pps")
+
+
+class PerRowLoop:
+    # The per-TC block csv_watcher ran per row before TcMetricsEngine
+    # (deque windows, sum() per sample), as the reference.
+    def __init__(self, window):
+        self.mbps = [deque(maxlen=max(1, window)) for _ in range(8)]
+        self.pps = [deque(maxlen=max(1, window)) for _ in range(8)]
+
+    def push(self, dt, deltas, tx):
+        out = {f: [] for f in FIELDS}
+        out["pass"] = []
+        out["total_mbps_pcp"] = 0.0
+        out["sum_pcp_delta"] = 0
+        for tc in range(8):
+            dp = deltas[tc]
+            out["sum_pcp_delta"] += max(0, dp)
+            mbps = (dp * PKT * 8) / (dt * 1_000_000) if dt > 0 else 0.0
+            pps = dp / dt if dt > 0 else 0.0
+            self.mbps[tc].append(mbps)
+            self.pps[tc].append(pps)
+            avg = sum(self.mbps[tc]) / len(self.mbps[tc])
+            out["per_tc_mbps"].append(avg)
+            out["per_tc_mbps_payload"].append(mbps)
+            out["per_tc_pps"].append(sum(self.pps[tc]) / len(self.pps[tc]))
+            out["total_mbps_pcp"] += avg
+            pred = IDLE[tc] / 1000.0
+            out["pred_mbps"].append(pred)
+            expected = min(pred, tx[tc]) if tx[tc] > 0 else pred
+            out["exp_mbps"].append(expected)
+            out["exp_pps"].append((expected * 1_000_000 / 8) / PKT)
+            diff = abs(avg - expected) / expected if expected > 0 else 0
+            out["pass"].append(diff <= 0.1)
+        return out
+
+
+def rows_from_counters(times, counters):
+    # (dt, per-TC delta) per interval of cumulative rxcap counters, as
+    # RxSampleProcessor derives them.
+    for i in range(1, len(times)):
+        dt = times[i] - times[i - 1]
+        yield (dt if dt > 0 else 1.0), [c - p for c, p in zip(counters[i], counters[i - 1])]
+
+
+def assert_same(samples, window, tx=None):
+    ref = PerRowLoop(window)
+    engine = TcMetricsEngine(IDLE, PKT, 0.1, window=window)
+    tx = tx or [0.0] * 8
+    for dt, deltas in samples:
+        a = ref.push(dt, deltas, tx)
+        b = engine.push(dt, deltas, tx)
+        for f in FIELDS:
+            assert b[f] == pytest.approx(a[f], rel=1e-9, abs=1e-9), f
+        assert b["total_mbps_pcp"] == pytest.approx(a["total_mbps_pcp"], rel=1e-9, abs=1e-9)
+        assert b["sum_pcp_delta"] == a["sum_pcp_delta"]
+        assert b["pass"] == a["pass"]
+
+
+def steady(n, t0=0.0, step=0.1, start=0):
+    times = [t0 + i * step for i in range(n)]
+    counters = [[start + i * 90 * (tc + 1) for tc in range(8)] for i in range(n)]
+    return times, counters
+
+
+@pytest.mark.parametrize("window", [1, 5, 20])
+def test_steady_rows(window):
+    times, counters = steady(50)
+    assert_same(list(rows_from_counters(times, counters)), window, tx=[5.0] * 8)
+
+
+def test_gap_in_rows():
+    # rxcap rows missing for 3 s: one long interval between two short ones.
+    t1, c1 = steady(10)
+    t2, c2 = steady(10, t0=t1[-1] + 3.0, start=c1[-1][0] + 30_000)
+    c2 = [[v + 2700 * tc for tc, v in enumerate(row)] for row in c2]
+    assert_same(list(rows_from_counters(t1 + t2, c1 + c2)), 5)
+
+
+def test_counter_reset():
+    # rxcap restarted: counters drop back to zero (negative deltas), then
+    # count up again.
+    t1, c1 = steady(10, start=500_000)
+    t2, c2 = steady(10, t0=t1[-1] + 0.1)
+    assert_same(list(rows_from_counters(t1 + t2, c1 + c2)), 5)
+
+
+def test_idle_and_repeated_rows():
+    # No packets in an interval, and a row repeated with the same time_s
+    # (dt <= 0 is taken as 1 s, as in RxSampleProcessor).
+    times, counters = steady(6)
+    times = times[:3] + [times[2]] + times[3:]
+    counters = counters[:3] + [counters[2], counters[2]] + counters[3:-1]
+    assert_same(list(rows_from_counters(times, counters)), 3)
+
+
+def test_zero_dt_and_no_rows():
+    assert_same([(0.0, [5] * 8), (0.1, [0] * 8)], 4)
+    assert_same([], 4)
+
+
+def test_running_sums_resync(monkeypatch):
+    # Crosses the periodic rebuild of the running sums several times.
+    monkeypatch.setattr(TcMetricsEngine, "RESUM_EVERY", 7)
+    times, counters = steady(60, step=0.099)
+    assert_same(list(rows_from_counters(times, counters)), 5)